@@ -32,6 +32,23 @@ class Settings(BaseSettings):
     ADMIN_NAME: str
     ADMIN_EMAIL: str
 
+    # 급여 증분 갱신 시 전체 재계산과 대조 (운영 중 검증용)
+    PAYROLL_VERIFY_INCREMENTAL: bool = False
+
+    # 출퇴근 이벤트 outbox: 폴링 주기 / 커밋 정착 대기 / 배치 크기 / 보관 기간
+    OUTBOX_POLL_SECONDS: float = 2.0
+    OUTBOX_SETTLE_SECONDS: float = 2.0
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_RETENTION_DAYS: int = 7
+
+    # 인증 주체(get_current_user) 캐시
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL: int = 30
+
+    # 비밀번호 해시 전용 풀 (동시 실행 수 / 추가 대기 허용 수)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE: int = 16
+
     @property
     def DATABASE_URL(self):
         return (
@@ -1,4 +1,8 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
@@ -15,3 +19,29 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def advisory_lock(conn: Connection, name: str, timeout: int = 0) -> Iterator[bool]:
+    """
+    MySQL GET_LOCK. 얻으면 True, timeout(초) 안에 못 얻으면 False를 내준다.
+    락은 연결 단위이므로 같은 Connection을 블록 끝까지 붙잡고 있어야 한다
+    (Session은 커밋 때 연결을 풀에 돌려주므로 engine.connect()로 받은 연결을 쓸 것).
+    """
+    acquired = (
+        conn.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": name, "timeout": timeout},
+        ).scalar()
+        == 1
+    )
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+
+
+def is_lock_free(conn: Connection, name: str) -> bool:
+    result = conn.execute(text("SELECT IS_FREE_LOCK(:name)"), {"name": name})
+    return result.scalar() == 1
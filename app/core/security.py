@@ -6,10 +6,43 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.modules.admin.reference import PRINCIPALS, reference_cache
 from app.modules.auth.models import PositionEnum, User
+from app.utils.cache_utils import VersionedCache
 
 security = HTTPBearer(auto_error=False)
 
+# 인증 주체 캐시: user_id -> 컬럼 스냅샷 (비밀번호/주민번호 제외)
+# 관리자 수정/삭제 트랜잭션에서 공유 버전을 올린다
+# 모든 워커가 version_ttl(1초) 안에 다시 읽는다
+_principal_cache = VersionedCache(
+    reference_cache,
+    PRINCIPALS,
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+)
+_PRINCIPAL_EXCLUDE = {"password", "ssn"}
+
+
+def _load_principal(db: Session, user_id: int):
+    user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+    if user is None:
+        return None
+    return {
+        col.key: getattr(user, col.key)
+        for col in User.__table__.columns
+        if col.key not in _PRINCIPAL_EXCLUDE
+    }
+
+
+def bump_principals(db: Session) -> None:
+    # 직원 수정/삭제와 같은 트랜잭션에서 호출 (커밋과 함께 모든 워커에 반영)
+    reference_cache.bump(db, PRINCIPALS)
+
+
+def principal_cache_stats() -> dict:
+    return _principal_cache.stats()
+
 
 def get_current_user(
     cred: HTTPAuthorizationCredentials = Depends(security),
@@ -35,13 +68,17 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload"
         )
 
-    user = db.execute(select(User).where(User.id == int(sub))).scalar_one_or_none()
-    if not user or not user.is_active:
+    user_id = int(sub)
+    principal = _principal_cache.get_or_load(
+        db, user_id, lambda: _load_principal(db, user_id)
+    )
+    if not principal or not principal["is_active"]:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or not found"
         )
 
-    return user
+    # 세션에 붙지 않은 읽기 전용 User (컬럼 값만 사용)
+    return User(**principal)
 
 
 def get_current_admin(user: User = Depends(get_current_user)) -> User:
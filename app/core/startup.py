@@ -0,0 +1,337 @@
+import hashlib
+import logging
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    delete,
+    func,
+    inspect,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, advisory_lock, engine
+from app.modules.auth.models import GenderEnum, PositionEnum, User
+from app.modules.auth.services import hash_password
+from app.modules.dayoff.models import LeaveBalance, LeaveRequest, LeaveStatusEnum
+from app.modules.payroll.models import Payroll
+
+logger = logging.getLogger(__name__)
+
+STARTUP_LOCK = "mbcw_startup"
+STARTUP_LOCK_TIMEOUT = 60  # 초. 다른 워커가 DDL 중이면 그동안 기다린다
+
+# 마이그레이션 로직이 바뀌면 올린다 (예전 로직으로 버전이 기록된 DB도 다시 확인)
+MIGRATION_REVISION = "2"
+
+# 모델과 모양이 달라진 옛 테이블: 표식 컬럼이 있으면 이름을 바꿔 보존하고 새로 만든다
+# (옛 모양은 서비스 코드가 쓰지 못하던 것이라 데이터 변환은 하지 않는다)
+_LEGACY_TABLES = {
+    "holidays": ("employee_id", "holidays_legacy"),  # 직원별 쉬는 날 → 전사 휴일
+    "insurance_rates": ("national_pension", "insurance_rates_legacy"),  # 컬럼별 요율
+}
+
+# 모델 메타데이터와 별도로 둔다 (스키마 해시에 포함되지 않도록)
+_version_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    _version_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", String(64), nullable=False),
+    Column("applied_at", DateTime, nullable=False, server_default=func.now()),
+)
+
+
+def schema_hash() -> str:
+    """모델 정의(DDL)의 해시. 모델이 바뀌면 값이 달라져 다음 기동 때 DDL을 다시 확인한다"""
+    dialect = engine.dialect
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        ddl.extend(
+            str(CreateIndex(index).compile(dialect=dialect))
+            for index in sorted(table.indexes, key=lambda i: i.name or "")
+        )
+    ddl.append(MIGRATION_REVISION)
+    return hashlib.sha256("\n".join(ddl).encode("utf-8")).hexdigest()
+
+
+def _applied_version(conn: Connection):
+    try:
+        return conn.execute(
+            select(schema_version.c.version).where(schema_version.c.id == 1)
+        ).scalar()
+    except SQLAlchemyError:  # 테이블 없음 (첫 배포)
+        conn.rollback()
+        return None
+
+
+def _admin_exists(conn: Connection) -> bool:
+    return (
+        conn.execute(
+            select(User.id).where(User.username == settings.ADMIN_USERNAME)
+        ).first()
+        is not None
+    )
+
+
+def _unique_columns(constraint: UniqueConstraint) -> tuple[str, ...]:
+    return tuple(c.name for c in constraint.columns)
+
+
+def _model_uniques(table: Table) -> list[UniqueConstraint]:
+    return [c for c in table.constraints if isinstance(c, UniqueConstraint)]
+
+
+def _reflected_uniques(inspector, table_name: str) -> set[tuple[str, ...]]:
+    # MySQL은 유니크 제약을 유니크 인덱스로 보여주고, sqlite는 둘을 따로 보여준다
+    uniques = {
+        tuple(ix["column_names"])
+        for ix in inspector.get_indexes(table_name)
+        if ix.get("unique")
+    }
+    uniques.update(
+        tuple(uc["column_names"])
+        for uc in inspector.get_unique_constraints(table_name)
+    )
+    return uniques
+
+
+def _reflected_index_names(inspector, table_name: str) -> set[str]:
+    names = {ix["name"] for ix in inspector.get_indexes(table_name)}
+    names.update(uc["name"] for uc in inspector.get_unique_constraints(table_name))
+    return names
+
+
+def _rename_legacy_tables(conn: Connection) -> None:
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    preparer = conn.dialect.identifier_preparer
+    for name, (marker, legacy) in _LEGACY_TABLES.items():
+        if name not in existing_tables:
+            continue
+        if marker not in {c["name"] for c in inspector.get_columns(name)}:
+            continue
+        logger.warning("renaming old-shaped table %s to %s", name, legacy)
+        conn.execute(
+            text(
+                f"ALTER TABLE {preparer.quote(name)} "
+                f"RENAME TO {preparer.quote(legacy)}"
+            )
+        )
+
+
+def _backfill_leave_pending(conn: Connection) -> None:
+    # 대기 중 신청일 합을 신청 테이블에서 한 번 채운다 (이후는 신청/처리 때 증분)
+    pending = (
+        select(func.coalesce(func.sum(LeaveRequest.days), 0))
+        .where(
+            LeaveRequest.user_id == LeaveBalance.user_id,
+            LeaveRequest.status == LeaveStatusEnum.pending,
+        )
+        .scalar_subquery()
+    )
+    conn.execute(update(LeaveBalance).values(pending=pending))
+
+
+# 기존 테이블에 컬럼을 더한 직후 값을 채우는 단계
+_AFTER_ADD_COLUMN = {"leave_balance.pending": _backfill_leave_pending}
+
+
+def _add_missing_columns(conn: Connection) -> None:
+    # create_all은 이미 있는 테이블에 컬럼을 추가하지 않는다.
+    # NULL 허용(또는 서버 기본값 있는) 컬럼만 자동으로 추가하고 나머지는 drift로 남긴다
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    preparer = conn.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        names = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in names:
+                continue
+            if not column.nullable and column.server_default is None:
+                continue
+            logger.info("adding column %s.%s", table.name, column.name)
+            spec = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.execute(
+                text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {spec}")
+            )
+            backfill = _AFTER_ADD_COLUMN.get(f"{table.name}.{column.name}")
+            if backfill:
+                backfill(conn)
+
+
+def _dedupe_payroll(conn: Connection) -> None:
+    # (유저, 연, 월) 중복 행은 가장 최근 것만 남긴다 (원장은 다시 계산 가능)
+    keep = (
+        select(func.max(Payroll.id).label("id"))
+        .group_by(Payroll.user_id, Payroll.year, Payroll.month)
+        .subquery()
+    )
+    removed = conn.execute(
+        delete(Payroll).where(Payroll.id.not_in(select(keep.c.id)))
+    ).rowcount
+    if removed:
+        logger.warning("removed %d duplicate payroll rows", removed)
+
+
+# 유니크 제약을 더하기 전에 기존 중복 행을 정리하는 단계
+_BEFORE_UNIQUE = {"uq_payroll_user_month": _dedupe_payroll}
+
+
+def _create_missing_indexes(conn: Connection) -> None:
+    # create_all은 이미 있는 테이블에 새 인덱스/유니크 제약을 추가하지 않는다 (FULLTEXT 등)
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    preparer = conn.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        names = _reflected_index_names(inspector, table.name)
+        for index in table.indexes:
+            if index.name and index.name not in names:
+                logger.info("creating index %s.%s", table.name, index.name)
+                index.create(conn)
+        uniques = _reflected_uniques(inspector, table.name)
+        for constraint in _model_uniques(table):
+            columns = _unique_columns(constraint)
+            if columns in uniques:
+                continue
+            name = constraint.name or f"uq_{table.name}_{'_'.join(columns)}"
+            if name in _BEFORE_UNIQUE:
+                _BEFORE_UNIQUE[name](conn)
+            logger.info("creating unique constraint %s.%s", table.name, name)
+            # 유니크 인덱스로 만든다 (MySQL에서는 유니크 제약과 같고 sqlite도 지원)
+            conn.execute(
+                text(
+                    f"CREATE UNIQUE INDEX {preparer.quote(name)} "
+                    f"ON {preparer.format_table(table)} "
+                    f"({', '.join(preparer.quote(c) for c in columns)})"
+                )
+            )
+
+
+def schema_drift(conn: Connection) -> list[str]:
+    """
+    실제 DB와 모델의 차이 (없는 테이블/컬럼/인덱스/유니크 제약, 모델이 모르는 NOT NULL 컬럼).
+    컬럼 타입 변경은 보지 않는다.
+    """
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    drift = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            drift.append(f"missing table {table.name}")
+            continue
+        reflected = {c["name"]: c for c in inspector.get_columns(table.name)}
+        drift.extend(
+            f"missing column {table.name}.{column.name}"
+            for column in table.columns
+            if column.name not in reflected
+        )
+        # 모델이 값을 넣지 않는 NOT NULL 컬럼이 남아 있으면 INSERT가 실패한다
+        drift.extend(
+            f"unknown NOT NULL column {table.name}.{name}"
+            for name, column in reflected.items()
+            if name not in table.columns
+            and not column["nullable"]
+            and column.get("default") is None
+            and column.get("autoincrement") is not True
+        )
+        names = _reflected_index_names(inspector, table.name)
+        drift.extend(
+            f"missing index {table.name}.{index.name}"
+            for index in table.indexes
+            if index.name and index.name not in names
+        )
+        uniques = _reflected_uniques(inspector, table.name)
+        drift.extend(
+            f"missing unique {table.name}({', '.join(_unique_columns(constraint))})"
+            for constraint in _model_uniques(table)
+            if _unique_columns(constraint) not in uniques
+        )
+    return drift
+
+
+def _migrate(conn: Connection, version: str) -> None:
+    _rename_legacy_tables(conn)
+    Base.metadata.create_all(bind=conn)
+    _add_missing_columns(conn)
+    _create_missing_indexes(conn)
+    conn.commit()
+    # 자동으로 맞추지 못한 차이가 있으면 버전을 기록하지 않는다 (다음 기동 때 다시 확인)
+    drift = schema_drift(conn)
+    if drift:
+        conn.rollback()
+        for item in drift:
+            logger.error("schema drift: %s", item)
+        raise RuntimeError(f"schema drift: {'; '.join(drift)}")
+    _version_metadata.create_all(bind=conn)
+    conn.execute(
+        mysql_insert(schema_version)
+        .values(id=1, version=version)
+        .on_duplicate_key_update(version=version, applied_at=func.now())
+    )
+    conn.commit()
+
+
+def _create_admin() -> None:
+    db = SessionLocal()
+    try:
+        if db.query(User.id).filter_by(username=settings.ADMIN_USERNAME).first():
+            return
+        db.add(
+            User(
+                username=settings.ADMIN_USERNAME,
+                password=hash_password(settings.ADMIN_PASSWORD),
+                name=settings.ADMIN_NAME,
+                position=PositionEnum.manager,
+                gender=GenderEnum.male,
+                email=settings.ADMIN_EMAIL,
+                is_active=True,
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def prepare_database() -> None:
+    """
+    워커 기동 시 스키마/관리자 계정 준비.
+    스키마 해시(모델 DDL 컴파일, 수 ms)가 같고 관리자 계정이 있으면 조회 2번으로 끝낸다.
+    아니면 advisory lock을 잡은 워커 하나만 스키마 맞추기(_migrate) / 관리자 생성을 하고,
+    기다리던 워커는 락을 얻은 뒤 다시 확인해 건너뛴다.
+    스키마가 모델과 다르게 남으면 RuntimeError로 기동을 멈춘다.
+    """
+    version = schema_hash()
+    with engine.connect() as conn:
+        if _applied_version(conn) == version and _admin_exists(conn):
+            conn.rollback()
+            return
+        conn.rollback()
+
+        # 같은 DB를 쓰는 모든 워커/컨테이너 중 하나만 통과
+        with advisory_lock(conn, STARTUP_LOCK, STARTUP_LOCK_TIMEOUT) as acquired:
+            if not acquired:
+                raise RuntimeError("startup lock timeout")
+            if _applied_version(conn) != version:
+                logger.info("schema version changed, applying DDL")
+                _migrate(conn, version)
+            if not _admin_exists(conn):
+                _create_admin()
+            conn.rollback()
@@ -1,11 +1,11 @@
 from fastapi import FastAPI
 from sqlalchemy.orm import configure_mappers
 
-from app.core.config import settings
-from app.core.database import Base, SessionLocal, engine
 from app.core.routers import api_router
-from app.modules.auth.models import GenderEnum, PositionEnum, User
-from app.modules.auth.services import hash_password
+from app.core.startup import prepare_database
+from app.modules.attendance.outbox import projector
+from app.modules.attendance.presence import tail as presence_tail
+from app.modules.payroll import worker as _payroll_worker  # noqa: F401 (소비자 등록)
 
 configure_mappers()
 app = FastAPI()
@@ -13,24 +13,18 @@ app = FastAPI()
 
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
-    db = SessionLocal()
-    try:
-        admin = db.query(User).filter_by(username=settings.ADMIN_USERNAME).first()
-        if not admin:
-            admin = User(
-                username=settings.ADMIN_USERNAME,
-                password=hash_password(settings.ADMIN_PASSWORD),
-                name=settings.ADMIN_NAME,
-                position=PositionEnum.manager,
-                gender=GenderEnum.male,
-                email=settings.ADMIN_EMAIL,
-                is_active=True,
-            )
-            db.add(admin)
-            db.commit()
-    finally:
-        db.close()
+    # 스키마/관리자 준비는 advisory lock으로 워커 하나만 (버전이 같으면 바로 통과)
+    prepare_database()
+    projector.start()
+    presence_tail.start()  # 오늘 출퇴근 기록으로 현황 재구성 후 이벤트 추적
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # gunicorn 워커 재시작 시 정착된 outbox 이벤트를 반영하고 종료
+    # (gunicorn graceful-timeout 기본 30초 안에 끝나도록)
+    presence_tail.stop()
+    projector.stop(timeout=25)
 
 
 app.include_router(api_router, prefix="/api")
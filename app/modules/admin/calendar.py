@@ -0,0 +1,149 @@
+import threading
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.modules.admin.models import Holiday, HolidayKindEnum
+from app.modules.admin.reference import HOLIDAYS, reference_cache
+from app.utils.cache_utils import VersionedCache
+
+# 날짜별 플래그 비트
+WEEKEND = 1
+PUBLIC_HOLIDAY = 2
+STORE_HOLIDAY = 4
+OFF_DAY = WEEKEND | PUBLIC_HOLIDAY | STORE_HOLIDAY
+
+_KIND_FLAGS = {
+    HolidayKindEnum.public: PUBLIC_HOLIDAY,
+    HolidayKindEnum.store: STORE_HOLIDAY,
+}
+
+# 연도별 달력. 휴일 쓰기가 HOLIDAYS 공유 버전을 올리면 모든 워커가 version_ttl 안에 다시 읽고,
+# 쓴 워커는 커밋 직후 refresh_days로 해당 연도를 미리 교체한다
+_calendar_cache = VersionedCache(reference_cache, HOLIDAYS, maxsize=16)
+_refresh_lock = threading.Lock()
+
+
+class YearCalendar:
+    """
+    1년치 날짜 플래그를 1바이트씩 담은 배열 (1월 1일 = 0번).
+    조회는 인덱스 1회, 구간 개수는 마스크별 누적합 차이로 O(1).
+    만든 뒤에는 바꾸지 않는다 (여러 스레드가 잠금 없이 읽음). 휴일이 바뀌면 새로 만든다.
+    """
+
+    def __init__(self, year: int, flags: bytearray):
+        self.year = year
+        self._first = date(year, 1, 1)
+        self._flags = flags
+        self._prefix: dict[int, list[int]] = {}
+
+    @classmethod
+    def build(
+        cls, year: int, holidays: Iterable[tuple[date, HolidayKindEnum]]
+    ) -> "YearCalendar":
+        first = date(year, 1, 1)
+        days = (date(year + 1, 1, 1) - first).days
+        flags = bytearray(days)
+        weekday = first.weekday()
+        for i in range(days):
+            if (weekday + i) % 7 >= 5:
+                flags[i] = WEEKEND
+        for day, kind in holidays:
+            flags[(day - first).days] |= _KIND_FLAGS[kind]
+        return cls(year, flags)
+
+    def _index(self, day: date) -> int:
+        return (day - self._first).days
+
+    def flags_on(self, day: date) -> int:
+        return self._flags[self._index(day)]
+
+    def _prefix_for(self, mask: int) -> list[int]:
+        prefix = self._prefix.get(mask)
+        if prefix is None:
+            prefix = [0, *accumulate(1 if f & mask else 0 for f in self._flags)]
+            self._prefix[mask] = prefix
+        return prefix
+
+    def count(self, start: date, end: date, mask: int) -> int:
+        # [start, end] (이 연도 안) 중 mask 비트가 하나라도 있는 날 수
+        prefix = self._prefix_for(mask)
+        return prefix[self._index(end) + 1] - prefix[self._index(start)]
+
+    def dates_with(self, start: date, end: date, mask: int) -> list[date]:
+        lo, hi = self._index(start), self._index(end)
+        return [
+            self._first + timedelta(days=i)
+            for i in range(lo, hi + 1)
+            if self._flags[i] & mask
+        ]
+
+
+def _load_year(db: Session, year: int) -> YearCalendar:
+    rows = db.execute(
+        select(Holiday.date, Holiday.kind).where(
+            Holiday.date >= date(year, 1, 1), Holiday.date <= date(year, 12, 31)
+        )
+    ).all()
+    return YearCalendar.build(year, rows)
+
+
+def get_year_calendar(db: Session, year: int) -> YearCalendar:
+    return _calendar_cache.get_or_load(db, year, lambda: _load_year(db, year))
+
+
+def _year_spans(start: date, end: date):
+    for year in range(start.year, end.year + 1):
+        yield year, max(start, date(year, 1, 1)), min(end, date(year, 12, 31))
+
+
+def flags_on(db: Session, day: date) -> int:
+    return get_year_calendar(db, day.year).flags_on(day)
+
+
+def is_off_day(db: Session, day: date, mask: int = OFF_DAY) -> bool:
+    return bool(flags_on(db, day) & mask)
+
+
+def count_days(db: Session, start: date, end: date, mask: int) -> int:
+    if end < start:
+        return 0
+    return sum(
+        get_year_calendar(db, year).count(lo, hi, mask)
+        for year, lo, hi in _year_spans(start, end)
+    )
+
+
+def count_business_days(db: Session, start: date, end: date) -> int:
+    if end < start:
+        return 0
+    return (end - start).days + 1 - count_days(db, start, end, OFF_DAY)
+
+
+def dates_with(db: Session, start: date, end: date, mask: int) -> set[date]:
+    result: set[date] = set()
+    for year, lo, hi in _year_spans(start, end):
+        result.update(get_year_calendar(db, year).dates_with(lo, hi, mask))
+    return result
+
+
+def refresh_days(db: Session, days: Iterable[Optional[date]]) -> None:
+    """
+    휴일 생성/수정/삭제 커밋 후 해당 연도 달력을 다시 읽어 통째로 교체 (캐시된 연도만).
+    읽는 쪽은 교체 전/후 달력 중 하나를 온전히 본다.
+    """
+    years = {d.year for d in days if d is not None}
+    # 워커 안에서 먼저 읽은 달력이 나중에 교체되지 않도록 읽기~교체를 직렬화
+    with _refresh_lock:
+        for year in sorted(years):
+            _calendar_cache.reload(db, year, lambda: _load_year(db, year))
+
+
+def invalidate_calendar(year: Optional[int] = None) -> None:
+    if year is None:
+        _calendar_cache.clear()
+    else:
+        _calendar_cache.pop(year)
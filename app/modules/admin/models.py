@@ -8,17 +8,29 @@ from sqlalchemy import (
     Boolean,
     Date,
     DateTime,
-    ForeignKey,
+    Enum,
     Index,
     Numeric,
     String,
     UniqueConstraint,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
 
 
+class InsuranceCategoryEnum(str, enum.Enum):
+    health = "건강보험"
+    care = "요양보험"
+    employment = "고용보험"
+    pension = "국민연금"
+
+
+class HolidayKindEnum(str, enum.Enum):
+    public = "공휴일"
+    store = "매장휴무"
+
+
 # 직원(사원) - 관리자 계정 생성/조회/수정/삭제 대상
 class Employee(Base):
     __tablename__ = "employees"
@@ -38,28 +50,23 @@ class Employee(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
-    # 관계
-    holidays: Mapped[list["Holiday"]] = relationship(
-        "Holiday", back_populates="employee", cascade="all, delete-orphan"
-    )
-
 
-# 공휴일(직원별 쉬는 날 등록)
+# 전사 휴일 (법정 공휴일 / 매장 휴무일)
 class Holiday(Base):
     __tablename__ = "holidays"
     __table_args__ = (
-        UniqueConstraint(
-            "employee_id", "holiday_date", name="uq_holiday_employee_date"
-        ),
+        UniqueConstraint("holiday_date", "kind", name="uq_holiday_date_kind"),
         Index("idx_holiday_date", "holiday_date"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    employee_id: Mapped[int] = mapped_column(
-        ForeignKey("employees.id", ondelete="CASCADE"), nullable=False
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    # 속성명이 date 타입과 겹치므로 타입 주석 없이 선언 (컬럼명은 holiday_date)
+    date = mapped_column("holiday_date", Date, nullable=False)
+    kind: Mapped[HolidayKindEnum] = mapped_column(
+        Enum(HolidayKindEnum), nullable=False, default=HolidayKindEnum.public
     )
-    holiday_date: Mapped[date] = mapped_column(Date, nullable=False)
-    reason: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
@@ -68,27 +75,27 @@ class Holiday(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
-    employee: Mapped["Employee"] = relationship("Employee", back_populates="holidays")
-
 
-# 4대 보험 요율(버전/시점 관리)
+# 4대 보험 요율(카테고리별 레코드, 시행일 기준 버전 관리)
 class InsuranceRate(Base):
     __tablename__ = "insurance_rates"
     __table_args__ = (
-        UniqueConstraint("effective_date", name="uq_insurance_rate_effective_date"),
+        UniqueConstraint(
+            "category", "effective_date", name="uq_insurance_rate_category_date"
+        ),
         Index("idx_insurance_rate_effective_date", "effective_date"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    # 각각 % 단위(예: 9.15%)를 9.15로 저장. 소수 2자리까지 허용
-    national_pension: Mapped[float] = mapped_column(Numeric(5, 2), nullable=False)
-    health_insurance: Mapped[float] = mapped_column(Numeric(5, 2), nullable=False)
-    employment_insurance: Mapped[float] = mapped_column(Numeric(5, 2), nullable=False)
-    industrial_accident: Mapped[float] = mapped_column(Numeric(5, 2), nullable=False)
+    category: Mapped[InsuranceCategoryEnum] = mapped_column(
+        Enum(InsuranceCategoryEnum), nullable=False
+    )
+    # 근로자 부담 요율 % 단위(예: 3.545%)를 3.545로 저장. 소수 4자리까지 허용
+    rate: Mapped[float] = mapped_column(Numeric(6, 4), nullable=False)
 
     effective_date: Mapped[date] = mapped_column(
         Date, nullable=False
-    )  # 시행일(동일일자 중복 불가)
+    )  # 시행일(카테고리별 동일일자 중복 불가)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
@@ -98,8 +105,10 @@ class InsuranceRate(Base):
     )
 
 
-class InsuranceCategoryEnum(str, enum.Enum):
-    health = "건강보험"
-    care = "요양보험"
-    employment = "고용보험"
-    pension = "국민연금"
+# 기준 데이터 조회 캐시의 네임스페이스별 버전 (모든 워커가 공유, 쓰기 트랜잭션에서 +1)
+class ReferenceVersion(Base):
+    __tablename__ = "reference_version"
+
+    namespace: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+
+from app.modules.admin.models import ReferenceVersion
+from app.utils.cache_utils import ResponseCache
+
+# reference_version 네임스페이스 (쓰기 트랜잭션에서 bump, 모든 워커가 같은 행을 본다)
+HOLIDAYS = "holidays"
+INSURANCE_RATES = "insurance-rates"
+DEFAULT_WAGES = "default-wages"
+USER_WAGES = "user-wages"
+PRINCIPALS = "principals"  # 인증 주체 캐시 (직원 수정/삭제)
+
+
+def _load_reference_version(db: Session, namespace: str) -> int:
+    stmt = select(ReferenceVersion.version).where(
+        ReferenceVersion.namespace == namespace
+    )
+    return db.execute(stmt).scalar() or 0
+
+
+def _bump_reference_version(db: Session, namespace: str) -> None:
+    stmt = mysql_insert(ReferenceVersion).values(
+        namespace=namespace, version=1, updated_at=datetime.now()
+    )
+    db.execute(
+        stmt.on_duplicate_key_update(
+            version=ReferenceVersion.version + 1, updated_at=stmt.inserted.updated_at
+        )
+    )
+
+
+# 기준 데이터(공휴일 / 보험 요율 / 시급) 조회 응답 캐시 겸 공유 버전.
+# 값 캐시(VersionedCache)도 이 버전을 키로 쓴다
+reference_cache = ResponseCache(
+    _load_reference_version, _bump_reference_version, maxsize=256, ttl=300
+)
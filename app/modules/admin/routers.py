@@ -1,14 +1,31 @@
 # app/modules/admin/routers.py
+from datetime import date
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    status,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.security import get_current_admin
+from app.core.security import (
+    bump_principals,
+    get_current_admin,
+    principal_cache_stats,
+)
+from app.modules.auth.services import PasswordHashBusy
+from app.modules.payroll import services as payroll_services
+from app.utils.response_utils import cached_json_response
 
-from . import schemas, services
+from . import calendar, schemas, services
 
 router = APIRouter()  # prefix는 core/routers.py에서 "/admin"으로 붙여줌
 
@@ -30,6 +47,11 @@ def create_user(
     except ValueError as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
+    except PasswordHashBusy as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        )
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"DB error: {e.__class__.__name__}")
@@ -40,11 +62,20 @@ def list_users(
     q: Optional[str] = Query(None),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[int] = Query(None, ge=1),
+    count: str = Query("exact", pattern="^(exact|estimate|none)$"),
     db: Session = Depends(get_db),
     _admin=Depends(get_current_admin),
 ):
-    total, items = services.list_users(db, q, limit, offset)
-    return {"total": total, "items": items}
+    total, is_estimate, items, next_cursor = services.list_users(
+        db, q, limit, offset, cursor, count
+    )
+    return {
+        "total": total,
+        "total_is_estimate": is_estimate,
+        "items": items,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.patch("/users/{memberId}", response_model=schemas.UserOut)
@@ -56,6 +87,8 @@ def update_user(
 ):
     try:
         user = services.update_user(db, memberId, payload)
+        # 같은 트랜잭션에서 인증 캐시 버전을 올린다 (비활성화가 모든 워커에 바로 반영)
+        bump_principals(db)
         db.commit()
         return user
     except LookupError as e:
@@ -64,6 +97,11 @@ def update_user(
     except ValueError as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
+    except PasswordHashBusy as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        )
 
 
 @router.delete("/users/{memberId}", status_code=status.HTTP_204_NO_CONTENT)
@@ -74,6 +112,7 @@ def delete_user(
 ):
     try:
         services.delete_user(db, memberId)
+        bump_principals(db)
         db.commit()
     except LookupError as e:
         db.rollback()
@@ -81,6 +120,13 @@ def delete_user(
 
 
 # ---- Holidays (전사 공휴일) ----
+def _recalculate_holiday_months(db: Session, days: List[Optional[date]]) -> None:
+    # 휴일근로(holiday_minutes)는 증분 원장에 이미 들어가 있으므로 바뀐 날짜의 미마감 월을 다시 맞춘다
+    months = sorted({date(d.year, d.month, 1) for d in days if d is not None})
+    for first in months:
+        payroll_services.recalculate_open_months(db, first, first)
+
+
 @router.post(
     "/holidays", response_model=schemas.HolidayOut, status_code=status.HTTP_201_CREATED
 )
@@ -91,9 +137,16 @@ def create_holiday(
 ):
     try:
         obj = services.create_holiday(db, payload)
+        services.reference_cache.bump(db, services.HOLIDAYS)
         db.commit()
         db.refresh(obj)
+        calendar.refresh_days(db, [obj.date])
+        _recalculate_holiday_months(db, [obj.date])
+        db.refresh(obj)
         return obj
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"DB error: {e.__class__.__name__}")
@@ -103,10 +156,12 @@ def create_holiday(
 def list_holidays(
     start: Optional[str] = Query(None),
     end: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     _admin=Depends(get_current_admin),
 ):
-    return services.list_holidays(db, start, end)
+    body, etag = services.render_holidays(db, start, end)
+    return cached_json_response(body, etag, if_none_match)
 
 
 @router.patch("/holidays/{holidayId}", response_model=schemas.HolidayOut)
@@ -117,8 +172,12 @@ def update_holiday(
     _admin=Depends(get_current_admin),
 ):
     try:
-        obj = services.update_holiday(db, holidayId, payload)
+        obj, previous_date = services.update_holiday(db, holidayId, payload)
+        services.reference_cache.bump(db, services.HOLIDAYS)
         db.commit()
+        calendar.refresh_days(db, [previous_date, obj.date])
+        _recalculate_holiday_months(db, [previous_date, obj.date])
+        db.refresh(obj)
         return obj
     except LookupError as e:
         db.rollback()
@@ -135,19 +194,66 @@ def delete_holiday(
     _admin=Depends(get_current_admin),
 ):
     try:
-        services.delete_holiday(db, holidayId)
+        holiday_date = services.delete_holiday(db, holidayId)
+        services.reference_cache.bump(db, services.HOLIDAYS)
         db.commit()
+        calendar.refresh_days(db, [holiday_date])
+        _recalculate_holiday_months(db, [holiday_date])
     except LookupError as e:
         db.rollback()
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.post(
+    "/holidays/import", response_model=schemas.HolidayImportResult
+)  # 연간 법정 공휴일 일괄 등록
+def import_public_holidays(
+    payload: schemas.HolidayImport,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    _admin=Depends(get_current_admin),
+):
+    try:
+        upserted, removed = services.import_public_holidays(db, payload)
+        services.reference_cache.bump(db, services.HOLIDAYS)
+        db.commit()
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    calendar.refresh_days(db, [date(payload.year, 1, 1)])
+    # 1년치 전 직원 재계산은 응답 뒤 백그라운드로
+    background_tasks.add_task(
+        payroll_services.run_open_month_recalculation,
+        date(payload.year, 1, 1),
+        date(payload.year, 12, 31),
+    )
+    return {"year": payload.year, "upserted": upserted, "removed": removed}
+
+
+@router.get(
+    "/calendar/business-days", response_model=schemas.BusinessDayCount
+)  # 기간 내 영업일 / 주말 / 휴일 수
+def count_business_days(
+    start: date = Query(...),
+    end: date = Query(...),
+    db: Session = Depends(get_db),
+    _admin=Depends(get_current_admin),
+):
+    try:
+        return services.count_calendar_days(db, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # ---- Insurance Rates ----
 @router.get("/insurance-rates", response_model=List[schemas.InsuranceRateOut])
 def get_insurance_rates(
-    db: Session = Depends(get_db), _admin=Depends(get_current_admin)
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    _admin=Depends(get_current_admin),
 ):
-    return services.get_insurance_rates(db)
+    body, etag = services.render_insurance_rates(db)
+    return cached_json_response(body, etag, if_none_match)
 
 
 @router.post(
@@ -161,6 +267,29 @@ def set_insurance_rate(
     _admin=Depends(get_current_admin),
 ):
     obj = services.set_insurance_rate(db, payload)
+    # 같은 트랜잭션에서 버전을 올린다 (응답 캐시와 요율 타임라인이 모든 워커에서 갱신)
+    services.reference_cache.bump(db, services.INSURANCE_RATES)
     db.commit()
     db.refresh(obj)
+
+    # 시행일이 속한 달부터 이번 달까지 급여 공제를 새 요율로 재적용 (월별 UPDATE 1문)
+    today = date.today()
+    year, month = obj.effective_date.year, obj.effective_date.month
+    while (year, month) <= (today.year, today.month):
+        payroll_services.apply_month_deductions(db, year, month)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    db.commit()
     return obj
+
+
+# ---- Cache ----
+@router.get("/cache/principal")
+def get_principal_cache_stats(_admin=Depends(get_current_admin)):
+    # 인증 주체 캐시 hit/miss 카운터
+    return principal_cache_stats()
+
+
+@router.get("/cache/reference")
+def get_reference_cache_stats(_admin=Depends(get_current_admin)):
+    # 기준 데이터 응답 캐시 hit/miss / 네임스페이스별 버전
+    return services.reference_cache.stats()
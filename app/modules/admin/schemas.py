@@ -1,12 +1,13 @@
 # app/modules/admin/schemas.py
 from __future__ import annotations
 
+import datetime
 from datetime import date
 from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
-from app.modules.admin.models import InsuranceCategoryEnum
+from app.modules.admin.models import HolidayKindEnum, InsuranceCategoryEnum
 from app.modules.auth.models import GenderEnum, PositionEnum
 
 
@@ -48,20 +49,25 @@ class UserOut(BaseModel):
 
 
 class PaginatedUsers(BaseModel):
-    total: int
+    total: Optional[int]  # count=none이면 None
+    total_is_estimate: bool = False  # count=estimate에서 상한에 걸린 경우
     items: List[UserOut]
+    next_cursor: Optional[int] = None  # 다음 페이지 요청 시 cursor로 전달
 
 
 # ---------- 공휴일(전사 공휴일) ----------
 class HolidayCreate(BaseModel):
     name: str
     date: date
+    kind: HolidayKindEnum = HolidayKindEnum.public
     description: Optional[str] = None
 
 
 class HolidayUpdate(BaseModel):
     name: Optional[str] = None
-    date: Optional[date] = None
+    # 기본값 None이 클래스 안의 date 이름을 가리므로 모듈 경로로 적는다
+    date: Optional[datetime.date] = None
+    kind: Optional[HolidayKindEnum] = None
     description: Optional[str] = None
 
 
@@ -69,12 +75,41 @@ class HolidayOut(BaseModel):
     id: int
     name: str
     date: date
+    kind: HolidayKindEnum
     description: Optional[str]
 
     class Config:
         from_attributes = True
 
 
+class HolidayImportItem(BaseModel):
+    name: str
+    date: date
+    description: Optional[str] = None
+
+
+class HolidayImport(BaseModel):  # 연간 법정 공휴일 일괄 등록
+    year: int = Field(ge=2000)
+    items: List[HolidayImportItem]
+    replace: bool = False  # True면 목록에 없는 그 해 공휴일은 삭제
+
+
+class HolidayImportResult(BaseModel):
+    year: int
+    upserted: int
+    removed: int
+
+
+class BusinessDayCount(BaseModel):
+    start: date
+    end: date
+    days: int
+    business_days: int
+    weekend_days: int
+    public_holidays: int
+    store_holidays: int
+
+
 # ---------- 보험 요율(카테고리별) ----------
 class InsuranceRateSet(BaseModel):
     category: InsuranceCategoryEnum
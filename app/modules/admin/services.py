@@ -1,15 +1,33 @@
 # app/modules/admin/services.py
-from datetime import date
-from typing import List, Optional, Tuple
+from bisect import bisect_right
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, func, select
+from pydantic import TypeAdapter
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.modules.admin import schemas
-from app.modules.admin.models import Holiday, InsuranceRate
+from app.modules.admin import calendar, schemas
+from app.modules.admin.models import (
+    Holiday,
+    HolidayKindEnum,
+    InsuranceCategoryEnum,
+    InsuranceRate,
+)
+from app.modules.admin.reference import HOLIDAYS, INSURANCE_RATES, reference_cache
 from app.modules.auth.models import User
 from app.modules.auth.services import hash_password  # ← 해시 적용
+from app.utils.cache_utils import VersionedCache
+
+# 보험 요율 시행일 타임라인 캐시 (INSURANCE_RATES 공유 버전이 오르면 모든 워커가 다시 읽음)
+_insurance_rate_cache = VersionedCache(reference_cache, INSURANCE_RATES, maxsize=1)
+
+_holiday_list = TypeAdapter(List[schemas.HolidayOut])
+_insurance_rate_list = TypeAdapter(List[schemas.InsuranceRateOut])
 
 
 # --------- Users ----------
@@ -33,29 +51,83 @@ def create_user(db: Session, data: schemas.UserCreate) -> User:
     return user
 
 
-def list_users(
-    db: Session, q: Optional[str], limit: int, offset: int
-) -> Tuple[int, List[User]]:
-    stmt = select(User)
-    if q:
+USER_SEARCH_MIN_NGRAM = 2  # MySQL ngram_token_size 기본값
+USER_COUNT_ESTIMATE_CAP = 1000
+
+
+def _user_search_filter(q: str):
+    q = q.strip()
+    if len(q) < USER_SEARCH_MIN_NGRAM:
+        # 한 글자는 ngram 토큰이 없으므로 LIKE (전체 스캔이지만 입력 초기 1회)
         like = f"%{q}%"
-        stmt = stmt.where(
+        return (
             (User.name.ilike(like))
             | (User.username.ilike(like))
             | (User.email.ilike(like))
         )
+    if q.isascii():
+        # 영문 ngram 토큰은 InnoDB 불용어(a, i, in ...)에 걸려 색인에서 빠진다
+        # 아이디/이메일은 인덱스를 타는 앞부분 일치로 찾는다
+        return or_(
+            User.username.startswith(q, autoescape=True),
+            User.email.startswith(q, autoescape=True),
+        )
+    # ft_users_search FULLTEXT(ngram) 인덱스. 구문 검색이라 부분 문자열 일치와 같다
+    phrase = '"' + q.replace('"', " ") + '"'
+    return match(User.name, User.username, User.email, against=phrase).in_boolean_mode()
 
-    # total
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = db.execute(count_stmt).scalar_one()
 
-    # items
+def _count_users(db: Session, where, mode: str) -> Tuple[Optional[int], bool]:
+    if mode == "none":
+        return None, False
+    if mode == "estimate":
+        # 상한까지만 세고 넘으면 상한 값을 추정치로 반환
+        capped = select(User.id)
+        if where is not None:
+            capped = capped.where(where)
+        capped = capped.limit(USER_COUNT_ESTIMATE_CAP + 1).subquery()
+        total = db.execute(select(func.count()).select_from(capped)).scalar_one()
+        if total > USER_COUNT_ESTIMATE_CAP:
+            return USER_COUNT_ESTIMATE_CAP, True
+        return total, False
+    count_stmt = select(func.count(User.id))
+    if where is not None:
+        count_stmt = count_stmt.where(where)
+    return db.execute(count_stmt).scalar_one(), False
+
+
+def list_users(
+    db: Session,
+    q: Optional[str],
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[int] = None,
+    count: str = "exact",
+) -> Tuple[Optional[int], bool, List[User], Optional[int]]:
+    """
+    (total, total_is_estimate, items, next_cursor).
+    cursor(이전 페이지 마지막 id)가 있으면 keyset, 없으면 기존 offset 방식.
+    count: exact(정확) / estimate(상한까지) / none(세지 않음)
+    """
+    where = _user_search_filter(q) if q and q.strip() else None
+    stmt = select(User)
+    if where is not None:
+        stmt = stmt.where(where)
+    if cursor:
+        stmt = stmt.where(User.id < cursor)
+    elif offset:
+        stmt = stmt.offset(offset)
+
     items = (
-        db.execute(stmt.order_by(User.id.desc()).limit(limit).offset(offset))
-        .scalars()
-        .all()
+        db.execute(stmt.order_by(User.id.desc()).limit(limit + 1)).scalars().all()
     )
-    return total, items
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = items[-1].id
+
+    total, is_estimate = _count_users(db, where, count)
+    return total, is_estimate, items, next_cursor
 
 
 def update_user(db: Session, user_id: int, data: schemas.UserUpdate) -> User:
@@ -84,14 +156,20 @@ def delete_user(db: Session, user_id: int) -> None:
     if not user:
         raise LookupError("해당 사용자가 존재하지 않습니다.")
     db.delete(user)
-    # flush/commit은 라우터에서
+    # flush/commit은 라우터에서 (인증 캐시 버전도 같은 트랜잭션에서 라우터가 올린다)
 
 
 # --------- Holidays (전사 공휴일) ----------
 def create_holiday(db: Session, data: schemas.HolidayCreate) -> Holiday:
-    h = Holiday(name=data.name, date=data.date, description=data.description)
+    h = Holiday(
+        name=data.name, date=data.date, kind=data.kind, description=data.description
+    )
     db.add(h)
-    db.flush()
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("같은 날짜에 같은 종류의 휴일이 이미 있습니다.")
     return h
 
 
@@ -106,26 +184,109 @@ def list_holidays(
     return db.execute(stmt.order_by(Holiday.date.desc())).scalars().all()
 
 
+def render_holidays(
+    db: Session, start: Optional[date], end: Optional[date]
+) -> Tuple[bytes, str]:
+    return reference_cache.get_or_render(
+        db,
+        HOLIDAYS,
+        (start, end),
+        lambda: _holiday_list.dump_json(
+            _holiday_list.validate_python(
+                list_holidays(db, start, end), from_attributes=True
+            )
+        ),
+    )
+
+
 def update_holiday(
     db: Session, holiday_id: int, data: schemas.HolidayUpdate
-) -> Holiday:
+) -> Tuple[Holiday, date]:
+    # (수정된 휴일, 수정 전 날짜) - 달력 갱신용
     h = db.get(Holiday, holiday_id)
     if not h:
         raise LookupError("해당 공휴일이 존재하지 않습니다.")
     payload = data.model_dump(exclude_unset=True)
     if not payload:
         raise ValueError("변경할 값이 없습니다.")
+    previous_date = h.date
     for k, v in payload.items():
         setattr(h, k, v)
-    db.flush()
-    return h
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("같은 날짜에 같은 종류의 휴일이 이미 있습니다.")
+    return h, previous_date
 
 
-def delete_holiday(db: Session, holiday_id: int) -> None:
+def delete_holiday(db: Session, holiday_id: int) -> date:
     h = db.get(Holiday, holiday_id)
     if not h:
         raise LookupError("해당 공휴일이 존재하지 않습니다.")
     db.delete(h)
+    return h.date
+
+
+def import_public_holidays(db: Session, data: schemas.HolidayImport) -> Tuple[int, int]:
+    """
+    연간 법정 공휴일 일괄 등록 (날짜 기준 upsert, executemany 1회).
+    replace=True면 목록에 없는 그 해 공휴일을 지운다. (upserted, removed)
+    """
+    items = [i for i in data.items if i.date.year == data.year]
+    if len(items) != len(data.items):
+        raise ValueError(f"{data.year}년이 아닌 날짜가 있습니다.")
+
+    removed = 0
+    if data.replace:
+        stmt = delete(Holiday).where(
+            Holiday.kind == HolidayKindEnum.public,
+            Holiday.date >= date(data.year, 1, 1),
+            Holiday.date <= date(data.year, 12, 31),
+        )
+        if items:
+            stmt = stmt.where(Holiday.date.not_in([i.date for i in items]))
+        removed = db.execute(stmt).rowcount
+
+    if items:
+        now = datetime.utcnow()
+        stmt = mysql_insert(Holiday)
+        stmt = stmt.on_duplicate_key_update(
+            name=stmt.inserted.name,
+            description=stmt.inserted.description,
+            updated_at=stmt.inserted.updated_at,
+        )
+        db.execute(
+            stmt,
+            [
+                {
+                    "name": i.name,
+                    "date": i.date,  # ORM insert라 컬럼명(holiday_date)이 아닌 속성명
+                    "kind": HolidayKindEnum.public,
+                    "description": i.description,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in items
+            ],
+        )
+    return len(items), removed
+
+
+def count_calendar_days(db: Session, start: date, end: date) -> dict:
+    if end < start:
+        raise ValueError("시작일이 종료일보다 늦습니다.")
+    return {
+        "start": start,
+        "end": end,
+        "days": (end - start).days + 1,
+        "business_days": calendar.count_business_days(db, start, end),
+        "weekend_days": calendar.count_days(db, start, end, calendar.WEEKEND),
+        "public_holidays": calendar.count_days(
+            db, start, end, calendar.PUBLIC_HOLIDAY
+        ),
+        "store_holidays": calendar.count_days(db, start, end, calendar.STORE_HOLIDAY),
+    }
 
 
 # --------- Insurance Rates (카테고리별 레코드) ----------
@@ -136,6 +297,19 @@ def get_insurance_rates(db: Session) -> List[InsuranceRate]:
     return db.execute(stmt).scalars().all()
 
 
+def render_insurance_rates(db: Session) -> Tuple[bytes, str]:
+    return reference_cache.get_or_render(
+        db,
+        INSURANCE_RATES,
+        "all",
+        lambda: _insurance_rate_list.dump_json(
+            _insurance_rate_list.validate_python(
+                get_insurance_rates(db), from_attributes=True
+            )
+        ),
+    )
+
+
 def set_insurance_rate(db: Session, data: schemas.InsuranceRateSet) -> InsuranceRate:
     existing = db.execute(
         select(InsuranceRate).where(
@@ -159,3 +333,32 @@ def set_insurance_rate(db: Session, data: schemas.InsuranceRateSet) -> Insurance
     db.add(obj)
     db.flush()
     return obj
+
+
+class InsuranceRateTimeline:
+    """카테고리별 (시행일, 요율) 정렬 목록. 기준일의 요율을 이진 탐색으로 찾는다"""
+
+    def __init__(self, rows: List[Tuple[InsuranceCategoryEnum, date, Decimal]]):
+        self._dates: Dict[InsuranceCategoryEnum, List[date]] = {}
+        self._rates: Dict[InsuranceCategoryEnum, List[Decimal]] = {}
+        for category, effective_date, rate in sorted(rows, key=lambda r: r[1]):
+            self._dates.setdefault(category, []).append(effective_date)
+            self._rates.setdefault(category, []).append(Decimal(rate))
+
+    def rates_on(self, day: date) -> Dict[InsuranceCategoryEnum, Decimal]:
+        rates = {}
+        for category, dates in self._dates.items():
+            i = bisect_right(dates, day)
+            if i:
+                rates[category] = self._rates[category][i - 1]
+        return rates
+
+
+def get_insurance_rate_timeline(db: Session) -> InsuranceRateTimeline:
+    def load():
+        stmt = select(
+            InsuranceRate.category, InsuranceRate.effective_date, InsuranceRate.rate
+        )
+        return InsuranceRateTimeline([tuple(row) for row in db.execute(stmt)])
+
+    return _insurance_rate_cache.get_or_load(db, "all", load)
@@ -1,4 +1,17 @@
-from sqlalchemy import Column, Date, ForeignKey, Integer, Time, UniqueConstraint
+from datetime import datetime
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Time,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -23,3 +36,31 @@ class Attendance(Base):
     total_break_minutes = Column(Integer, default=0)
 
     user = relationship("User", back_populates="attendances")
+
+
+class AttendanceEvent(Base):  # 출퇴근 변경 이벤트 (outbox, 기록 변경과 같은 트랜잭션에 쌓음)
+    __tablename__ = "attendance_event"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    work_date = Column(Date, nullable=False)
+    action = Column(String(20), nullable=False)  # check-in / break-start / ...
+    before = Column(JSON, nullable=True)  # 변경 전 기록 (출근 시 없음)
+    after = Column(JSON, nullable=False)
+    # 클라이언트 Idempotency-Key. 같은 키의 재시도는 워커가 달라도 유니크 제약에 걸린다
+    idempotency_key = Column(String(64), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "action", "idempotency_key", name="uq_event_idempotency"
+        ),
+    )
+
+
+class OutboxCheckpoint(Base):  # 소비자별 처리 완료 지점
+    __tablename__ = "outbox_checkpoint"
+
+    consumer = Column(String(50), primary_key=True)
+    last_event_id = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
@@ -0,0 +1,243 @@
+import logging
+import threading
+import time as _time
+from datetime import date, datetime, time, timedelta
+from typing import Callable, NamedTuple, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.modules.attendance.models import AttendanceEvent, OutboxCheckpoint
+
+logger = logging.getLogger(__name__)
+
+_DATE_KEYS = ("work_date",)
+_TIME_KEYS = ("check_in", "break_start", "break_end", "check_out")
+
+
+def decode_row(row: Optional[dict]) -> Optional[dict]:
+    # 이벤트 JSON → 출퇴근 기록 dict (날짜/시각 복원)
+    if row is None:
+        return None
+    decoded = dict(row)
+    for key in _DATE_KEYS:
+        if decoded.get(key):
+            decoded[key] = date.fromisoformat(decoded[key])
+    for key in _TIME_KEYS:
+        if decoded.get(key):
+            decoded[key] = time.fromisoformat(decoded[key])
+    return decoded
+
+
+class Consumer(NamedTuple):
+    # handler(db, events): events는 id 순. 커밋하지 말 것 (체크포인트와 함께 커밋됨)
+    handler: Callable[[Session, list[AttendanceEvent]], None]
+    from_latest: bool = False  # 처음 등록 시 과거 이벤트를 건너뛸지
+
+
+_consumers: dict[str, Consumer] = {}
+
+
+def register_consumer(
+    name: str,
+    handler: Callable[[Session, list[AttendanceEvent]], None],
+    from_latest: bool = False,
+) -> None:
+    _consumers[name] = Consumer(handler, from_latest)
+
+
+def _ensure_checkpoints(db: Session) -> None:
+    if not _consumers:
+        return
+    latest = db.execute(select(func.max(AttendanceEvent.id))).scalar() or 0
+    rows = [
+        {"consumer": name, "last_event_id": latest if c.from_latest else 0}
+        for name, c in _consumers.items()
+    ]
+    db.execute(mysql_insert(OutboxCheckpoint).prefix_with("IGNORE"), rows)
+    db.commit()
+
+
+def lock_checkpoint(db: Session, name: str) -> None:
+    """
+    소비자 체크포인트 행을 현재 트랜잭션이 끝날 때까지 FOR UPDATE로 잡는다.
+    projector는 SKIP LOCKED로 잡으므로 그동안 이 소비자의 반영을 건너뛴다.
+    소비자가 쓰는 결과를 통째로 다시 계산하는 쪽이 진행 중인 반영과 엇갈리지 않게 할 때 사용.
+    """
+    db.execute(
+        select(OutboxCheckpoint.consumer)
+        .where(OutboxCheckpoint.consumer == name)
+        .with_for_update()
+    )
+
+
+def project_batch(db: Session, name: str, batch_size: int) -> int:
+    """
+    소비자 1개에 대해 체크포인트 이후 이벤트를 batch_size건 반영한다.
+    체크포인트 행을 FOR UPDATE SKIP LOCKED로 잡으므로 여러 gunicorn 워커 중 하나만 처리하고,
+    반영 결과와 체크포인트는 한 트랜잭션으로 커밋된다 (실패 시 다음 주기에 재시도).
+    """
+    checkpoint = db.execute(
+        select(OutboxCheckpoint)
+        .where(OutboxCheckpoint.consumer == name)
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+    if checkpoint is None:
+        db.rollback()
+        return 0  # 다른 워커가 처리 중
+
+    # 늦게 커밋된 트랜잭션의 작은 id를 건너뛰지 않도록 막 쌓인 이벤트는 다음 주기에
+    settled = datetime.now() - timedelta(seconds=settings.OUTBOX_SETTLE_SECONDS)
+    events = (
+        db.execute(
+            select(AttendanceEvent)
+            .where(
+                AttendanceEvent.id > checkpoint.last_event_id,
+                AttendanceEvent.created_at <= settled,
+            )
+            .order_by(AttendanceEvent.id)
+            .limit(batch_size)
+        )
+        .scalars()
+        .all()
+    )
+    if not events:
+        db.rollback()
+        return 0
+
+    _consumers[name].handler(db, events)
+    checkpoint.last_event_id = events[-1].id
+    checkpoint.updated_at = datetime.now()
+    db.commit()
+    return len(events)
+
+
+def prune_outbox(db: Session, keep_days: int, limit: int = 10000) -> int:
+    # 모든 소비자가 처리했고 보관 기간이 지난 이벤트 삭제
+    floor = db.execute(select(func.min(OutboxCheckpoint.last_event_id))).scalar()
+    if not floor:
+        return 0
+    cutoff = datetime.now() - timedelta(days=keep_days)
+    ids = (
+        db.execute(
+            select(AttendanceEvent.id)
+            .where(AttendanceEvent.id <= floor, AttendanceEvent.created_at < cutoff)
+            .order_by(AttendanceEvent.id)
+            .limit(limit)
+        )
+        .scalars()
+        .all()
+    )
+    if ids:
+        db.execute(delete(AttendanceEvent).where(AttendanceEvent.id.in_(ids)))
+        db.commit()
+    return len(ids)
+
+
+def outbox_status(db: Session) -> list[dict]:
+    latest = db.execute(select(func.max(AttendanceEvent.id))).scalar() or 0
+    result = []
+    for cp in db.execute(select(OutboxCheckpoint)).scalars():
+        oldest = db.execute(
+            select(func.min(AttendanceEvent.created_at)).where(
+                AttendanceEvent.id > cp.last_event_id
+            )
+        ).scalar()
+        result.append(
+            {
+                "consumer": cp.consumer,
+                "last_event_id": cp.last_event_id,
+                "pending": latest - cp.last_event_id,
+                "lag_sec": (
+                    round((datetime.now() - oldest).total_seconds(), 3)
+                    if oldest
+                    else 0.0
+                ),
+                "updated_at": cp.updated_at,
+            }
+        )
+    return result
+
+
+class OutboxProjector:
+    """프로세스 내 폴링 스레드. 등록된 소비자들에 outbox를 배치로 반영한다"""
+
+    PRUNE_INTERVAL = 3600
+
+    def __init__(self, poll_interval: float, batch_size: int):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_prune = 0.0
+
+    def start(self) -> None:
+        # gunicorn 워커마다 fork 이후(startup)에 시작
+        if self._thread is not None and self._thread.is_alive():
+            return
+        db = SessionLocal()
+        try:
+            _ensure_checkpoints(db)
+        finally:
+            db.close()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="outbox-projector", daemon=True
+        )
+        self._thread.start()
+
+    def run_once(self) -> int:
+        processed = 0
+        for name in list(_consumers):
+            while not self._stop.is_set():
+                db = SessionLocal()
+                try:
+                    count = project_batch(db, name, self.batch_size)
+                except Exception:
+                    db.rollback()
+                    logger.exception("outbox consumer %s failed", name)
+                    count = 0
+                finally:
+                    db.close()
+                processed += count
+                if count < self.batch_size:
+                    break
+        return processed
+
+    def _maybe_prune(self) -> None:
+        now = _time.monotonic()
+        if now - self._last_prune < self.PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        db = SessionLocal()
+        try:
+            prune_outbox(db, settings.OUTBOX_RETENTION_DAYS)
+        except Exception:
+            db.rollback()
+            logger.exception("outbox prune failed")
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.run_once()
+            self._maybe_prune()
+
+    def stop(self, timeout: float = 25.0) -> None:
+        """종료 시 폴링을 멈추고 정착된 이벤트를 한 번 더 반영한다"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._stop.clear()
+        self.run_once()
+        self._stop.set()
+
+
+projector = OutboxProjector(
+    poll_interval=settings.OUTBOX_POLL_SECONDS,
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+)
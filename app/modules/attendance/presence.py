@@ -0,0 +1,284 @@
+import asyncio
+import json
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Iterable, Mapping, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.modules.attendance.models import Attendance, AttendanceEvent
+from app.modules.attendance.outbox import decode_row
+from app.modules.auth.models import User
+
+logger = logging.getLogger(__name__)
+
+# 출퇴근 상태
+BEFORE = "before"
+WORKING = "working"
+ON_BREAK = "on_break"
+DONE = "done"
+
+
+def status_of(record: Optional[Mapping]) -> str:
+    # 출퇴근 기록(dict / Row mapping) → 현재 상태
+    if record is None or not record.get("check_in"):
+        return BEFORE
+    if record.get("check_out"):
+        return DONE
+    if record.get("break_start") and not record.get("break_end"):
+        return ON_BREAK
+    return WORKING
+
+
+def _entry(user_id: int, name: str, record: Mapping) -> dict:
+    return {
+        "user_id": user_id,
+        "name": name,
+        "work_date": record["work_date"].isoformat(),
+        "status": status_of(record),
+        "check_in": _iso(record.get("check_in")),
+        "check_out": _iso(record.get("check_out")),
+    }
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class Subscriber:
+    """SSE 연결 1개. 큐는 이벤트 루프 스레드에서만 다룬다"""
+
+    def __init__(self, hub: "PresenceHub", loop: asyncio.AbstractEventLoop, size: int):
+        self.hub = hub
+        self.loop = loop
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=size)
+
+    def push(self, message: str) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # 느린 클라이언트: 밀린 델타를 버리고 스냅샷으로 다시 맞춘다
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(sse_event("snapshot", self.hub.snapshot()))
+
+
+class PresenceHub:
+    """
+    워커 프로세스 내 "지금 매장에 누가 있는지" 상태와 SSE 구독자 목록.
+    출퇴근 API가 커밋 직후 publish()로 바로 반영하고, 다른 워커에서 처리된 출퇴근은
+    PresenceTail이 attendance_event를 읽어 반영한다.
+    델타는 한 번만 직렬화하고, 이벤트 루프마다 call_soon_threadsafe 1회로 전달한다.
+    """
+
+    QUEUE_SIZE = 256
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: dict[int, dict] = {}
+        self._names: dict[int, str] = {}
+        self._subscribers: dict[asyncio.AbstractEventLoop, set[Subscriber]] = {}
+
+    # ---- 상태 ----
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            return list(self._state.values())
+
+    def known_names(self) -> dict[int, str]:
+        with self._lock:
+            return dict(self._names)
+
+    def rebuild(self, rows: Iterable[tuple[int, str, Mapping]]) -> None:
+        state = {user_id: _entry(user_id, name, rec) for user_id, name, rec in rows}
+        with self._lock:
+            self._state = state
+            self._names.update((uid, e["name"]) for uid, e in state.items())
+            loops = {loop: tuple(subs) for loop, subs in self._subscribers.items()}
+        self._fan_out(loops, sse_event("snapshot", list(state.values())))
+
+    def publish(self, user_id: int, name: Optional[str], record: Mapping) -> bool:
+        """상태가 바뀌었을 때만 델타를 보낸다 (같은 출퇴근이 여러 경로로 들어와도 1회)"""
+        with self._lock:
+            if name is None:
+                name = self._names.get(user_id, "")
+            self._names[user_id] = name
+            entry = _entry(user_id, name, record)
+            if self._state.get(user_id) == entry:
+                return False
+            self._state[user_id] = entry
+            loops = {loop: tuple(subs) for loop, subs in self._subscribers.items()}
+        self._fan_out(loops, sse_event("presence", entry))
+        return True
+
+    def drop_finished_before(self, day: date) -> None:
+        # 날짜가 바뀌면 전날 퇴근한 사람은 목록에서 뺀다 (야간 근무 중인 사람은 유지)
+        iso = day.isoformat()
+        with self._lock:
+            self._state = {
+                uid: e
+                for uid, e in self._state.items()
+                if not (e["status"] == DONE and e["work_date"] < iso)
+            }
+            snapshot = list(self._state.values())
+            loops = {loop: tuple(subs) for loop, subs in self._subscribers.items()}
+        self._fan_out(loops, sse_event("snapshot", snapshot))
+
+    # ---- 구독 ----
+    def subscribe(self) -> tuple[Subscriber, list[dict]]:
+        # 등록과 스냅샷을 같은 락 안에서: 이후 델타는 빠짐없이 스냅샷 뒤에 온다
+        sub = Subscriber(self, asyncio.get_running_loop(), self.QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(sub.loop, set()).add(sub)
+            return sub, list(self._state.values())
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.loop)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.loop]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+    @staticmethod
+    def _deliver(subs: tuple[Subscriber, ...], message: str) -> None:
+        for sub in subs:
+            sub.push(message)
+
+    def _fan_out(self, loops: dict, message: str) -> None:
+        for loop, subs in loops.items():
+            try:
+                loop.call_soon_threadsafe(self._deliver, subs, message)
+            except RuntimeError:  # 닫힌 루프
+                pass
+
+
+hub = PresenceHub()
+
+
+def _load_today(db: Session, today: date) -> list[tuple[int, str, dict]]:
+    # 오늘 기록 + 아직 퇴근 안 한 전날 기록 (자정 넘긴 근무)
+    rows = db.execute(
+        select(Attendance, User.name)
+        .join(User, User.id == Attendance.user_id)
+        .where(Attendance.work_date >= today - timedelta(days=1))
+        .order_by(Attendance.work_date)
+    ).all()
+    result = {}
+    for record, name in rows:
+        if record.work_date < today and record.check_out is not None:
+            continue
+        result[record.user_id] = (
+            record.user_id,
+            name,
+            {c.key: getattr(record, c.key) for c in Attendance.__table__.columns},
+        )
+    return list(result.values())
+
+
+class PresenceTail:
+    """
+    워커마다 attendance_event를 최근 구간만 다시 읽어 다른 워커의 출퇴근을 반영한다.
+    (outbox 체크포인트는 워커 하나만 처리하므로 여기서는 쓰지 않는다)
+    늦게 커밋된 이벤트도 잡도록 정착 시간만큼 겹쳐 읽고, 같은 상태는 hub가 무시한다.
+    """
+
+    def __init__(self, hub: PresenceHub, poll_interval: float, overlap: float):
+        self.hub = hub
+        self.poll_interval = poll_interval
+        self.overlap = timedelta(seconds=overlap)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._since = datetime.now()
+        self._last_ids: dict[int, int] = {}
+        self._day = date.today()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._since = datetime.now()
+        self._day = date.today()
+        db = SessionLocal()
+        try:
+            self.hub.rebuild(_load_today(db, self._day))
+        finally:
+            db.close()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="presence-tail", daemon=True
+        )
+        self._thread.start()
+
+    def poll_once(self) -> int:
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self.hub.drop_finished_before(today)
+            self._last_ids.clear()
+
+        started = datetime.now()
+        db = SessionLocal()
+        try:
+            events = (
+                db.execute(
+                    select(AttendanceEvent)
+                    .where(AttendanceEvent.created_at >= self._since - self.overlap)
+                    .order_by(AttendanceEvent.id)
+                )
+                .scalars()
+                .all()
+            )
+            # 유저별 마지막 이벤트만 (배치 안에서 중간 상태를 내보내지 않도록)
+            latest: dict[int, AttendanceEvent] = {}
+            for event in events:
+                if event.id > self._last_ids.get(event.user_id, 0):
+                    latest[event.user_id] = event
+            names = self.hub.known_names()
+            missing = [uid for uid in latest if uid not in names]
+            if missing:
+                names.update(
+                    db.execute(select(User.id, User.name).where(User.id.in_(missing)))
+                    .tuples()
+                    .all()
+                )
+        finally:
+            db.close()
+
+        changed = 0
+        for user_id, event in latest.items():
+            self._last_ids[user_id] = event.id
+            record = decode_row(event.after)
+            changed += self.hub.publish(user_id, names.get(user_id), record)
+        self._since = started
+        return changed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("presence tail failed")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+
+
+tail = PresenceTail(
+    hub,
+    poll_interval=settings.OUTBOX_POLL_SECONDS,
+    overlap=settings.OUTBOX_SETTLE_SECONDS,
+)
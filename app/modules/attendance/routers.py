@@ -1,145 +1,167 @@
-from datetime import datetime, timedelta
+import asyncio
+from datetime import date, datetime
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.modules.attendance import models, schemas
+from app.core.security import get_current_admin, get_current_user
+from app.modules.attendance import presence, schemas, services
+from app.modules.attendance.outbox import outbox_status
 from app.modules.auth.models import User
-from app.modules.payroll.services import update_realtime_payroll
+from app.modules.mainpage import services as mainpage_services
 
 router = APIRouter(tags=["Attendance"])
 
 
+def _now() -> datetime:
+    # TIME 컬럼은 초 단위로 저장되므로 응답 값과 저장 값을 맞춘다
+    return datetime.now().replace(microsecond=0)
+
+
+def _run_punch(action: str, punch, db: Session, user: User, key: Optional[str]):
+    try:
+        result = services.idempotent(
+            user.id, action, key, lambda k: punch(db, user.id, _now(), k)
+        )
+    except (LookupError, ValueError) as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    presence.hub.publish(user.id, user.name, result[1])  # 이 워커의 구독자에 바로 전달
+    mainpage_services.invalidate(user.id)  # 홈 화면의 오늘 상태 갱신
+    return result
+
+
 @router.post("/check-in", response_model=schemas.AttendanceResponse)
 def check_in(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, max_length=64),
 ):
-    today = datetime.now().date()
-    existing = (
-        db.query(models.Attendance)
-        .filter_by(user_id=current_user.id, work_date=today)
-        .first()
-    )
-
-    if existing:
-        raise HTTPException(status_code=400, detail="이미 오늘 출근 기록이 있습니다.")
-
-    record = models.Attendance(
-        user_id=current_user.id,
-        work_date=today,
-        check_in=datetime.now().time(),
+    _, record = _run_punch(
+        "check-in", services.check_in, db, current_user, idempotency_key
     )
-    db.add(record)
-    db.commit()
-    db.refresh(record)
     return record
 
 
 @router.post("/break-start", response_model=schemas.AttendanceResponse)
 def break_start(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, max_length=64),
 ):
-    today = datetime.now().date()
-    record = _get_today_record(db, current_user.id, today)
-
-    if not record.check_in:
-        raise HTTPException(status_code=400, detail="출근 먼저 해주세요.")
-    if record.check_out:
-        raise HTTPException(status_code=400, detail="이미 퇴근한 기록이 있습니다.")
-    if record.break_start and not record.break_end:
-        raise HTTPException(status_code=400, detail="이미 휴식 중입니다.")
-
-    record.break_start = datetime.now().time()
-    db.commit()
-    db.refresh(record)
-    update_realtime_payroll(current_user.id, db)
+    _, record = _run_punch(
+        "break-start", services.break_start, db, current_user, idempotency_key
+    )
     return record
 
 
 @router.post("/break-end", response_model=schemas.AttendanceResponse)
 def break_end(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, max_length=64),
 ):
-    today = datetime.now().date()
-    record = _get_today_record(db, current_user.id, today)
-
-    if not record.break_start:
-        record.break_start = (datetime.now() - timedelta(minutes=30)).time()
-    record.break_end = datetime.now().time()
-
-    db.commit()
-    db.refresh(record)
-    update_realtime_payroll(current_user.id, db)
+    _, record = _run_punch(
+        "break-end", services.break_end, db, current_user, idempotency_key
+    )
     return record
 
 
 @router.post("/check-out", response_model=schemas.AttendanceResponse)
 def check_out(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, max_length=64),
 ):
-    today = datetime.now().date()
-    record = _get_today_record(db, current_user.id, today)
-
-    if not record.check_in:
-        raise HTTPException(status_code=400, detail="출근 기록이 없습니다.")
-    if record.break_start and not record.break_end:
-        raise HTTPException(
-            status_code=400,
-            detail="휴식 중에는 퇴근할 수 없습니다. 복귀 후 퇴근해주세요.",
-        )
-    if record.check_out:
-        raise HTTPException(status_code=400, detail="이미 퇴근 기록이 있습니다.")
-
-    record.check_out = datetime.now().time()
-    work_minutes, break_minutes = _calc_work_minutes(record)
-    record.total_work_minutes = work_minutes
-    record.total_break_minutes = break_minutes
-
-    db.commit()
-    db.refresh(record)
-    update_realtime_payroll(current_user.id, db)
+    # 급여 반영은 outbox 이벤트를 읽는 백그라운드 projector가 처리 (응답은 바로 반환)
+    _, record = _run_punch(
+        "check-out", services.check_out, db, current_user, idempotency_key
+    )
     return record
 
-@router.get("/me", response_model=list[schemas.AttendanceResponse])
+
+@router.get("/me", response_model=schemas.AttendancePage)
 def get_my_attendance_records(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    cursor: Optional[date] = Query(None),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    limit: int = Query(31, ge=1, le=366),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
-    records = (
-        db.query(models.Attendance)
-        .filter(models.Attendance.user_id == current_user.id)
-        .order_by(models.Attendance.work_date.desc())
-        .all()
+    items, next_cursor = services.list_records(
+        db, current_user.id, date_from, date_to, cursor, limit
     )
-    return records
+    return {"items": items, "next_cursor": next_cursor}
 
 
-def _get_today_record(db: Session, user_id: int, today):
-    record = (
-        db.query(models.Attendance).filter_by(user_id=user_id, work_date=today).first()
+@router.get("/me/export")  # 전체 이력 NDJSON 스트리밍 다운로드
+def export_my_attendance_records(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    current_user: User = Depends(get_current_user),
+):
+    return StreamingResponse(
+        services.iter_records_ndjson(current_user.id, date_from, date_to),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="attendance.ndjson"'},
     )
-    if not record:
-        raise HTTPException(status_code=400, detail="출근 기록이 없습니다.")
-    return record
 
 
-def _calc_work_minutes(record: models.Attendance):
-    work_date = record.work_date
+@router.post(
+    "/import", response_model=schemas.AttendanceImportResult
+)  # 구 근태기 데이터 대량 가져오기 (CSV / NDJSON 스트림)
+async def import_attendance_records(
+    request: Request,
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+    _admin=Depends(get_current_admin),
+):
+    return await services.import_attendance(db, request.stream(), fmt)
+
+
+@router.get(
+    "/outbox/status", response_model=list[schemas.OutboxConsumerStatus]
+)  # 출퇴근 이벤트 소비자별 처리 지연
+def get_outbox_status(
+    db: Session = Depends(get_db),
+    _admin=Depends(get_current_admin),
+):
+    return outbox_status(db)
+
+
+@router.get(
+    "/presence", response_model=list[schemas.PresenceEntry]
+)  # 지금 매장에 있는 직원 (출근 / 휴식 / 퇴근)
+def get_presence(_admin=Depends(get_current_admin)):
+    return presence.hub.snapshot()
 
-    check_in = datetime.combine(work_date, record.check_in)
-    check_out = datetime.combine(work_date, record.check_out)
-    if check_out < check_in:
-        check_out += timedelta(days=1)
 
-    total_work = (check_out - check_in).total_seconds() / 60
+PRESENCE_PING_SECONDS = 15
 
-    break_minutes = 0
-    if record.break_start and record.break_end:
-        b_start = datetime.combine(work_date, record.break_start)
-        b_end = datetime.combine(work_date, record.break_end)
-        if b_end < b_start:
-            b_end += timedelta(days=1)
-        break_minutes = (b_end - b_start).total_seconds() / 60
 
-    return int(total_work - break_minutes), int(break_minutes)
+@router.get("/presence/stream")  # SSE: 연결 시 snapshot, 이후 presence 델타
+async def stream_presence(request: Request, _admin=Depends(get_current_admin)):
+    sub, snapshot = presence.hub.subscribe()
+
+    async def events():
+        try:
+            yield presence.sse_event("snapshot", snapshot)
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(
+                        sub.queue.get(), PRESENCE_PING_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"  # 프록시 유휴 타임아웃 방지 + 끊김 감지
+        finally:
+            presence.hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,5 +1,5 @@
-from datetime import date, time
-from typing import Optional
+from datetime import date, datetime, time
+from typing import List, Optional
 
 from pydantic import BaseModel, field_serializer
 
@@ -28,3 +28,37 @@ class AttendanceResponse(AttendanceBase):
     @field_serializer("check_in", "break_start", "break_end", "check_out")
     def serialize_time(self, value: Optional[time], _info):
         return value.strftime("%H:%M:%S") if value else None
+
+
+class AttendancePage(BaseModel):
+    items: List[AttendanceResponse]
+    next_cursor: Optional[date] = None  # 다음 페이지 요청 시 cursor로 전달
+
+
+class AttendanceImportError(BaseModel):
+    line: int
+    error: str
+
+
+class AttendanceImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[AttendanceImportError]  # 앞쪽 최대 100건
+    payroll_user_months: int
+
+
+class OutboxConsumerStatus(BaseModel):
+    consumer: str
+    last_event_id: int
+    pending: int  # 아직 반영 안 된 이벤트 수 (대략)
+    lag_sec: float  # 가장 오래된 미반영 이벤트의 대기 시간
+    updated_at: Optional[datetime] = None
+
+
+class PresenceEntry(BaseModel):
+    user_id: int
+    name: str
+    work_date: date
+    status: str  # before / working / on_break / done
+    check_in: Optional[time] = None
+    check_out: Optional[time] = None
@@ -0,0 +1,485 @@
+import csv
+import json
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.modules.attendance import schemas
+from app.modules.attendance.models import Attendance, AttendanceEvent
+from app.modules.attendance.outbox import decode_row
+from app.modules.auth.models import User
+from app.modules.payroll.services import closed_months, recalculate_month_set
+from app.utils.cache_utils import TTLCache
+
+_COLUMNS = [c.key for c in Attendance.__table__.columns]
+# 조건부 UPDATE에서 "마지막으로 본 그대로"인지 확인하는 컬럼
+_GUARD_COLUMNS = (
+    "check_in",
+    "break_start",
+    "break_end",
+    "check_out",
+    "total_work_minutes",
+    "total_break_minutes",
+)
+
+# (user_id, action, Idempotency-Key) -> 처리 결과. 같은 워커로 온 재시도는 DB를 타지 않는다
+# (다른 워커로 간 재시도는 attendance_event.uq_event_idempotency가 잡는다)
+_idempotency_cache = TTLCache(maxsize=10000, ttl=600)
+
+# (user_id, work_date) -> 이 워커가 마지막으로 쓰거나 읽은 오늘 기록.
+# 추측값일 뿐이라 UPDATE의 WHERE로 검증하고, 틀리면(갱신 0건) 그때 다시 읽는다
+_today_rows = TTLCache(maxsize=10000, ttl=12 * 3600)
+
+
+def calc_work_minutes(
+    work_date: date,
+    check_in: time,
+    check_out: time,
+    break_start: Optional[time],
+    break_end: Optional[time],
+) -> tuple[int, int]:
+    """(근무분, 휴게분). 퇴근/휴식 종료가 시작보다 이르면 자정을 넘긴 것으로 본다"""
+    start = datetime.combine(work_date, check_in)
+    end = datetime.combine(work_date, check_out)
+    if end < start:
+        end += timedelta(days=1)
+
+    total_work = (end - start).total_seconds() / 60
+
+    break_minutes = 0
+    if break_start and break_end:
+        b_start = datetime.combine(work_date, break_start)
+        b_end = datetime.combine(work_date, break_end)
+        if b_end < b_start:
+            b_end += timedelta(days=1)
+        break_minutes = (b_end - b_start).total_seconds() / 60
+
+    return int(total_work - break_minutes), int(break_minutes)
+
+
+def _as_dict(record: Attendance) -> dict:
+    return {key: getattr(record, key) for key in _COLUMNS}
+
+
+def _get_today_record(db: Session, user_id: int, today: date) -> Attendance:
+    record = db.query(Attendance).filter_by(user_id=user_id, work_date=today).first()
+    if not record:
+        raise LookupError("출근 기록이 없습니다.")
+    return record
+
+
+def _encode(row: dict) -> dict:
+    return {
+        key: value.isoformat() if isinstance(value, (date, time)) else value
+        for key, value in row.items()
+    }
+
+
+def _add_event(
+    db: Session,
+    user_id: int,
+    action: str,
+    before: Optional[dict],
+    after: dict,
+    idempotency_key: Optional[str] = None,
+) -> None:
+    # 기록 변경과 같은 트랜잭션에 이벤트를 남긴다 (급여 등은 outbox를 읽어 반영)
+    db.add(
+        AttendanceEvent(
+            user_id=user_id,
+            work_date=after["work_date"],
+            action=action,
+            before=_encode(before) if before else None,
+            after=_encode(after),
+            idempotency_key=idempotency_key,
+        )
+    )
+
+
+# 각 출퇴근 처리 함수는 (변경 전, 변경 후) 기록을 dict로 돌려준다.
+# 중복 탭처럼 바뀐 것이 없으면 두 값이 같다.
+PunchResult = tuple[Optional[dict], dict]
+
+
+def _replayed(
+    db: Session, user_id: int, action: str, key: Optional[str]
+) -> Optional[PunchResult]:
+    # 같은 Idempotency-Key로 이미 처리된 요청이면 그때의 결과
+    if not key:
+        return None
+    after = db.execute(
+        select(AttendanceEvent.after).where(
+            AttendanceEvent.user_id == user_id,
+            AttendanceEvent.action == action,
+            AttendanceEvent.idempotency_key == key,
+        )
+    ).scalar()
+    if after is None:
+        return None
+    row = decode_row(after)
+    return row, row
+
+
+def _commit_event(
+    db: Session,
+    user_id: int,
+    action: str,
+    before: Optional[dict],
+    after: dict,
+    key: Optional[str],
+) -> Optional[PunchResult]:
+    """
+    이벤트를 남기고 커밋한다. 다른 워커가 같은 키로 먼저 처리했다면
+    uq_event_idempotency에 걸리므로 이번 변경을 되돌리고 그때의 결과를 돌려준다.
+    """
+    _add_event(db, user_id, action, before, after, key)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        replay = _replayed(db, user_id, action, key)
+        if replay is None:
+            raise
+        return replay
+    _today_rows.set((user_id, after["work_date"]), after)
+    return None
+
+
+def idempotent(
+    user_id: int,
+    action: str,
+    key: Optional[str],
+    fn: Callable[[Optional[str]], PunchResult],
+) -> PunchResult:
+    # Idempotency-Key 헤더가 있으면 같은 키의 재요청에 첫 결과를 그대로 돌려준다
+    if not key:
+        return fn(None)
+    cache_key = (user_id, action, key)
+    cached = _idempotency_cache.get(cache_key)
+    if cached is not None:
+        return cached, cached
+    before, after = fn(key)
+    _idempotency_cache.set(cache_key, after)
+    return before, after
+
+
+def check_in(
+    db: Session, user_id: int, now: datetime, idempotency_key: Optional[str] = None
+) -> PunchResult:
+    # INSERT 1회 + 커밋. 동시 탭으로 uq_user_workdate에 걸리면 기존 기록을 반환
+    record = Attendance(user_id=user_id, work_date=now.date(), check_in=now.time())
+    db.add(record)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        row = _as_dict(_get_today_record(db, user_id, now.date()))
+        _today_rows.set((user_id, row["work_date"]), row)
+        return row, row
+    row = _as_dict(record)
+    replay = _commit_event(db, user_id, "check-in", None, row, idempotency_key)
+    return replay or (None, row)
+
+
+def _punch(
+    db: Session,
+    user_id: int,
+    action: str,
+    today: date,
+    decide: Callable[[dict], Optional[dict]],
+    idempotency_key: Optional[str],
+) -> PunchResult:
+    """
+    decide()의 변경값을 조건부 UPDATE 1문으로 반영한다.
+    이 워커가 마지막으로 본 오늘 기록(_today_rows)을 가정하고 WHERE에 그 값을 모두 걸므로,
+    맞으면 UPDATE + 이벤트 INSERT + 커밋으로 끝난다 (조회 없음).
+    갱신 0건일 때만(처음 보는 기록 / 다른 워커·요청이 먼저 바꿈) 다시 읽어 판단한다.
+    decide()가 None이면 이미 처리된 중복 탭이므로 기존 기록을 돌려준다.
+    """
+    before = _today_rows.get((user_id, today))
+    for _ in range(3):
+        if before is None:
+            before = _as_dict(_get_today_record(db, user_id, today))
+            _today_rows.set((user_id, today), before)
+        values = decide(before)
+        if values is None:
+            return before, before
+
+        result = db.execute(
+            update(Attendance)
+            .where(
+                Attendance.id == before["id"],
+                *[
+                    getattr(Attendance, col).is_not_distinct_from(before[col])
+                    for col in _GUARD_COLUMNS
+                ],
+            )
+            .values(**values)
+        )
+        if result.rowcount == 1:
+            after = {**before, **values}
+            replay = _commit_event(db, user_id, action, before, after, idempotency_key)
+            return replay or (before, after)
+        db.rollback()
+        _today_rows.pop((user_id, today))
+        before = None
+
+    raise ValueError("다른 요청과 충돌했습니다. 다시 시도해주세요.")
+
+
+def break_start(
+    db: Session, user_id: int, now: datetime, idempotency_key: Optional[str] = None
+) -> PunchResult:
+    def decide(record: dict):
+        if not record["check_in"]:
+            raise ValueError("출근 먼저 해주세요.")
+        if record["check_out"]:
+            raise ValueError("이미 퇴근한 기록이 있습니다.")
+        if record["break_start"] and not record["break_end"]:
+            return None  # 이미 휴식 중
+        # 새 휴식 시작 시 이전 휴식 종료 시각은 비운다
+        return {"break_start": now.time(), "break_end": None}
+
+    return _punch(db, user_id, "break-start", now.date(), decide, idempotency_key)
+
+
+def break_end(
+    db: Session, user_id: int, now: datetime, idempotency_key: Optional[str] = None
+) -> PunchResult:
+    def decide(record: dict):
+        if record["break_start"] and record["break_end"]:
+            return None  # 이미 휴식 종료
+        values = {"break_end": now.time()}
+        if not record["break_start"]:
+            values["break_start"] = (now - timedelta(minutes=30)).time()
+        return values
+
+    return _punch(db, user_id, "break-end", now.date(), decide, idempotency_key)
+
+
+def check_out(
+    db: Session, user_id: int, now: datetime, idempotency_key: Optional[str] = None
+) -> PunchResult:
+    def decide(record: dict):
+        if not record["check_in"]:
+            raise ValueError("출근 기록이 없습니다.")
+        if record["check_out"]:
+            return None  # 이미 퇴근
+        if record["break_start"] and not record["break_end"]:
+            raise ValueError("휴식 중에는 퇴근할 수 없습니다. 복귀 후 퇴근해주세요.")
+        work_minutes, break_minutes = calc_work_minutes(
+            record["work_date"],
+            record["check_in"],
+            now.time(),
+            record["break_start"],
+            record["break_end"],
+        )
+        return {
+            "check_out": now.time(),
+            "total_work_minutes": work_minutes,
+            "total_break_minutes": break_minutes,
+        }
+
+    return _punch(db, user_id, "check-out", now.date(), decide, idempotency_key)
+
+
+# --------- 조회 ----------
+def _history_stmt(user_id: int, date_from: Optional[date], date_to: Optional[date]):
+    # uq_user_workdate (user_id, work_date) 인덱스 범위 스캔
+    stmt = select(Attendance).where(Attendance.user_id == user_id)
+    if date_from:
+        stmt = stmt.where(Attendance.work_date >= date_from)
+    if date_to:
+        stmt = stmt.where(Attendance.work_date <= date_to)
+    return stmt.order_by(Attendance.work_date.desc())
+
+
+def list_records(
+    db: Session,
+    user_id: int,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    cursor: Optional[date],
+    limit: int,
+) -> tuple[list[Attendance], Optional[date]]:
+    # cursor(이전 페이지 마지막 work_date)보다 이전 기록부터 limit건 (keyset)
+    stmt = _history_stmt(user_id, date_from, date_to)
+    if cursor:
+        stmt = stmt.where(Attendance.work_date < cursor)
+    items = db.execute(stmt.limit(limit + 1)).scalars().all()
+    if len(items) > limit:
+        return items[:limit], items[limit - 1].work_date
+    return items, None
+
+
+def iter_records_ndjson(
+    user_id: int, date_from: Optional[date], date_to: Optional[date]
+) -> Iterator[str]:
+    # 전체 이력 내보내기: 서버 측 커서로 읽으며 한 줄씩 흘려보낸다
+    db = SessionLocal()
+    try:
+        stmt = _history_stmt(user_id, date_from, date_to)
+        rows = db.execute(stmt.execution_options(yield_per=500)).scalars()
+        for record in rows:
+            yield schemas.AttendanceResponse.model_validate(record).model_dump_json()
+            yield "\n"
+    finally:
+        db.close()
+
+
+# --------- 대량 가져오기 (구 근태기 이관) ----------
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_ERRORS = 100
+_IMPORT_UPDATE_COLUMNS = (
+    "check_in",
+    "break_start",
+    "break_end",
+    "check_out",
+    "total_work_minutes",
+    "total_break_minutes",
+)
+
+
+def _parse_time(value) -> Optional[time]:
+    if value is None or str(value).strip() == "":
+        return None
+    return time.fromisoformat(str(value).strip())
+
+
+def parse_import_row(raw: dict, valid_user_ids: set[int]) -> dict:
+    """가져오기 1행을 검증해 Attendance 값으로 바꾼다. 잘못된 행은 ValueError"""
+    try:
+        user_id = int(raw["user_id"])
+        work_date = date.fromisoformat(str(raw["work_date"]).strip())
+        check_in = _parse_time(raw.get("check_in"))
+        break_start = _parse_time(raw.get("break_start"))
+        break_end = _parse_time(raw.get("break_end"))
+        check_out = _parse_time(raw.get("check_out"))
+    except KeyError as e:
+        raise ValueError(f"필수 항목 누락: {e.args[0]}")
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"형식 오류: {e}")
+
+    if user_id not in valid_user_ids:
+        raise ValueError(f"존재하지 않는 user_id: {user_id}")
+    if not check_in:
+        raise ValueError("출근 시각이 없습니다.")
+    if bool(break_start) != bool(break_end):
+        raise ValueError("휴식 시작/종료는 함께 입력해야 합니다.")
+
+    work_minutes, break_minutes = 0, 0
+    if check_out:
+        # 실시간 퇴근 처리와 같은 규칙
+        work_minutes, break_minutes = calc_work_minutes(
+            work_date, check_in, check_out, break_start, break_end
+        )
+        if work_minutes < 0:
+            raise ValueError("휴식 시간이 근무 시간보다 깁니다.")
+
+    return {
+        "user_id": user_id,
+        "work_date": work_date,
+        "check_in": check_in,
+        "break_start": break_start,
+        "break_end": break_end,
+        "check_out": check_out,
+        "total_work_minutes": work_minutes,
+        "total_break_minutes": break_minutes,
+    }
+
+
+async def _iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # 요청 본문을 조각 단위로 읽어 줄 단위로 넘긴다 (파일 전체를 메모리에 올리지 않음)
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").lstrip("\ufeff").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").lstrip("\ufeff").rstrip("\r")
+
+
+def _load_user_ids(db: Session) -> set[int]:
+    return set(db.execute(select(User.id)).scalars().all())
+
+
+def _write_import_batch(db: Session, rows: list[dict]) -> None:
+    # executemany 1회 + 커밋. 같은 (user_id, work_date)가 있으면 덮어쓴다
+    stmt = mysql_insert(Attendance)
+    stmt = stmt.on_duplicate_key_update(
+        {col: stmt.inserted[col] for col in _IMPORT_UPDATE_COLUMNS}
+    )
+    db.execute(stmt, rows)
+    db.commit()
+
+
+async def import_attendance(
+    db: Session, stream: AsyncIterator[bytes], fmt: str
+) -> dict:
+    """
+    CSV(헤더 포함) / NDJSON 스트림을 IMPORT_BATCH_SIZE 단위로 저장한다.
+    급여 재계산은 행마다가 아니라 마지막에 영향받은 (유저, 월)마다 한 번씩.
+    """
+    valid_user_ids = await run_in_threadpool(_load_user_ids, db)
+    closed = await run_in_threadpool(closed_months, db)  # 마감된 달은 수정 불가
+    batch: list[dict] = []
+    errors: list[dict] = []
+    imported = failed = 0
+    affected: dict[tuple[int, int], set[int]] = {}
+    header = None
+    line_no = 0
+
+    async for line in _iter_lines(stream):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            if fmt == "csv":
+                values = next(csv.reader([line]))
+                if header is None:
+                    header = [h.strip() for h in values]
+                    continue
+                raw = dict(zip(header, values))
+            else:
+                raw = json.loads(line)
+                if not isinstance(raw, dict):
+                    raise ValueError("JSON 객체가 아닙니다.")
+            row = parse_import_row(raw, valid_user_ids)
+            work_date = row["work_date"]
+            if (work_date.year, work_date.month) in closed:
+                raise ValueError(f"마감된 월입니다: {work_date:%Y-%m}")
+        except ValueError as e:
+            failed += 1
+            if len(errors) < IMPORT_MAX_ERRORS:
+                errors.append({"line": line_no, "error": str(e)})
+            continue
+
+        batch.append(row)
+        affected.setdefault((work_date.year, work_date.month), set()).add(
+            row["user_id"]
+        )
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await run_in_threadpool(_write_import_batch, db, batch)
+            imported += len(batch)
+            batch = []
+
+    if batch:
+        await run_in_threadpool(_write_import_batch, db, batch)
+        imported += len(batch)
+
+    for (year, month), user_ids in sorted(affected.items()):
+        await run_in_threadpool(recalculate_month_set, db, year, month, user_ids)
+
+    return {
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "payroll_user_months": sum(len(ids) for ids in affected.values()),
+    }
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import enum
 
-from sqlalchemy import JSON, Boolean, Column, Date, Enum, Integer, String
+from sqlalchemy import JSON, Boolean, Column, Date, Enum, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -25,6 +25,19 @@ class GenderEnum(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # 관리자 직원 검색용 (한글 이름 부분 일치: ngram, 기본 토큰 2글자)
+        Index(
+            "ft_users_search",
+            "name",
+            "username",
+            "email",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+        # 영문 검색어는 아이디/이메일 앞부분 일치 (username은 unique 인덱스)
+        Index("idx_users_email", "email"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, nullable=False, comment="로그인 ID")
@@ -53,6 +66,9 @@ class User(Base):
     user_wages = relationship(
         "UserWage", back_populates="user", cascade="all, delete"
     )  # 개별 시급
+    schedules = relationship(
+        "Schedule", back_populates="user", cascade="all, delete"
+    )  # 근무표
 
     def __repr__(self):
         return f"<User(username={self.username}, position={self.position})>"
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -10,13 +11,30 @@ router = APIRouter()
 
 
 @router.post("/login", response_model=schemas.TokenResponse)
-def login(payload: schemas.LoginRequest, db: Session = Depends(get_db)):
-    user = services.get_user_by_username(db, payload.username)
-    if not user or not services.verify_password(payload.password, user.password):
+async def login(
+    payload: schemas.LoginRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    user = await run_in_threadpool(services.get_user_by_username, db, payload.username)
+    try:
+        verified = user is not None and await services.verify_password_async(
+            payload.password, user.password
+        )
+    except services.PasswordHashBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
 
+    if services.needs_rehash(user.password):
+        background_tasks.add_task(services.rehash_password, user.id, payload.password)
+
     token = services.create_access_token(
         sub=str(user.id),
         username=user.username,
@@ -1,12 +1,17 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import jwt
 from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.database import SessionLocal
 from app.modules.auth.models import PositionEnum, User
 
 pwd_context = CryptContext(
@@ -15,16 +20,71 @@ pwd_context = CryptContext(
     deprecated=["bcrypt"],  # bcrypt는 점진 폐기
 )
 
+logger = logging.getLogger(__name__)
+
+# --- password hashing pool ---
+# bcrypt 연산은 요청 스레드풀과 분리된 전용 풀에서 실행한다.
+# 실행 중 + 대기 작업이 한도를 넘으면 기다리지 않고 PasswordHashBusy로 즉시 실패.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="pwhash"
+)
+_hash_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE
+)
+
+
+class PasswordHashBusy(RuntimeError):
+    pass
+
+
+def _submit_hash_job(fn, *args) -> Future:
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHashBusy("비밀번호 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+    try:
+        future = _hash_executor.submit(fn, *args)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return future
+
+
 # --- password helpers ---
 # 신규 직원 생성 시 비밀번호 저장도 패스워드 해시처리(hash_password()) 사용
 
 
 def hash_password(raw: str) -> str:
-    return pwd_context.hash(raw)
+    return _submit_hash_job(pwd_context.hash, raw).result()
 
 
 def verify_password(raw: str, hashed: str) -> bool:
-    return pwd_context.verify(raw, hashed)
+    return _submit_hash_job(pwd_context.verify, raw, hashed).result()
+
+
+async def verify_password_async(raw: str, hashed: str) -> bool:
+    # 이벤트 루프/요청 스레드를 점유하지 않고 해시 풀 결과를 기다린다
+    return await asyncio.wrap_future(_submit_hash_job(pwd_context.verify, raw, hashed))
+
+
+def needs_rehash(hashed: str) -> bool:
+    return pwd_context.needs_update(hashed)
+
+
+def rehash_password(user_id: int, raw: str) -> None:
+    # 로그인 성공 후 백그라운드에서 폐기 예정(bcrypt) 해시를 bcrypt_sha256으로 교체
+    try:
+        new_hash = hash_password(raw)
+    except PasswordHashBusy:
+        return  # 기회적 작업이므로 혼잡하면 다음 로그인으로 미룬다
+    db = SessionLocal()
+    try:
+        db.execute(update(User).where(User.id == user_id).values(password=new_hash))
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("password rehash failed user=%s", user_id)
+    finally:
+        db.close()
 
 
 # --- user helpers ---
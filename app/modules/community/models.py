@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+
+from app.core.database import Base
+
+
+class Post(Base):  # 게시글 (댓글/좋아요 수는 이 행에서 증감)
+    __tablename__ = "posts"
+    __table_args__ = (Index("idx_post_feed", "is_pinned", "created_at", "id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    author_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    title = Column(String(200), nullable=False)
+    content = Column(Text, nullable=False)
+    is_pinned = Column(Boolean, nullable=False, default=False)  # 공지 고정
+    comment_count = Column(Integer, nullable=False, default=0)
+    like_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    updated_at = Column(DateTime, nullable=True, onupdate=datetime.now)
+
+
+class Comment(Base):
+    __tablename__ = "comments"
+    __table_args__ = (Index("idx_comment_post", "post_id", "id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    post_id = Column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False
+    )
+    author_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+
+class PostLike(Base):  # (게시글, 유저) 1건 = 좋아요 1
+    __tablename__ = "post_likes"
+
+    post_id = Column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
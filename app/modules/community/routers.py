@@ -1,8 +1,183 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.modules.auth.models import User
+from app.modules.community import schemas, services
+from app.utils.permission_utils import RoleChecker
 
 router = APIRouter()
 
 
-@router.get("/")
-def get_community():
-    return {"message": "Hello World"}
+def _community_error(db: Session, e: Exception) -> HTTPException:
+    db.rollback()
+    if isinstance(e, LookupError):
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if isinstance(e, PermissionError):
+        return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# ---- Posts ----
+@router.get("/posts", response_model=schemas.PostPage)  # 고정글 → 최신순
+def list_posts(
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    try:
+        items, next_cursor = services.list_posts(db, cursor, limit)
+    except ValueError as e:
+        raise _community_error(db, e)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post(
+    "/posts", response_model=schemas.PostResponse, status_code=status.HTTP_201_CREATED
+)
+def create_post(
+    payload: schemas.PostCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    is_admin = RoleChecker.is_admin(current_user.position)
+    post = services.create_post(db, current_user.id, payload, is_admin)
+    db.commit()
+    services.invalidate()
+    return services.get_post(db, post.id, current_user.id)
+
+
+@router.get("/posts/{postId}", response_model=schemas.PostResponse)
+def get_post(
+    postId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        return services.get_post(db, postId, current_user.id)
+    except LookupError as e:
+        raise _community_error(db, e)
+
+
+@router.patch("/posts/{postId}", response_model=schemas.PostResponse)
+def update_post(
+    postId: int = Path(..., ge=1),
+    payload: schemas.PostUpdate = ...,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    is_admin = RoleChecker.is_admin(current_user.position)
+    try:
+        services.update_post(db, postId, current_user.id, payload, is_admin)
+        db.commit()
+    except (LookupError, PermissionError, ValueError) as e:
+        raise _community_error(db, e)
+    services.invalidate(postId)
+    return services.get_post(db, postId, current_user.id)
+
+
+@router.delete("/posts/{postId}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_post(
+    postId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    is_admin = RoleChecker.is_admin(current_user.position)
+    try:
+        services.delete_post(db, postId, current_user.id, is_admin)
+        db.commit()
+    except (LookupError, PermissionError) as e:
+        raise _community_error(db, e)
+    services.invalidate(postId)
+
+
+# ---- Comments ----
+@router.get("/posts/{postId}/comments", response_model=schemas.CommentPage)
+def list_comments(
+    postId: int = Path(..., ge=1),
+    cursor: Optional[int] = Query(None, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    items, next_cursor = services.list_comments(db, postId, cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post(
+    "/posts/{postId}/comments",
+    response_model=schemas.CommentResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_comment(
+    postId: int = Path(..., ge=1),
+    payload: schemas.CommentCreate = ...,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        comment = services.create_comment(
+            db, postId, current_user.id, payload.content
+        )
+        db.commit()
+    except LookupError as e:
+        raise _community_error(db, e)
+    services.invalidate(postId)
+    return {
+        "id": comment.id,
+        "post_id": comment.post_id,
+        "author_id": comment.author_id,
+        "author_name": current_user.name,
+        "content": comment.content,
+        "created_at": comment.created_at,
+    }
+
+
+@router.delete("/comments/{commentId}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_comment(
+    commentId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    is_admin = RoleChecker.is_admin(current_user.position)
+    try:
+        post_id = services.delete_comment(db, commentId, current_user.id, is_admin)
+        db.commit()
+    except (LookupError, PermissionError) as e:
+        raise _community_error(db, e)
+    services.invalidate(post_id)
+
+
+# ---- Likes ----
+@router.post("/posts/{postId}/like", response_model=schemas.LikeResponse)
+def like_post(
+    postId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        result = services.like_post(db, postId, current_user.id)
+        db.commit()
+    except LookupError as e:
+        raise _community_error(db, e)
+    services.invalidate(postId)
+    return result
+
+
+@router.delete("/posts/{postId}/like", response_model=schemas.LikeResponse)
+def unlike_post(
+    postId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        result = services.unlike_post(db, postId, current_user.id)
+        db.commit()
+    except LookupError as e:
+        raise _community_error(db, e)
+    services.invalidate(postId)
+    return result
@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class PostCreate(BaseModel):
+    title: str = Field(min_length=1, max_length=200)
+    content: str = Field(min_length=1)
+    is_pinned: bool = False  # 관리자만 반영
+
+
+class PostUpdate(BaseModel):
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    content: Optional[str] = Field(None, min_length=1)
+    is_pinned: Optional[bool] = None  # 관리자만
+
+
+class PostSummary(BaseModel):
+    id: int
+    author_id: int
+    author_name: str
+    title: str
+    is_pinned: bool
+    comment_count: int
+    like_count: int
+    created_at: datetime
+
+
+class PostResponse(PostSummary):
+    content: str
+    updated_at: Optional[datetime] = None
+    liked: bool = False  # 요청한 유저의 좋아요 여부
+
+
+class PostPage(BaseModel):
+    items: List[PostSummary]
+    next_cursor: Optional[str] = None  # 다음 페이지 요청 시 cursor로 전달
+
+
+class CommentCreate(BaseModel):
+    content: str = Field(min_length=1)
+
+
+class CommentResponse(BaseModel):
+    id: int
+    post_id: int
+    author_id: int
+    author_name: str
+    content: str
+    created_at: datetime
+
+
+class CommentPage(BaseModel):
+    items: List[CommentResponse]
+    next_cursor: Optional[int] = None
+
+
+class LikeResponse(BaseModel):
+    liked: bool
+    like_count: int
@@ -0,0 +1,238 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.modules.auth.models import User
+from app.modules.community import schemas
+from app.modules.community.models import Comment, Post, PostLike
+from app.utils.cache_utils import TTLCache
+
+# 글 상세 read-through 캐시 (많이 읽히는 글만 LRU로 남음), 첫 페이지 목록 캐시.
+# 글/댓글/좋아요 쓰기 시 무효화, 다른 워커는 ttl 이내 반영
+_post_cache = TTLCache(maxsize=512, ttl=60)
+_feed_cache = TTLCache(maxsize=8, ttl=10)
+
+_SUMMARY_COLUMNS = (
+    Post.id,
+    Post.author_id,
+    User.name.label("author_name"),
+    Post.title,
+    Post.is_pinned,
+    Post.comment_count,
+    Post.like_count,
+    Post.created_at,
+)
+
+
+def invalidate(post_id: Optional[int] = None) -> None:
+    # 쓰기 커밋 후 라우터에서 호출 (커밋 전에 지우면 옛 값이 다시 채워질 수 있음)
+    if post_id is not None:
+        _post_cache.pop(post_id)
+    _feed_cache.clear()
+
+
+# --------- 목록 (keyset: 고정글 → 최신순) ----------
+def _encode_cursor(row) -> str:
+    return f"{int(row.is_pinned)}|{row.created_at.isoformat()}|{row.id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[bool, datetime, int]:
+    try:
+        pinned, created_at, post_id = cursor.split("|")
+        return bool(int(pinned)), datetime.fromisoformat(created_at), int(post_id)
+    except ValueError:
+        raise ValueError("잘못된 cursor 입니다.")
+
+
+def _load_feed(
+    db: Session, cursor: Optional[str], limit: int
+) -> tuple[list[dict], Optional[str]]:
+    stmt = select(*_SUMMARY_COLUMNS).join(User, User.id == Post.author_id)
+    if cursor:
+        # idx_post_feed (is_pinned, created_at, id) 역순 범위 스캔
+        stmt = stmt.where(
+            tuple_(Post.is_pinned, Post.created_at, Post.id) < _decode_cursor(cursor)
+        )
+    rows = db.execute(
+        stmt.order_by(
+            Post.is_pinned.desc(), Post.created_at.desc(), Post.id.desc()
+        ).limit(limit + 1)
+    ).all()
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return [dict(r._mapping) for r in rows[:limit]], next_cursor
+
+
+def list_posts(
+    db: Session, cursor: Optional[str], limit: int
+) -> tuple[list[dict], Optional[str]]:
+    if cursor:
+        return _load_feed(db, cursor, limit)
+    # 첫 페이지는 모두가 같은 결과를 보므로 짧게 캐시
+    return _feed_cache.get_or_load(limit, lambda: _load_feed(db, None, limit))
+
+
+def list_notices(db: Session, limit: int) -> list[dict]:
+    # 고정 공지 최신순 (idx_post_feed 앞부분), 글 쓰기 시 목록 캐시와 함께 무효화
+    def load() -> list[dict]:
+        rows = db.execute(
+            select(*_SUMMARY_COLUMNS)
+            .join(User, User.id == Post.author_id)
+            .where(Post.is_pinned.is_(True))
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(limit)
+        ).all()
+        return [dict(r._mapping) for r in rows]
+
+    return _feed_cache.get_or_load(("notices", limit), load)
+
+
+# --------- 글 ----------
+def _load_post(db: Session, post_id: int) -> Optional[dict]:
+    row = db.execute(
+        select(*_SUMMARY_COLUMNS, Post.content, Post.updated_at)
+        .join(User, User.id == Post.author_id)
+        .where(Post.id == post_id)
+    ).first()
+    return dict(row._mapping) if row else None
+
+
+def get_post(db: Session, post_id: int, user_id: int) -> dict:
+    post = _post_cache.get(post_id)
+    if post is None:
+        post = _load_post(db, post_id)
+        if post is None:
+            raise LookupError("해당 게시글이 존재하지 않습니다.")
+        _post_cache.set(post_id, post)
+    liked = db.get(PostLike, (post_id, user_id)) is not None
+    return {**post, "liked": liked}
+
+
+def _get_own_post(db: Session, post_id: int, user_id: int, is_admin: bool) -> Post:
+    post = db.get(Post, post_id)
+    if not post:
+        raise LookupError("해당 게시글이 존재하지 않습니다.")
+    if post.author_id != user_id and not is_admin:
+        raise PermissionError("본인 글만 수정/삭제할 수 있습니다.")
+    return post
+
+
+def create_post(
+    db: Session, user_id: int, data: schemas.PostCreate, is_admin: bool
+) -> Post:
+    post = Post(
+        author_id=user_id,
+        title=data.title,
+        content=data.content,
+        is_pinned=data.is_pinned and is_admin,
+    )
+    db.add(post)
+    db.flush()
+    return post
+
+
+def update_post(
+    db: Session, post_id: int, user_id: int, data: schemas.PostUpdate, is_admin: bool
+) -> Post:
+    post = _get_own_post(db, post_id, user_id, is_admin)
+    payload = data.model_dump(exclude_unset=True)
+    if "is_pinned" in payload and not is_admin:
+        raise PermissionError("공지 고정은 관리자만 할 수 있습니다.")
+    if not payload:
+        raise ValueError("변경할 값이 없습니다.")
+    for k, v in payload.items():
+        setattr(post, k, v)
+    db.flush()
+    return post
+
+
+def delete_post(db: Session, post_id: int, user_id: int, is_admin: bool) -> None:
+    post = _get_own_post(db, post_id, user_id, is_admin)
+    db.delete(post)
+
+
+# --------- 댓글 ----------
+def list_comments(
+    db: Session, post_id: int, cursor: Optional[int], limit: int
+) -> tuple[list[dict], Optional[int]]:
+    # 오래된 순, idx_comment_post (post_id, id)
+    stmt = (
+        select(
+            Comment.id,
+            Comment.post_id,
+            Comment.author_id,
+            User.name.label("author_name"),
+            Comment.content,
+            Comment.created_at,
+        )
+        .join(User, User.id == Comment.author_id)
+        .where(Comment.post_id == post_id)
+    )
+    if cursor:
+        stmt = stmt.where(Comment.id > cursor)
+    rows = db.execute(stmt.order_by(Comment.id).limit(limit + 1)).all()
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    return [dict(r._mapping) for r in rows[:limit]], next_cursor
+
+
+def _bump_counter(db: Session, post_id: int, column, delta: int) -> int:
+    # 조회 없이 원자적으로 증감 (COUNT(*) 재계산 없음)
+    result = db.execute(
+        update(Post).where(Post.id == post_id).values({column: column + delta})
+    )
+    return result.rowcount
+
+
+def create_comment(db: Session, post_id: int, user_id: int, content: str) -> Comment:
+    if not _bump_counter(db, post_id, Post.comment_count, 1):
+        raise LookupError("해당 게시글이 존재하지 않습니다.")
+    comment = Comment(post_id=post_id, author_id=user_id, content=content)
+    db.add(comment)
+    db.flush()
+    return comment
+
+
+def delete_comment(db: Session, comment_id: int, user_id: int, is_admin: bool) -> int:
+    # 삭제한 댓글의 게시글 id (캐시 무효화용)
+    comment = db.get(Comment, comment_id)
+    if not comment:
+        raise LookupError("해당 댓글이 존재하지 않습니다.")
+    if comment.author_id != user_id and not is_admin:
+        raise PermissionError("본인 댓글만 삭제할 수 있습니다.")
+    post_id = comment.post_id
+    deleted = db.execute(delete(Comment).where(Comment.id == comment_id)).rowcount
+    if deleted:
+        _bump_counter(db, post_id, Post.comment_count, -1)
+    return post_id
+
+
+# --------- 좋아요 ----------
+def _like_count(db: Session, post_id: int) -> int:
+    return db.execute(select(Post.like_count).where(Post.id == post_id)).scalar_one()
+
+
+def like_post(db: Session, post_id: int, user_id: int) -> dict:
+    # 이미 눌렀으면 그대로 (PK 중복), 처음일 때만 +1
+    if db.get(Post, post_id) is None:
+        raise LookupError("해당 게시글이 존재하지 않습니다.")
+    try:
+        with db.begin_nested():
+            db.add(PostLike(post_id=post_id, user_id=user_id))
+    except IntegrityError:
+        pass
+    else:
+        _bump_counter(db, post_id, Post.like_count, 1)
+    return {"liked": True, "like_count": _like_count(db, post_id)}
+
+
+def unlike_post(db: Session, post_id: int, user_id: int) -> dict:
+    if db.get(Post, post_id) is None:
+        raise LookupError("해당 게시글이 존재하지 않습니다.")
+    deleted = db.execute(
+        delete(PostLike).where(PostLike.post_id == post_id, PostLike.user_id == user_id)
+    ).rowcount
+    if deleted:
+        _bump_counter(db, post_id, Post.like_count, -1)
+    return {"liked": False, "like_count": _like_count(db, post_id)}
@@ -0,0 +1,84 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+
+from app.core.database import Base
+
+
+class LeaveStatusEnum(str, enum.Enum):
+    pending = "대기"
+    approved = "승인"
+    rejected = "반려"
+    cancelled = "취소"
+
+
+class LeaveEntryKindEnum(str, enum.Enum):
+    grant = "부여"
+    use = "사용"
+    restore = "복원"  # 승인된 휴가 취소
+    adjust = "조정"
+
+
+class LeaveRequest(Base):  # 휴가 신청
+    __tablename__ = "leave_request"
+    __table_args__ = (
+        Index("idx_leave_request_user", "user_id", "start_date"),
+        Index("idx_leave_request_status", "status", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    days = Column(Integer, nullable=False)  # 기간 내 영업일 수
+    reason = Column(String(255), nullable=True)
+    status = Column(
+        Enum(LeaveStatusEnum), nullable=False, default=LeaveStatusEnum.pending
+    )
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    decided_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+    decided_at = Column(DateTime, nullable=True)
+
+
+class LeaveLedger(Base):  # 휴가 잔여일 원장 (추가만, 수정/삭제 없음)
+    __tablename__ = "leave_ledger"
+    __table_args__ = (Index("idx_leave_ledger_user", "user_id", "id"),)
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    delta = Column(Integer, nullable=False)  # 부여/복원 +, 사용 -
+    kind = Column(Enum(LeaveEntryKindEnum), nullable=False)
+    request_id = Column(Integer, ForeignKey("leave_request.id", ondelete="SET NULL"))
+    memo = Column(String(255), nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+
+class LeaveBalance(Base):  # 유저별 잔여일 (원장 누적값, 조회는 이 행 1건)
+    __tablename__ = "leave_balance"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    balance = Column(Integer, nullable=False, default=0)
+    granted = Column(Integer, nullable=False, default=0)
+    used = Column(Integer, nullable=False, default=0)
+    # 대기 중 신청일 합 (신청 +, 승인/반려/취소 -). 원장과 별개로 신청 상태를 따라간다
+    pending = Column(Integer, nullable=False, default=0, server_default="0")
+    last_entry_id = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
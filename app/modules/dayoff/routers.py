@@ -1,8 +1,169 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_current_admin, get_current_user
+from app.modules.auth.models import User
+from app.modules.dayoff import schemas, services
+from app.modules.dayoff.models import LeaveStatusEnum
+from app.utils.permission_utils import RoleChecker
 
 router = APIRouter()
 
 
-@router.get("/")
-def get_dayoff():
-    return {"message": "Hello World"}
+def _leave_error(db: Session, e: Exception) -> HTTPException:
+    db.rollback()
+    if isinstance(e, LookupError):
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/balance", response_model=schemas.LeaveBalanceResponse)  # 내 잔여 휴가
+def get_my_balance(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return services.get_balance(db, current_user.id)
+
+
+@router.get("/balance/{userId}", response_model=schemas.LeaveBalanceResponse)
+def get_user_balance(
+    userId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    _admin=Depends(get_current_admin),
+):
+    return services.get_balance(db, userId)
+
+
+@router.get("/ledger", response_model=list[schemas.LeaveLedgerResponse])  # 내 원장
+def get_my_ledger(
+    cursor: Optional[int] = Query(None, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    items, _ = services.list_ledger(db, current_user.id, cursor, limit)
+    return items
+
+
+@router.post(
+    "/grants",
+    response_model=schemas.LeaveLedgerResponse,
+    status_code=status.HTTP_201_CREATED,
+)  # 휴가일 부여 / 차감 조정
+def grant_leave(
+    payload: schemas.LeaveGrant,
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    try:
+        entry = services.grant_leave(
+            db, payload.user_id, payload.days, payload.memo, current_admin.id
+        )
+        db.commit()
+    except ValueError as e:
+        raise _leave_error(db, e)
+    return entry
+
+
+@router.post(
+    "/requests",
+    response_model=schemas.LeaveRequestResponse,
+    status_code=status.HTTP_201_CREATED,
+)  # 휴가 신청
+def create_request(
+    payload: schemas.LeaveRequestCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        request = services.create_request(
+            db, current_user.id, payload.start_date, payload.end_date, payload.reason
+        )
+        db.commit()
+    except ValueError as e:
+        raise _leave_error(db, e)
+    return request
+
+
+@router.get("/requests", response_model=schemas.LeaveRequestPage)
+def list_requests(
+    user_id: Optional[int] = Query(None, ge=1),
+    status_: Optional[LeaveStatusEnum] = Query(None, alias="status"),
+    cursor: Optional[int] = Query(None, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not RoleChecker.is_admin(current_user.position):
+        user_id = current_user.id  # 일반 직원은 본인 신청만
+    items, next_cursor = services.list_requests(db, user_id, status_, cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post(
+    "/requests/{requestId}/approve", response_model=schemas.LeaveRequestResponse
+)
+def approve_request(
+    requestId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    try:
+        request = services.approve_request(db, requestId, current_admin.id)
+        db.commit()
+    except (LookupError, ValueError) as e:
+        raise _leave_error(db, e)
+    return request
+
+
+@router.post(
+    "/requests/{requestId}/reject", response_model=schemas.LeaveRequestResponse
+)
+def reject_request(
+    requestId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    try:
+        request = services.reject_request(db, requestId, current_admin.id)
+        db.commit()
+    except (LookupError, ValueError) as e:
+        raise _leave_error(db, e)
+    return request
+
+
+@router.post(
+    "/requests/{requestId}/cancel", response_model=schemas.LeaveRequestResponse
+)
+def cancel_request(
+    requestId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        request = services.cancel_request(
+            db,
+            requestId,
+            current_user.id,
+            RoleChecker.is_admin(current_user.position),
+        )
+        db.commit()
+    except (LookupError, ValueError) as e:
+        raise _leave_error(db, e)
+    return request
+
+
+@router.post(
+    "/balances/check", response_model=schemas.LeaveBalanceCheck
+)  # 원장 기준 잔여일 정합성 점검 (fix=true면 바로잡음)
+def check_balances(
+    fix: bool = Query(False),
+    db: Session = Depends(get_db),
+    _admin=Depends(get_current_admin),
+):
+    result = services.check_balances(db, fix)
+    db.commit()
+    return result
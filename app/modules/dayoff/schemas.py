@@ -0,0 +1,72 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.modules.dayoff.models import LeaveEntryKindEnum, LeaveStatusEnum
+
+
+class LeaveRequestCreate(BaseModel):
+    start_date: date
+    end_date: date
+    reason: Optional[str] = None
+
+
+class LeaveRequestResponse(BaseModel):
+    id: int
+    user_id: int
+    start_date: date
+    end_date: date
+    days: int
+    reason: Optional[str] = None
+    status: LeaveStatusEnum
+    created_at: datetime
+    decided_by: Optional[int] = None
+    decided_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class LeaveRequestPage(BaseModel):
+    items: List[LeaveRequestResponse]
+    next_cursor: Optional[int] = None  # 다음 페이지 요청 시 cursor로 전달
+
+
+class LeaveGrant(BaseModel):
+    user_id: int
+    days: int  # 음수면 차감 조정
+    memo: Optional[str] = None
+
+
+class LeaveLedgerResponse(BaseModel):
+    id: int
+    user_id: int
+    delta: int
+    kind: LeaveEntryKindEnum
+    request_id: Optional[int] = None
+    memo: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LeaveBalanceResponse(BaseModel):
+    user_id: int
+    balance: int
+    granted: int
+    used: int
+    pending: int = 0  # 승인 대기 중인 신청 일수 (잔여일에는 아직 반영 안 됨)
+
+
+class LeaveBalanceDrift(BaseModel):
+    user_id: int
+    stored: Optional[int]  # leave_balance 값 (없으면 None)
+    expected: int  # 원장 합계
+
+
+class LeaveBalanceCheck(BaseModel):
+    checked: int
+    drifted: List[LeaveBalanceDrift]
+    fixed: bool
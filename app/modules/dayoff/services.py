@@ -0,0 +1,394 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+
+from app.modules.admin import calendar
+from app.modules.dayoff.models import (
+    LeaveBalance,
+    LeaveEntryKindEnum,
+    LeaveLedger,
+    LeaveRequest,
+    LeaveStatusEnum,
+)
+
+# 사용 집계에 들어가는 종류 (복원은 delta가 양수라 사용일이 그만큼 줄어든다)
+_USE_KINDS = (LeaveEntryKindEnum.use, LeaveEntryKindEnum.restore)
+
+
+# --------- 원장 / 잔여일 ----------
+def _append_entry(
+    db: Session,
+    user_id: int,
+    delta: int,
+    kind: LeaveEntryKindEnum,
+    request_id: Optional[int] = None,
+    memo: Optional[str] = None,
+    created_by: Optional[int] = None,
+) -> LeaveLedger:
+    """원장에 1건 추가하고 잔여일 행을 같은 트랜잭션에서 증분 갱신 (UPSERT 1문)"""
+    entry = LeaveLedger(
+        user_id=user_id,
+        delta=delta,
+        kind=kind,
+        request_id=request_id,
+        memo=memo,
+        created_by=created_by,
+    )
+    db.add(entry)
+    db.flush()
+
+    used = -delta if kind in _USE_KINDS else 0
+    granted = 0 if kind in _USE_KINDS else delta
+    now = datetime.now()
+    stmt = mysql_insert(LeaveBalance).values(
+        user_id=user_id,
+        balance=delta,
+        granted=granted,
+        used=used,
+        last_entry_id=entry.id,
+        updated_at=now,
+    )
+    db.execute(
+        stmt.on_duplicate_key_update(
+            balance=LeaveBalance.balance + delta,
+            granted=LeaveBalance.granted + granted,
+            used=LeaveBalance.used + used,
+            last_entry_id=entry.id,
+            updated_at=now,
+        )
+    )
+    return entry
+
+
+def _add_pending(db: Session, user_id: int, days: int) -> None:
+    # 신청 상태 변화에 맞춰 대기 일수만 증분 갱신 (UPSERT 1문)
+    now = datetime.now()
+    stmt = mysql_insert(LeaveBalance).values(
+        user_id=user_id, pending=days, updated_at=now
+    )
+    db.execute(
+        stmt.on_duplicate_key_update(
+            pending=LeaveBalance.pending + days, updated_at=now
+        )
+    )
+
+
+def get_balance(db: Session, user_id: int) -> dict:
+    row = db.get(LeaveBalance, user_id)
+    return {
+        "user_id": user_id,
+        "balance": row.balance if row else 0,
+        "granted": row.granted if row else 0,
+        "used": row.used if row else 0,
+        "pending": row.pending if row else 0,
+    }
+
+
+def _locked_balance(db: Session, user_id: int) -> int:
+    # 승인 시 잔여일 확인과 차감 사이에 다른 승인이 끼지 않도록 행 잠금
+    balance = db.execute(
+        select(LeaveBalance.balance)
+        .where(LeaveBalance.user_id == user_id)
+        .with_for_update()
+    ).scalar()
+    return balance or 0
+
+
+def grant_leave(
+    db: Session, user_id: int, days: int, memo: Optional[str], admin_id: int
+) -> LeaveLedger:
+    if days == 0:
+        raise ValueError("0일은 부여할 수 없습니다.")
+    kind = LeaveEntryKindEnum.grant if days > 0 else LeaveEntryKindEnum.adjust
+    if days < 0 and _locked_balance(db, user_id) + days < 0:
+        raise ValueError("잔여일보다 많이 차감할 수 없습니다.")
+    return _append_entry(db, user_id, days, kind, memo=memo, created_by=admin_id)
+
+
+def list_ledger(
+    db: Session, user_id: int, cursor: Optional[int], limit: int
+) -> tuple[list[LeaveLedger], Optional[int]]:
+    stmt = select(LeaveLedger).where(LeaveLedger.user_id == user_id)
+    if cursor:
+        stmt = stmt.where(LeaveLedger.id < cursor)
+    items = (
+        db.execute(stmt.order_by(LeaveLedger.id.desc()).limit(limit + 1))
+        .scalars()
+        .all()
+    )
+    if len(items) > limit:
+        return items[:limit], items[limit - 1].id
+    return items, None
+
+
+# --------- 신청 / 승인 ----------
+def create_request(
+    db: Session, user_id: int, start: date, end: date, reason: Optional[str]
+) -> LeaveRequest:
+    if end < start:
+        raise ValueError("종료일이 시작일보다 빠릅니다.")
+    if start < date.today():
+        raise ValueError("지난 날짜는 신청할 수 없습니다.")
+    days = calendar.count_business_days(db, start, end)
+    if days <= 0:
+        raise ValueError("기간 내 영업일이 없습니다.")
+
+    overlapping = db.execute(
+        select(LeaveRequest.id).where(
+            LeaveRequest.user_id == user_id,
+            LeaveRequest.status.in_(
+                [LeaveStatusEnum.pending, LeaveStatusEnum.approved]
+            ),
+            LeaveRequest.start_date <= end,
+            LeaveRequest.end_date >= start,
+        )
+    ).first()
+    if overlapping:
+        raise ValueError("기간이 겹치는 신청이 있습니다.")
+
+    # 같은 유저의 동시 신청이 대기 일수를 함께 넘기지 않도록 잔여일 행을 잠근다
+    row = db.execute(
+        select(LeaveBalance.balance, LeaveBalance.pending)
+        .where(LeaveBalance.user_id == user_id)
+        .with_for_update()
+    ).first()
+    if row is None or row.balance - row.pending < days:
+        raise ValueError("잔여 휴가일이 부족합니다.")
+
+    request = LeaveRequest(
+        user_id=user_id, start_date=start, end_date=end, days=days, reason=reason
+    )
+    db.add(request)
+    db.flush()
+    _add_pending(db, user_id, days)
+    return request
+
+
+def _get_request(db: Session, request_id: int) -> LeaveRequest:
+    request = db.get(LeaveRequest, request_id)
+    if not request:
+        raise LookupError("해당 휴가 신청이 존재하지 않습니다.")
+    return request
+
+
+def _transition(
+    db: Session,
+    request_id: int,
+    expected: LeaveStatusEnum,
+    status: LeaveStatusEnum,
+    decided_by: Optional[int] = None,
+) -> None:
+    # 상태가 expected일 때만 바꾼다 (동시 승인/취소 중 하나만 성공)
+    values = {"status": status}
+    if decided_by is not None:
+        values.update(decided_by=decided_by, decided_at=datetime.now())
+    result = db.execute(
+        update(LeaveRequest)
+        .where(LeaveRequest.id == request_id, LeaveRequest.status == expected)
+        .values(**values)
+    )
+    if result.rowcount != 1:
+        raise ValueError("이미 처리된 신청입니다.")
+
+
+def approve_request(db: Session, request_id: int, admin_id: int) -> LeaveRequest:
+    request = _get_request(db, request_id)
+    if _locked_balance(db, request.user_id) < request.days:
+        raise ValueError("잔여 휴가일이 부족합니다.")
+    _transition(
+        db, request_id, LeaveStatusEnum.pending, LeaveStatusEnum.approved, admin_id
+    )
+    _add_pending(db, request.user_id, -request.days)
+    _append_entry(
+        db,
+        request.user_id,
+        -request.days,
+        LeaveEntryKindEnum.use,
+        request_id=request_id,
+        created_by=admin_id,
+    )
+    db.refresh(request)
+    return request
+
+
+def reject_request(db: Session, request_id: int, admin_id: int) -> LeaveRequest:
+    request = _get_request(db, request_id)
+    _transition(
+        db, request_id, LeaveStatusEnum.pending, LeaveStatusEnum.rejected, admin_id
+    )
+    _add_pending(db, request.user_id, -request.days)
+    db.refresh(request)
+    return request
+
+
+def cancel_request(
+    db: Session, request_id: int, user_id: int, is_admin: bool
+) -> LeaveRequest:
+    """대기 중이면 취소만, 승인된 휴가는 시작 전까지 취소하고 사용일을 복원"""
+    request = _get_request(db, request_id)
+    if request.user_id != user_id and not is_admin:
+        raise LookupError("본인 신청만 취소할 수 있습니다.")
+
+    if request.status == LeaveStatusEnum.pending:
+        _transition(db, request_id, LeaveStatusEnum.pending, LeaveStatusEnum.cancelled)
+        _add_pending(db, request.user_id, -request.days)
+    elif request.status == LeaveStatusEnum.approved:
+        if request.start_date <= date.today() and not is_admin:
+            raise ValueError("이미 시작된 휴가는 관리자만 취소할 수 있습니다.")
+        _transition(
+            db, request_id, LeaveStatusEnum.approved, LeaveStatusEnum.cancelled
+        )
+        _append_entry(
+            db,
+            request.user_id,
+            request.days,
+            LeaveEntryKindEnum.restore,
+            request_id=request_id,
+            created_by=user_id,
+        )
+    else:
+        raise ValueError("이미 처리된 신청입니다.")
+    db.refresh(request)
+    return request
+
+
+def list_requests(
+    db: Session,
+    user_id: Optional[int],
+    status: Optional[LeaveStatusEnum],
+    cursor: Optional[int],
+    limit: int,
+) -> tuple[list[LeaveRequest], Optional[int]]:
+    stmt = select(LeaveRequest)
+    if user_id is not None:
+        stmt = stmt.where(LeaveRequest.user_id == user_id)
+    if status is not None:
+        stmt = stmt.where(LeaveRequest.status == status)
+    if cursor:
+        stmt = stmt.where(LeaveRequest.id < cursor)
+    items = (
+        db.execute(stmt.order_by(LeaveRequest.id.desc()).limit(limit + 1))
+        .scalars()
+        .all()
+    )
+    if len(items) > limit:
+        return items[:limit], items[limit - 1].id
+    return items, None
+
+
+def approved_leave_days(
+    db: Session, date_from: date, date_to: date
+) -> set[tuple[int, date]]:
+    # 근무표 생성용: 기간 내 승인된 휴가의 (유저, 날짜)
+    rows = db.execute(
+        select(LeaveRequest.user_id, LeaveRequest.start_date, LeaveRequest.end_date)
+        .where(
+            LeaveRequest.status == LeaveStatusEnum.approved,
+            LeaveRequest.start_date <= date_to,
+            LeaveRequest.end_date >= date_from,
+        )
+    ).all()
+    days: set[tuple[int, date]] = set()
+    for user_id, start, end in rows:
+        day = max(start, date_from)
+        while day <= min(end, date_to):
+            days.add((user_id, day))
+            day += timedelta(days=1)
+    return days
+
+
+# --------- 정합성 점검 ----------
+def check_balances(db: Session, fix: bool = False) -> dict:
+    """
+    원장과 대기 중 신청을 유저별로 한 번에 집계해 leave_balance와 비교한다.
+    fix=True면 어긋난 유저의 잔여일 행을 원장/신청 기준으로 다시 쓴다 (UPSERT executemany 1회).
+    """
+    is_use = LeaveLedger.kind.in_(_USE_KINDS)
+    expected = {
+        r.user_id: r
+        for r in db.execute(
+            select(
+                LeaveLedger.user_id,
+                func.sum(LeaveLedger.delta).label("balance"),
+                func.sum(case((is_use, 0), else_=LeaveLedger.delta)).label(
+                    "granted"
+                ),
+                func.sum(case((is_use, -LeaveLedger.delta), else_=0)).label("used"),
+                func.max(LeaveLedger.id).label("last_entry_id"),
+            ).group_by(LeaveLedger.user_id)
+        )
+    }
+    pending = dict(
+        db.execute(
+            select(LeaveRequest.user_id, func.sum(LeaveRequest.days))
+            .where(LeaveRequest.status == LeaveStatusEnum.pending)
+            .group_by(LeaveRequest.user_id)
+        ).all()
+    )
+    stored = {
+        r.user_id: r
+        for r in db.execute(
+            select(
+                LeaveBalance.user_id,
+                LeaveBalance.balance,
+                LeaveBalance.granted,
+                LeaveBalance.used,
+                LeaveBalance.pending,
+            )
+        )
+    }
+
+    drifted, rows = [], []
+    users = expected.keys() | stored.keys() | pending.keys()
+    for user_id in sorted(users):
+        exp, cur = expected.get(user_id), stored.get(user_id)
+        values = (
+            (int(exp.balance), int(exp.granted), int(exp.used)) if exp else (0, 0, 0)
+        ) + (int(pending.get(user_id, 0)),)
+        if cur is not None and tuple(cur[1:]) == values:
+            continue
+        drifted.append(
+            {
+                "user_id": user_id,
+                "stored": cur.balance if cur is not None else None,
+                "expected": values[0],
+            }
+        )
+        rows.append(
+            {
+                "user_id": user_id,
+                "balance": values[0],
+                "granted": values[1],
+                "used": values[2],
+                "pending": values[3],
+                "last_entry_id": exp.last_entry_id if exp else 0,
+                "updated_at": datetime.now(),
+            }
+        )
+
+    if fix and rows:
+        stmt = mysql_insert(LeaveBalance)
+        db.execute(
+            stmt.on_duplicate_key_update(
+                {
+                    col: stmt.inserted[col]
+                    for col in (
+                        "balance",
+                        "granted",
+                        "used",
+                        "pending",
+                        "last_entry_id",
+                        "updated_at",
+                    )
+                }
+            ),
+            rows,
+        )
+    return {
+        "checked": len(users),
+        "drifted": drifted,
+        "fixed": fix and bool(rows),
+    }
@@ -1,8 +1,16 @@
-from fastapi import APIRouter
+from datetime import date
+
+from fastapi import APIRouter, Depends
+
+from app.core.security import get_current_user
+from app.modules.auth.models import User
+from app.modules.mainpage import schemas, services
 
 router = APIRouter()
 
 
-@router.get("/")
-def get_mainpage():
-    return {"message": "Hello World"}
+@router.get(
+    "/", response_model=schemas.MainpageResponse
+)  # 홈 화면 (내 정보 + 오늘 출퇴근 + 이번 달 급여 + 공지) 한 번에
+async def get_mainpage(current_user: User = Depends(get_current_user)):
+    return await services.get_dashboard(current_user, date.today())
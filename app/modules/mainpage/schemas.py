@@ -0,0 +1,42 @@
+from datetime import date, time
+from typing import List, Optional
+
+from pydantic import BaseModel, field_serializer
+
+from app.modules.community.schemas import PostSummary
+
+
+class MainpageUser(BaseModel):
+    id: int
+    username: str
+    name: str
+    position: str
+    is_admin: bool
+
+
+class TodayAttendance(BaseModel):
+    work_date: date
+    status: str  # before / working / on_break / done
+    check_in: Optional[time] = None
+    break_start: Optional[time] = None
+    break_end: Optional[time] = None
+    check_out: Optional[time] = None
+
+    @field_serializer("check_in", "break_start", "break_end", "check_out")
+    def serialize_time(self, value: Optional[time], _info):
+        return value.strftime("%H:%M:%S") if value else None
+
+
+class MonthToDate(BaseModel):
+    year: int
+    month: int
+    total_hours: float = 0
+    total_salary: int = 0  # 예상 지급액 (세전)
+    net_salary: int = 0  # 예상 실지급액
+
+
+class MainpageResponse(BaseModel):
+    user: MainpageUser
+    today: TodayAttendance
+    month: MonthToDate
+    notices: List[PostSummary]
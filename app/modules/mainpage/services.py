@@ -0,0 +1,100 @@
+import asyncio
+from datetime import date
+from typing import Callable
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.modules.attendance.models import Attendance
+from app.modules.attendance.presence import status_of
+from app.modules.auth.models import User
+from app.modules.community.services import list_notices
+from app.modules.payroll.models import Payroll
+from app.utils.cache_utils import TTLCache
+from app.utils.permission_utils import RoleChecker
+
+NOTICE_LIMIT = 5
+
+# user_id -> 홈 화면 응답. 출퇴근 처리 시 즉시 무효화,
+# 급여 집계는 outbox projector가 몇 초 늦게 반영하므로 ttl을 짧게 둔다
+_dashboard_cache = TTLCache(maxsize=2048, ttl=10)
+
+
+def invalidate(user_id: int) -> None:
+    _dashboard_cache.pop(user_id)
+
+
+def _load_today(db: Session, user_id: int, today: date) -> dict:
+    record = db.execute(
+        select(
+            Attendance.check_in,
+            Attendance.break_start,
+            Attendance.break_end,
+            Attendance.check_out,
+        ).where(Attendance.user_id == user_id, Attendance.work_date == today)
+    ).first()
+    mapping = record._mapping if record is not None else None
+    result = {"work_date": today, "status": status_of(mapping)}
+    if mapping is not None:
+        result.update(mapping)
+    return result
+
+
+def _load_month(db: Session, user_id: int, today: date) -> dict:
+    # 실시간 갱신되는 급여 행을 그대로 읽는다 (재계산 없음)
+    row = db.execute(
+        select(Payroll.total_hours, Payroll.total_salary, Payroll.net_salary).where(
+            Payroll.user_id == user_id,
+            Payroll.year == today.year,
+            Payroll.month == today.month,
+        )
+    ).first()
+    result = {"year": today.year, "month": today.month}
+    if row is not None:
+        result.update(
+            total_hours=float(row.total_hours or 0),
+            total_salary=row.total_salary or 0,
+            net_salary=row.net_salary or 0,
+        )
+    return result
+
+
+def _in_session(load: Callable, *args):
+    # Session은 스레드 간 공유 불가 → 조각마다 별도 세션
+    db = SessionLocal()
+    try:
+        return load(db, *args)
+    finally:
+        db.close()
+
+
+async def get_dashboard(user: User, today: date) -> dict:
+    """
+    홈 화면 한 번에: 오늘 출퇴근 상태 / 이번 달 누적 근무·예상 급여 / 최근 공지.
+    서로 독립인 조회는 스레드풀에서 동시에 실행하고, 결과는 유저별로 짧게 캐시한다.
+    """
+    cached = _dashboard_cache.get(user.id)
+    if cached is not None and cached["today"]["work_date"] == today:
+        return cached
+
+    today_state, month, notices = await asyncio.gather(
+        run_in_threadpool(_in_session, _load_today, user.id, today),
+        run_in_threadpool(_in_session, _load_month, user.id, today),
+        run_in_threadpool(_in_session, list_notices, NOTICE_LIMIT),
+    )
+    payload = {
+        "user": {
+            "id": user.id,
+            "username": user.username,
+            "name": user.name,
+            "position": str(user.position.value),
+            "is_admin": RoleChecker.is_admin(user.position),
+        },
+        "today": today_state,
+        "month": month,
+        "notices": notices,
+    }
+    _dashboard_cache.set(user.id, payload)
+    return payload
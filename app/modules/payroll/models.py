@@ -1,4 +1,16 @@
-from sqlalchemy import DECIMAL, Column, ForeignKey, Integer
+from sqlalchemy import (
+    DECIMAL,
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -6,6 +18,10 @@ from app.core.database import Base
 
 class Payroll(Base):
     __tablename__ = "payroll"
+    __table_args__ = (
+        UniqueConstraint("user_id", "year", "month", name="uq_payroll_user_month"),
+        Index("idx_payroll_period", "year", "month"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -25,4 +41,58 @@ class Payroll(Base):
     total_deduction = Column(Integer, default=0)
     net_salary = Column(Integer, default=0)
 
+    # 증분 갱신용 원장 누적값 (NULL이면 다음 갱신 때 전체 재계산으로 시드)
+    work_minutes = Column(Integer, nullable=True)
+    break_minutes = Column(Integer, nullable=True)
+    wage_minutes = Column(BigInteger, nullable=True)  # Σ(적용 시급 × 근무분)
+    night_minutes = Column(Integer, nullable=True)
+    holiday_minutes = Column(Integer, nullable=True)
+    weekly_minutes = Column(Integer, nullable=True)  # 주휴시간(분)
+    # 이 원장에 반영된 마지막 출퇴근 이벤트 id (이 유저의 그 이하 이벤트는 모두 반영됨)
+    last_event_id = Column(BigInteger, nullable=True)
+
     user = relationship("User", back_populates="payrolls")
+
+
+class PayrollMonthClose(Base):  # 월 마감 기록 (마감 후 해당 월 급여는 변경 불가)
+    __tablename__ = "payroll_month_close"
+    __table_args__ = (
+        UniqueConstraint("year", "month", name="uq_payroll_month_close"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    headcount = Column(Integer, nullable=False, default=0)
+    content_hash = Column(String(64), nullable=False)  # 직원별 스냅샷 해시의 해시
+    closed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    closed_at = Column(DateTime, nullable=False)
+
+
+class PayrollSnapshot(Base):  # 마감 시점 직원별 급여 (불변)
+    __tablename__ = "payroll_snapshot"
+    __table_args__ = (
+        UniqueConstraint("user_id", "year", "month", name="uq_payroll_snapshot"),
+        Index("idx_payroll_snapshot_period", "year", "month"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    payload = Column(JSON, nullable=False)
+    content_hash = Column(String(64), nullable=False)  # sha256(정규화 JSON)
+
+
+class PayrollBulkRun(Base):  # 전 직원 일괄 재계산 실행 기록 (진행률을 모든 워커가 공유)
+    __tablename__ = "payroll_bulk_run"
+
+    id = Column(Integer, primary_key=True, index=True)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    status = Column(String(16), nullable=False)  # running / done / failed
+    total_users = Column(Integer, nullable=False, default=0)
+    processed_users = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
@@ -1,30 +1,151 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Optional
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_admin, get_current_user
 from app.modules.auth.models import User
-from app.modules.payroll import models, schemas
+from app.modules.payroll import schemas, services
 from app.utils.permission_utils import RoleChecker
+from app.utils.response_utils import cached_json_response
 
 router = APIRouter(tags=["Payroll"])
 
 
-@router.get("/", response_model=list[schemas.PayrollResponse])
+@router.get("/", response_model=schemas.PayrollPage)
 def get_payroll_list(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    year: Optional[int] = Query(None, ge=2000),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    user_id: Optional[int] = Query(None, ge=1),
+    cursor: Optional[int] = Query(None, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not RoleChecker.is_admin(current_user.position):
+        user_id = current_user.id  # 일반 직원은 본인 급여만
+
+    items, next_cursor = services.list_payrolls(
+        db, year, month, user_id, cursor, limit
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get(
+    "/summary", response_model=list[schemas.PayrollMonthSummary]
+)  # 월별 총 근무시간 / 지급액 / 공제액 / 실지급액
+def get_payroll_summary(
+    year: Optional[int] = Query(None, ge=2000),
+    db: Session = Depends(get_db),
+    _admin=Depends(get_current_admin),
+):
+    return services.summarize_payrolls(db, year)
+
+
+@router.get("/export")  # 월 급여대장 CSV 스트리밍 다운로드 (회계용)
+def export_payroll_register(
+    year: int = Query(..., ge=2000),
+    month: int = Query(..., ge=1, le=12),
+    _admin=Depends(get_current_admin),
+):
+    filename = f"payroll_{year}{month:02d}.csv"
+    return StreamingResponse(
+        services.iter_payroll_register_csv(year, month),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(
+    "/recalculate",
+    response_model=schemas.BulkRecalcProgress,
+    status_code=status.HTTP_202_ACCEPTED,
+)  # 전 직원 급여 일괄 재계산 (백그라운드)
+def start_bulk_recalculation(
+    background_tasks: BackgroundTasks,
+    year: Optional[int] = Query(None, ge=2000),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    db: Session = Depends(get_db),
+    _admin=Depends(get_current_admin),
+):
+    if services.is_bulk_running(db):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="이미 급여 일괄 재계산이 진행 중입니다.",
+        )
+    today = datetime.now().date()
+    background_tasks.add_task(
+        services.run_bulk_recalculation, year or today.year, month or today.month
+    )
+    return services.get_bulk_progress(db)
+
+
+@router.get(
+    "/recalculate/status", response_model=schemas.BulkRecalcProgress
+)  # 일괄 재계산 진행률 / 처리량(users/sec)
+def get_bulk_recalculation_status(
+    db: Session = Depends(get_db),
+    _admin=Depends(get_current_admin),
+):
+    return services.get_bulk_progress(db)
+
+
+@router.post(
+    "/close", response_model=schemas.PayrollMonthCloseResponse
+)  # 월 마감: 급여를 불변 스냅샷으로 고정
+def close_payroll_month(
+    year: int = Query(..., ge=2000),
+    month: int = Query(..., ge=1, le=12),
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
 ):
-    if RoleChecker.is_admin(current_user.position):
-        payrolls = db.query(models.Payroll).all()
-    else:
-        payrolls = (
-            db.query(models.Payroll)
-            .filter(models.Payroll.user_id == current_user.id)
-            .all()
+    today = datetime.now().date()
+    if (year, month) >= (today.year, today.month):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="지난 달까지만 마감할 수 있습니다.",
         )
+    try:
+        return services.close_month(db, year, month, current_admin.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
 
-    if not payrolls:
+@router.get("/history/{year}/{month}")  # 마감된 달 급여 조회 (스냅샷, 재계산 없음)
+def get_payroll_history(
+    year: int,
+    month: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    user_id = None
+    if not RoleChecker.is_admin(current_user.position):
+        user_id = current_user.id  # 일반 직원은 본인 급여만
+
+    snapshot = services.get_month_snapshot(db, year, month, user_id)
+    if snapshot is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="급여 데이터가 없습니다."
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="마감되지 않은 월입니다.",
         )
-    return payrolls
+
+    body, content_hash = snapshot
+    # 마감 데이터는 바뀌지 않는다
+    return cached_json_response(
+        body,
+        f'"{content_hash}"',
+        if_none_match,
+        cache_control="private, max-age=31536000, immutable",
+    )
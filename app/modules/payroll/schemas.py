@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
@@ -9,6 +12,7 @@ class PayrollBase(BaseModel):
 
 class PayrollResponse(PayrollBase):
     id: int
+    user_id: int
     total_hours: float
     total_salary: int
     total_deduction: int
@@ -16,3 +20,38 @@ class PayrollResponse(PayrollBase):
 
     class Config:
         orm_mode = True
+
+
+class PayrollPage(BaseModel):
+    items: List[PayrollResponse]
+    next_cursor: Optional[int] = None  # 다음 페이지 요청 시 cursor로 전달
+
+
+class PayrollMonthSummary(BaseModel):
+    year: int
+    month: int
+    headcount: int
+    total_hours: float
+    total_salary: int
+    total_deduction: int
+    net_salary: int
+
+
+class BulkRecalcProgress(BaseModel):
+    status: str
+    year: Optional[int] = None
+    month: Optional[int] = None
+    total_users: int = 0
+    processed_users: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    users_per_sec: float = 0.0
+    error: Optional[str] = None
+
+
+class PayrollMonthCloseResponse(BaseModel):
+    year: int
+    month: int
+    headcount: int
+    content_hash: str  # 직원별 스냅샷 해시를 이어 붙인 sha256
+    closed_at: datetime
@@ -1,85 +1,982 @@
-from datetime import datetime
+import csv
+import hashlib
+import io
+import json
+import logging
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
 
-from sqlalchemy import extract
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.database import (
+    SessionLocal,
+    advisory_lock,
+    engine,
+    is_lock_free,
+)
+from app.modules.admin import calendar
+from app.modules.admin.models import InsuranceCategoryEnum
+from app.modules.admin.services import get_insurance_rate_timeline
 from app.modules.attendance import models as attendance_models
+from app.modules.attendance.outbox import lock_checkpoint
+from app.modules.auth.models import User
 from app.modules.payroll import models as payroll_models
-from app.modules.wage.services import get_applicable_wage
+from app.modules.wage.services import get_applicable_wage, load_wage_timelines
+from app.utils.cache_utils import TTLCache
+from app.utils.date_utils import (
+    night_seconds,
+    seconds_by_date,
+    shift_interval,
+    week_end,
+    weekly_allowance_minutes,
+)
 
+logger = logging.getLogger(__name__)
 
-def update_realtime_payroll(user_id: int, db: Session):
-    today = datetime.now().date()
-    year, month = today.year, today.month
-
-    records = (
-        db.query(attendance_models.Attendance)
-        .filter(
-            attendance_models.Attendance.user_id == user_id,
-            extract("year", attendance_models.Attendance.work_date) == year,
-            extract("month", attendance_models.Attendance.work_date) == month,
+PAYROLL_CONSUMER = "payroll"  # 급여 원장 outbox 소비자 (payroll/worker.py)
+
+
+class AttendanceSnapshot(NamedTuple):
+    # 급여 증분 계산에 필요한 출퇴근 기록의 한 시점 값
+    work_date: date
+    total_work_minutes: int
+    total_break_minutes: int
+    check_in: Optional[time] = None
+    break_start: Optional[time] = None
+    break_end: Optional[time] = None
+    check_out: Optional[time] = None
+
+    @classmethod
+    def of(cls, record) -> "AttendanceSnapshot":
+        return cls(
+            work_date=record.work_date,
+            total_work_minutes=record.total_work_minutes or 0,
+            total_break_minutes=record.total_break_minutes or 0,
+            check_in=record.check_in,
+            break_start=record.break_start,
+            break_end=record.break_end,
+            check_out=record.check_out,
         )
-        .all()
+
+    @classmethod
+    def from_row(cls, row: dict) -> "AttendanceSnapshot":
+        return cls(
+            work_date=row["work_date"],
+            total_work_minutes=row["total_work_minutes"] or 0,
+            total_break_minutes=row["total_break_minutes"] or 0,
+            check_in=row.get("check_in"),
+            break_start=row.get("break_start"),
+            break_end=row.get("break_end"),
+            check_out=row.get("check_out"),
+        )
+
+
+class PayrollLedger(NamedTuple):
+    # 월 급여 원장 누적값 (분 단위, wage_minutes = Σ 적용 시급 × 근무분)
+    work_minutes: int = 0
+    break_minutes: int = 0
+    wage_minutes: int = 0
+    night_minutes: int = 0
+    holiday_minutes: int = 0
+    weekly_minutes: int = 0
+
+    def plus(self, other: "PayrollLedger") -> "PayrollLedger":
+        return PayrollLedger(*(a + b for a, b in zip(self, other)))
+
+    @classmethod
+    def of(cls, payroll: payroll_models.Payroll) -> Optional["PayrollLedger"]:
+        values = [getattr(payroll, key) for key in cls._fields]
+        if any(v is None for v in values):
+            return None  # 누적값 도입 이전 행
+        return cls(*values)
+
+
+def _month_bounds(year: int, month: int) -> tuple[date, date]:
+    # [해당 월 1일, 다음 달 1일) - (user_id, work_date) 인덱스를 그대로 탄다
+    start = date(year, month, 1)
+    end = date(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+
+def _holiday_dates(db: Session, start: date, end: date) -> set[date]:
+    # 휴일근로 판정용 법정 공휴일 [start, end] (연도별 달력 캐시에서)
+    return calendar.dates_with(db, start, end, calendar.PUBLIC_HOLIDAY)
+
+
+def _classify(snapshot: AttendanceSnapshot, holidays: set[date]) -> tuple[int, int]:
+    """
+    기록 1건의 (야간근로분, 휴일근로분). 휴게 구간은 제외한다.
+    분 단위 순회 없이 구간 교집합으로 계산하므로 기록당 O(1).
+    """
+    if not (snapshot.check_in and snapshot.check_out):
+        return 0, 0
+    start, end = shift_interval(
+        snapshot.work_date, snapshot.check_in, snapshot.check_out
     )
 
-    if not records:
-        return None
+    brk = None
+    if snapshot.break_start and snapshot.break_end:
+        b_start = datetime.combine(snapshot.work_date, snapshot.break_start)
+        if b_start < start:
+            b_start += timedelta(days=1)  # 자정 이후 시작한 휴식
+        b_end = datetime.combine(b_start.date(), snapshot.break_end)
+        if b_end < b_start:
+            b_end += timedelta(days=1)
+        b_start, b_end = max(b_start, start), min(b_end, end)
+        if b_start < b_end:
+            brk = (b_start, b_end)
 
-    total_work_minutes = sum(r.total_work_minutes for r in records)
-    total_break_minutes = sum(r.total_break_minutes for r in records)
-    total_hours = round(total_work_minutes / 60, 2)
-    break_hours = round(total_break_minutes / 60, 2)
+    night = night_seconds(start, end) - (night_seconds(*brk) if brk else 0)
 
-    wages = []
-    for record in records:
-        wage = get_applicable_wage(user_id, record.work_date, db)
-        wages.append((wage, record.total_work_minutes))
+    holiday = 0
+    break_by_date = seconds_by_date(*brk) if brk else {}
+    for day, seconds in seconds_by_date(start, end).items():
+        if day in holidays:
+            holiday += seconds - break_by_date.get(day, 0)
+
+    return night // 60, holiday // 60
 
-    if total_work_minutes == 0:
-        weighted_wage = 0
-    else:
-        weighted_wage = sum(w * m for w, m in wages) / total_work_minutes
 
+def compute_month_ledgers(
+    db: Session, year: int, month: int, user_ids: Optional[Iterable[int]] = None
+) -> dict[int, PayrollLedger]:
+    """
+    해당 월 급여 원장을 대상 유저 전체에 대해 한 번에 계산한다.
+    출퇴근 기록 / 공휴일 / 시급 이력을 각각 쿼리 1회로 읽고 기록당 O(1)로 분류.
+    주휴시간은 월~일 주 단위로 보고, 그 주의 일요일이 속한 달에 귀속한다.
+    """
+    start, end = _month_bounds(year, month)
+    A = attendance_models.Attendance
+    stmt = select(
+        A.user_id,
+        A.work_date,
+        A.check_in,
+        A.break_start,
+        A.break_end,
+        A.check_out,
+        A.total_work_minutes,
+        A.total_break_minutes,
+    ).where(A.work_date >= start - timedelta(days=6), A.work_date < end)
+    if user_ids is not None:
+        stmt = stmt.where(A.user_id.in_(list(user_ids)))
+    rows = db.execute(stmt).all()
+
+    holidays = _holiday_dates(db, start, end)
+    timelines = load_wage_timelines(db, {r.user_id for r in rows})
+
+    ledgers: dict[int, PayrollLedger] = {}
+    week_totals: dict[tuple[int, date], int] = {}
+    for r in rows:
+        snapshot = AttendanceSnapshot.of(r)
+        work = snapshot.total_work_minutes
+        sunday = week_end(r.work_date)
+        if start <= sunday < end:
+            key = (r.user_id, sunday)
+            week_totals[key] = week_totals.get(key, 0) + work
+        if r.work_date < start:
+            continue  # 전월 말 기록은 주휴 계산에만 사용
+
+        night, holiday = _classify(snapshot, holidays)
+        ledgers[r.user_id] = ledgers.get(r.user_id, PayrollLedger()).plus(
+            PayrollLedger(
+                work_minutes=work,
+                break_minutes=snapshot.total_break_minutes,
+                wage_minutes=timelines[r.user_id].wage_on(r.work_date) * work,
+                night_minutes=night,
+                holiday_minutes=holiday,
+            )
+        )
+
+    for (user_id, _), minutes in week_totals.items():
+        weekly = weekly_allowance_minutes(minutes)
+        if weekly:
+            ledgers[user_id] = ledgers.get(user_id, PayrollLedger()).plus(
+                PayrollLedger(weekly_minutes=weekly)
+            )
+    return ledgers
+
+
+def _latest_event_ids(db: Session, user_ids: Iterable[int]) -> dict[int, int]:
+    """
+    유저별 마지막 출퇴근 이벤트 id. 원장 계산과 같은 트랜잭션(스냅샷)에서 읽어
+    last_event_id로 남기면, projector가 이미 계산에 포함된 이벤트를 다시 더하지 않는다.
+    """
+    E = attendance_models.AttendanceEvent
+    stmt = (
+        select(E.user_id, func.max(E.id))
+        .where(E.user_id.in_(list(user_ids)))
+        .group_by(E.user_id)
+    )
+    return dict(db.execute(stmt).tuples().all())
+
+
+# 보험 카테고리 -> Payroll 공제 컬럼
+_DEDUCTION_COLUMNS = {
+    InsuranceCategoryEnum.health: "insurance_health",
+    InsuranceCategoryEnum.care: "insurance_care",
+    InsuranceCategoryEnum.employment: "insurance_employment",
+    InsuranceCategoryEnum.pension: "insurance_pension",
+}
+
+
+def _period_rates(db: Session, year: int, month: int) -> dict:
+    # 급여 기간(해당 월 1일) 기준 시행 중인 요율 - 타임라인 캐시에서 이진 탐색
+    return get_insurance_rate_timeline(db).rates_on(date(year, month, 1))
+
+
+def _deduction_values(total_salary: int, rates: dict) -> dict:
+    # 공제액 = 지급액 × 요율(%) / 100, 원 미만 절사
+    values = {
+        column: int(Decimal(total_salary) * rates.get(category, 0) / 100)
+        for category, column in _DEDUCTION_COLUMNS.items()
+    }
+    values["total_deduction"] = sum(values.values())
+    values["net_salary"] = total_salary - values["total_deduction"]
+    return values
+
+
+def _ledger_values(ledger: PayrollLedger, rates: dict) -> dict:
+    work_minutes = ledger.work_minutes
+    total_hours = round(work_minutes / 60, 2)
+    weighted_wage = ledger.wage_minutes / work_minutes if work_minutes else 0
     total_salary = int(total_hours * weighted_wage)
+    return {
+        **ledger._asdict(),
+        "hourly_wage": int(weighted_wage),
+        "total_hours": total_hours,
+        "break_hours": round(ledger.break_minutes / 60, 2),
+        "night_hours": round(ledger.night_minutes / 60, 2),
+        "holiday_hours": round(ledger.holiday_minutes / 60, 2),
+        "weekly_hours": round(ledger.weekly_minutes / 60, 2),
+        "total_salary": total_salary,
+        **_deduction_values(total_salary, rates),
+    }
+
+
+def _apply_ledger(
+    payroll: payroll_models.Payroll, ledger: PayrollLedger, rates: dict
+) -> None:
+    for key, value in _ledger_values(ledger, rates).items():
+        setattr(payroll, key, value)
+
 
-    payroll = (
+# --------- 월 마감 ----------
+_closed_months: set[tuple[int, int]] = set()  # 마감은 되돌리지 않으므로 영구 캐시
+_open_month_cache = TTLCache(maxsize=64, ttl=60)  # 조회용 미마감 캐시 (쓰기는 DB로 확인)
+_snapshot_cache = TTLCache(maxsize=2048, ttl=24 * 3600)  # 불변 스냅샷 직렬화 결과
+
+
+def is_month_closed(db: Session, year: int, month: int, cached: bool = True) -> bool:
+    key = (year, month)
+    if key in _closed_months:
+        return True
+    if cached and _open_month_cache.get(key):
+        return False
+    C = payroll_models.PayrollMonthClose
+    closed = (
+        db.execute(select(C.id).where(C.year == year, C.month == month)).first()
+        is not None
+    )
+    if closed:
+        _closed_months.add(key)
+    else:
+        _open_month_cache.set(key, True)
+    return closed
+
+
+def _lock_open_month(db: Session, year: int, month: int) -> bool:
+    """
+    급여를 쓰는 트랜잭션 안에서 미마감을 확인한다 (워커별 캐시가 아니라 DB 기준).
+    마감 행을 FOR SHARE로 읽으므로(행이 없으면 그 자리의 gap lock) 이 트랜잭션이
+    끝날 때까지 close_month의 마감 행 INSERT가 기다리고, 마감이 먼저 들어갔으면
+    그 커밋을 기다린 뒤 마감으로 본다. 마감됐으면 False.
+    """
+    key = (year, month)
+    if key in _closed_months:
+        return False
+    C = payroll_models.PayrollMonthClose
+    closed = (
+        db.execute(
+            select(C.id)
+            .where(C.year == year, C.month == month)
+            .with_for_update(read=True)
+        ).first()
+        is not None
+    )
+    if closed:
+        _closed_months.add(key)
+    return not closed
+
+
+def closed_months(db: Session) -> set[tuple[int, int]]:
+    C = payroll_models.PayrollMonthClose
+    months = {(r.year, r.month) for r in db.execute(select(C.year, C.month))}
+    _closed_months.update(months)
+    return months
+
+
+def _canonical_json(data) -> bytes:
+    return json.dumps(
+        data, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+
+def _snapshot_payload(payroll: payroll_models.Payroll) -> dict:
+    payload = {}
+    for col in payroll_models.Payroll.__table__.columns:
+        value = getattr(payroll, col.key)
+        payload[col.key] = float(value) if isinstance(value, Decimal) else value
+    payload.pop("id")
+    return payload
+
+
+def close_month(db: Session, year: int, month: int, closed_by: Optional[int]) -> dict:
+    """
+    해당 월 급여를 마지막으로 재계산한 뒤 직원별 불변 스냅샷(payload + sha256)으로 고정한다.
+    이후 이 달은 재계산/공제 재적용/출퇴근 반영 대상에서 제외된다.
+    마감 행 INSERT → 재계산 → 스냅샷을 한 트랜잭션으로 처리한다. 이 달에 쓰던 트랜잭션은
+    마감 행 INSERT가 기다려 주고, 이후의 쓰기는 _lock_open_month에서 이 커밋을 기다린다.
+    """
+    if is_month_closed(db, year, month, cached=False):
+        raise ValueError("이미 마감된 월입니다.")
+    db.commit()  # 재계산이 마감 행 INSERT 이후의 스냅샷을 읽도록 새 트랜잭션에서 시작
+    lock_checkpoint(db, PAYROLL_CONSUMER)  # 그동안 projector의 증분 반영을 멈춘다
+
+    closed_at = datetime.now()
+    close = payroll_models.PayrollMonthClose(
+        year=year,
+        month=month,
+        headcount=0,
+        content_hash="",
+        closed_by=closed_by,
+        closed_at=closed_at,
+    )
+    db.add(close)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("이미 마감된 월입니다.")
+
+    ledgers = compute_month_ledgers(db, year, month)
+    rates = _period_rates(db, year, month)
+    event_ids = _latest_event_ids(db, ledgers)
+    for chunk in _chunks(_ledger_rows(year, month, ledgers, rates, event_ids)):
+        _upsert_payrolls(db, chunk)
+
+    P = payroll_models.Payroll
+    payrolls = (
+        db.execute(
+            select(P)
+            .where(P.year == year, P.month == month)
+            .order_by(P.user_id)
+            .execution_options(populate_existing=True)
+        )
+        .scalars()
+        .all()
+    )
+    snapshots = []
+    for payroll in payrolls:
+        payload = _snapshot_payload(payroll)
+        snapshots.append(
+            {
+                "user_id": payroll.user_id,
+                "year": year,
+                "month": month,
+                "payload": payload,
+                "content_hash": hashlib.sha256(_canonical_json(payload)).hexdigest(),
+            }
+        )
+    if snapshots:
+        db.execute(insert(payroll_models.PayrollSnapshot), snapshots)
+
+    close.headcount = len(snapshots)
+    close.content_hash = hashlib.sha256(
+        "".join(r["content_hash"] for r in snapshots).encode("ascii")
+    ).hexdigest()
+    db.commit()
+
+    _closed_months.add((year, month))
+    return {
+        "year": year,
+        "month": month,
+        "headcount": close.headcount,
+        "content_hash": close.content_hash,
+        "closed_at": closed_at,
+    }
+
+
+def get_month_snapshot(
+    db: Session, year: int, month: int, user_id: Optional[int] = None
+) -> Optional[tuple[bytes, str]]:
+    """
+    마감된 달의 급여를 스냅샷에서 그대로 돌려준다 (재계산 없음).
+    (직렬화된 JSON, ETag용 해시). 불변이므로 직렬화 결과를 오래 캐시한다.
+    마감 전이면 None.
+    """
+    key = (year, month, user_id)
+    cached = _snapshot_cache.get(key)
+    if cached is not None:
+        return cached
+    if not is_month_closed(db, year, month):
+        return None
+
+    S = payroll_models.PayrollSnapshot
+    C = payroll_models.PayrollMonthClose
+    close = db.execute(select(C).where(C.year == year, C.month == month)).scalar_one()
+    stmt = select(S.payload, S.content_hash).where(S.year == year, S.month == month)
+    if user_id is not None:
+        stmt = stmt.where(S.user_id == user_id)
+    snapshots = db.execute(stmt.order_by(S.user_id)).all()
+
+    etag = close.content_hash
+    if user_id is not None and snapshots:
+        etag = snapshots[0].content_hash
+    body = _canonical_json(
+        {
+            "year": year,
+            "month": month,
+            "closed_at": close.closed_at.isoformat(),
+            "content_hash": etag,
+            "items": [s.payload for s in snapshots],
+        }
+    )
+    _snapshot_cache.set(key, (body, etag))
+    return body, etag
+
+
+def _get_payroll(user_id: int, year: int, month: int, db: Session):
+    return (
         db.query(payroll_models.Payroll)
         .filter_by(user_id=user_id, year=year, month=month)
         .first()
     )
 
+
+def update_realtime_payroll(
+    user_id: int,
+    db: Session,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    commit: bool = True,
+):
+    # 전체 재계산: 원장 시드 / projector 지연 시 재계산용. commit=False면 호출 측 트랜잭션에 포함
+    # (projector 안에서 체크포인트를 잡은 채 호출된다)
+    if year is None or month is None:
+        today = datetime.now().date()
+        year, month = today.year, today.month
+
+    if not _lock_open_month(db, year, month):
+        return None  # 마감된 달은 재계산하지 않는다
+
+    ledger = compute_month_ledgers(db, year, month, [user_id]).get(user_id)
+    if ledger is None:
+        return None
+
+    payroll = _get_payroll(user_id, year, month, db)
     if not payroll:
-        payroll = payroll_models.Payroll(
-            user_id=user_id,
-            year=year,
-            month=month,
-            total_hours=total_hours,
-            break_hours=break_hours,
-            total_salary=total_salary,
-            insurance_health=0,
-            insurance_employment=0,
-            insurance_pension=0,
-            insurance_care=0,
-            total_deduction=0,
-            net_salary=total_salary,  # 공제 전 실지급액
-        )
+        payroll = payroll_models.Payroll(user_id=user_id, year=year, month=month)
         db.add(payroll)
-    else:
-        payroll.total_hours = total_hours
-        payroll.break_hours = break_hours
-        payroll.total_salary = total_salary
-        payroll.net_salary = total_salary  # 단순 갱신 (추후 공제 계산 추가 가능)
+    _apply_ledger(payroll, ledger, _period_rates(db, year, month))
+    payroll.last_event_id = _latest_event_ids(db, [user_id]).get(user_id)
 
+    if not commit:
+        db.flush()
+        return payroll
     db.commit()
     db.refresh(payroll)
     return payroll
 
 
-def recalculate_all_users(db: Session):
-    from app.modules.auth.models import User
+def _reflected(payroll, event_id: Optional[int]) -> bool:
+    # 이 이벤트가 이미 원장에 들어가 있는지 (전체 재계산 또는 앞선 반영)
+    if payroll is None or event_id is None:
+        return False
+    return event_id <= (payroll.last_event_id or 0)
+
+
+def _week_work_minutes(user_id: int, sunday: date, db: Session) -> int:
+    # 주(월~일) 근무분 합계 - 최대 7행
+    A = attendance_models.Attendance
+    stmt = select(func.coalesce(func.sum(A.total_work_minutes), 0)).where(
+        A.user_id == user_id,
+        A.work_date >= sunday - timedelta(days=6),
+        A.work_date <= sunday,
+    )
+    return int(db.execute(stmt).scalar_one())
+
+
+def apply_attendance_change(
+    user_id: int,
+    before: Optional[AttendanceSnapshot],
+    after: AttendanceSnapshot,
+    db: Session,
+    verify: Optional[bool] = None,
+    commit: bool = True,
+    event_id: Optional[int] = None,
+):
+    """
+    출퇴근 기록 1건의 변화량(before → after)만 급여 원장에 반영한다.
+    월 누적 기록 수와 상관없이 기록 1건 + 그 주(최대 7행) 분량의 작업만 수행.
+    verify=True(기본값: settings.PAYROLL_VERIFY_INCREMENTAL)이면 전체 재계산 결과와
+    비교하고, 어긋나면 경고 로그를 남긴 뒤 전체 재계산 값으로 바로잡는다.
+    commit=False면 flush만 한다 (outbox 체크포인트와 같은 트랜잭션으로 커밋할 때).
+
+    event_id(outbox 이벤트 id)를 넘기면 원장의 last_event_id로 중복 반영을 막는다.
+    - event_id <= last_event_id: 전체 재계산에 이미 포함된 이벤트이므로 건너뛴다.
+    - 이 유저의 더 뒤 이벤트가 이미 커밋돼 있으면(projector 지연) 지금 읽는 주 합계가
+      이 이벤트 시점 값이 아니므로, 증분 대신 해당 월을 전체 재계산한다.
+    """
+    work_delta = after.total_work_minutes - (before.total_work_minutes if before else 0)
+    break_delta = after.total_break_minutes - (
+        before.total_break_minutes if before else 0
+    )
+    if not work_delta and not break_delta and not after.check_out:
+        return None  # 퇴근 전 휴식 시작/종료 등: 누적값 변화 없음
+
+    work_date = after.work_date
+    year, month = work_date.year, work_date.month
+    if not _lock_open_month(db, year, month):
+        return None
+    payroll = _get_payroll(user_id, year, month, db)
+    if _reflected(payroll, event_id):
+        return payroll
+    ledger = PayrollLedger.of(payroll) if payroll else None
+    sunday = week_end(work_date)
+    lagging = (
+        event_id is not None
+        and _latest_event_ids(db, [user_id]).get(user_id, 0) > event_id
+    )
+    if ledger is None or lagging:
+        # 원장이 없거나(월 첫 기록) 누적값 도입 이전 행 / projector 지연: 전체 계산
+        payroll = update_realtime_payroll(user_id, db, year, month, commit=False)
+        if (sunday.year, sunday.month) != (year, month) and _get_payroll(
+            user_id, sunday.year, sunday.month, db
+        ) is not None:
+            # 다음 달 일요일에 끝나는 주의 주휴는 이미 있는 그 달 원장에서 다시 계산
+            update_realtime_payroll(
+                user_id, db, sunday.year, sunday.month, commit=False
+            )
+        if commit:
+            db.commit()
+        return payroll
+
+    holidays = _holiday_dates(db, work_date, work_date + timedelta(days=1))
+    night_before, holiday_before = _classify(before, holidays) if before else (0, 0)
+    night_after, holiday_after = _classify(after, holidays)
+
+    # 주휴: 이 기록이 속한 주의 합계가 바뀐 만큼만 (기록은 이미 커밋된 상태)
+    weekly_delta = 0
+    if work_delta:
+        week_after = _week_work_minutes(user_id, sunday, db)
+        weekly_delta = weekly_allowance_minutes(week_after) - weekly_allowance_minutes(
+            week_after - work_delta
+        )
+    if weekly_delta and (sunday.year, sunday.month) != (year, month):
+        # 주가 다음 달 일요일에 끝나면 그 달 원장에 반영 (아직 없으면 시드 시 포함됨)
+        next_payroll = None
+        if _lock_open_month(db, sunday.year, sunday.month):
+            next_payroll = _get_payroll(user_id, sunday.year, sunday.month, db)
+        next_ledger = PayrollLedger.of(next_payroll) if next_payroll else None
+        if next_ledger is not None and not _reflected(next_payroll, event_id):
+            weekly = PayrollLedger(weekly_minutes=weekly_delta)
+            next_rates = _period_rates(db, sunday.year, sunday.month)
+            _apply_ledger(next_payroll, next_ledger.plus(weekly), next_rates)
+            if event_id is not None:
+                next_payroll.last_event_id = event_id
+        weekly_delta = 0
+
+    wage = get_applicable_wage(user_id, work_date, db)
+    rates = _period_rates(db, year, month)
+    _apply_ledger(
+        payroll,
+        ledger.plus(
+            PayrollLedger(
+                work_minutes=work_delta,
+                break_minutes=break_delta,
+                wage_minutes=wage * work_delta,
+                night_minutes=night_after - night_before,
+                holiday_minutes=holiday_after - holiday_before,
+                weekly_minutes=weekly_delta,
+            )
+        ),
+        rates,
+    )
+    if event_id is not None:
+        payroll.last_event_id = event_id
+
+    if verify is None:
+        verify = settings.PAYROLL_VERIFY_INCREMENTAL
+    if verify:
+        expected = compute_month_ledgers(db, year, month, [user_id]).get(user_id)
+        actual = PayrollLedger.of(payroll)
+        if expected is not None and expected != actual:
+            logger.warning(
+                "payroll ledger drift user=%s %s-%02d incremental=%s full=%s",
+                user_id, year, month, actual, expected,
+            )
+            _apply_ledger(payroll, expected, rates)
+
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return payroll
+
+
+def apply_month_deductions(db: Session, year: int, month: int) -> int:
+    """
+    해당 월 전체 급여에 공제를 UPDATE 1문으로 일괄 재적용한다 (요율 변경 시).
+    행마다 요율을 조회하지 않고, 기간 요율 1건을 SQL 식으로 넘긴다.
+    """
+    if not _lock_open_month(db, year, month):
+        return 0
+    P = payroll_models.Payroll
+    rates = _period_rates(db, year, month)
+    amounts = {
+        column: func.floor(P.total_salary * rates.get(category, 0) / 100)
+        for category, column in _DEDUCTION_COLUMNS.items()
+    }
+    total = sum(amounts.values())
+    result = db.execute(
+        update(P)
+        .where(P.year == year, P.month == month)
+        .values(**amounts, total_deduction=total, net_salary=P.total_salary - total)
+    )
+    return result.rowcount
+
+
+# --------- 조회 ----------
+def list_payrolls(
+    db: Session,
+    year: Optional[int],
+    month: Optional[int],
+    user_id: Optional[int],
+    cursor: Optional[int],
+    limit: int,
+) -> tuple[list[payroll_models.Payroll], Optional[int]]:
+    # id 내림차순 keyset 페이지네이션 (cursor = 이전 페이지 마지막 id)
+    P = payroll_models.Payroll
+    stmt = select(P)
+    if year is not None:
+        stmt = stmt.where(P.year == year)
+    if month is not None:
+        stmt = stmt.where(P.month == month)
+    if user_id is not None:
+        stmt = stmt.where(P.user_id == user_id)
+    if cursor is not None:
+        stmt = stmt.where(P.id < cursor)
+    items = db.execute(stmt.order_by(P.id.desc()).limit(limit + 1)).scalars().all()
+    if len(items) > limit:
+        return items[:limit], items[limit - 1].id
+    return items, None
+
+
+def summarize_payrolls(db: Session, year: Optional[int]) -> list[dict]:
+    # 월별 합계는 DB에서 집계 (관리자 대시보드용)
+    P = payroll_models.Payroll
+    stmt = select(
+        P.year,
+        P.month,
+        func.count(P.id).label("headcount"),
+        func.coalesce(func.sum(P.total_hours), 0).label("total_hours"),
+        func.coalesce(func.sum(P.total_salary), 0).label("total_salary"),
+        func.coalesce(func.sum(P.total_deduction), 0).label("total_deduction"),
+        func.coalesce(func.sum(P.net_salary), 0).label("net_salary"),
+    )
+    if year is not None:
+        stmt = stmt.where(P.year == year)
+    stmt = stmt.group_by(P.year, P.month).order_by(P.year.desc(), P.month.desc())
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+# 급여대장 CSV 컬럼 (헤더, 조회 컬럼)
+_REGISTER_COLUMNS = [
+    ("직원ID", payroll_models.Payroll.user_id),
+    ("이름", User.name),
+    ("은행명", User.bank_name),
+    ("계좌번호", User.account_number),
+    ("시급", payroll_models.Payroll.hourly_wage),
+    ("근무시간", payroll_models.Payroll.total_hours),
+    ("주휴시간", payroll_models.Payroll.weekly_hours),
+    ("야간시간", payroll_models.Payroll.night_hours),
+    ("휴일시간", payroll_models.Payroll.holiday_hours),
+    ("지급액", payroll_models.Payroll.total_salary),
+    ("건강보험", payroll_models.Payroll.insurance_health),
+    ("요양보험", payroll_models.Payroll.insurance_care),
+    ("고용보험", payroll_models.Payroll.insurance_employment),
+    ("국민연금", payroll_models.Payroll.insurance_pension),
+    ("공제합계", payroll_models.Payroll.total_deduction),
+    ("실지급액", payroll_models.Payroll.net_salary),
+]
+
+
+def iter_payroll_register_csv(year: int, month: int) -> Iterator[str]:
+    """
+    월 급여대장 CSV를 서버 측 커서로 읽으며 1000행 단위로 흘려보낸다.
+    인원 수와 무관하게 메모리 사용량이 일정하다. (엑셀 한글 호환용 BOM 포함)
+    """
+    P = payroll_models.Payroll
+    stmt = (
+        select(*[col for _, col in _REGISTER_COLUMNS])
+        .join(User, User.id == P.user_id)
+        .where(P.year == year, P.month == month)
+        .order_by(P.user_id)
+        .execution_options(yield_per=1000)
+    )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow([name for name, _ in _REGISTER_COLUMNS])
+    yield "\ufeff" + flush()
+
+    db = SessionLocal()
+    try:
+        for rows in db.execute(stmt).partitions():
+            writer.writerows(rows)
+            yield flush()
+    finally:
+        db.close()
 
-    users = db.query(User).all()
-    for user in users:
-        update_realtime_payroll(user.id, db)
 
-    return {"status": "success", "message": f"{len(users)} users payroll recalculated."}
+# --------- 전 직원 일괄 재계산 ----------
+BULK_LOCK = "payroll_bulk_recalc"  # 동시에 1건만 (모든 워커/컨테이너 공통)
+
+
+def _users_per_sec(processed: int, started_at: datetime, until: datetime) -> float:
+    elapsed = (until - started_at).total_seconds()
+    return round(processed / elapsed, 2) if elapsed > 0 else 0.0
+
+
+def get_bulk_progress(db: Session) -> dict:
+    """가장 최근 일괄 재계산의 진행률 (DB 행이므로 어느 워커에서 조회해도 같다)"""
+    R = payroll_models.PayrollBulkRun
+    run = db.execute(select(R).order_by(R.id.desc()).limit(1)).scalar_one_or_none()
+    if run is None:
+        return {"status": "idle"}
+    progress = {
+        "status": run.status,
+        "year": run.year,
+        "month": run.month,
+        "total_users": run.total_users,
+        "processed_users": run.processed_users,
+        "started_at": run.started_at,
+        "finished_at": run.finished_at,
+        "error": run.error,
+    }
+    if run.status == "running" and is_lock_free(db.connection(), BULK_LOCK):
+        # 실행하던 워커가 죽어 락이 풀렸는데 행은 running으로 남은 경우
+        progress.update(status="failed", error="중단되었습니다.")
+    progress["users_per_sec"] = _users_per_sec(
+        run.processed_users, run.started_at, run.finished_at or datetime.now()
+    )
+    return progress
+
+
+def is_bulk_running(db: Session) -> bool:
+    return get_bulk_progress(db)["status"] == "running"
+
+
+def _upsert_payrolls(db: Session, rows: list[dict]) -> None:
+    # uq_payroll_user_month 기준 INSERT ... ON DUPLICATE KEY UPDATE
+    stmt = mysql_insert(payroll_models.Payroll).values(rows)
+    stmt = stmt.on_duplicate_key_update(
+        {key: stmt.inserted[key] for key in rows[0] if key not in _PAYROLL_KEYS}
+    )
+    db.execute(stmt)
+
+
+_PAYROLL_KEYS = ("user_id", "year", "month")
+
+
+def _ledger_rows(
+    year: int,
+    month: int,
+    ledgers: dict[int, PayrollLedger],
+    rates: dict,
+    event_ids: dict[int, int],
+) -> list[dict]:
+    return [
+        {
+            "user_id": user_id,
+            "year": year,
+            "month": month,
+            **_ledger_values(ledger, rates),
+            "last_event_id": event_ids.get(user_id),
+        }
+        for user_id, ledger in ledgers.items()
+    ]
+
+
+def _chunks(items: list, size: int = 500) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _attendance_user_ids(db: Session, year: int, month: int) -> list[int]:
+    # 해당 월 원장 계산 대상 (주휴 계산용 전월 말 6일 포함)
+    start, end = _month_bounds(year, month)
+    A = attendance_models.Attendance
+    stmt = select(A.user_id).where(
+        A.work_date >= start - timedelta(days=6), A.work_date < end
+    )
+    return list(db.execute(stmt.distinct()).scalars())
+
+
+def recalculate_month_set(
+    db: Session,
+    year: int,
+    month: int,
+    user_ids: Optional[Iterable[int]] = None,
+    chunk_size: int = 500,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    해당 월 급여를 set 단위로 재계산한다 (user_ids가 없으면 전 직원).
+    chunk_size명 단위로 원장 계산(쿼리 3회) + upsert + 커밋. 보험 요율은 캐시된 타임라인.
+    청크마다 급여 outbox 체크포인트와 마감 행을 먼저 잠근 뒤 계산하므로
+    - projector가 같은 원장에 증분을 더하는 것과 엇갈리지 않고, 계산 시점까지의
+      이벤트 id를 last_event_id로 남겨 projector가 그 이벤트를 다시 더하지 않는다.
+    - 도중에 마감되면 멈춘다.
+    처리한 인원 수를 돌려준다.
+    """
+    if is_month_closed(db, year, month, cached=False):
+        return 0
+    if user_ids is None:
+        user_ids = _attendance_user_ids(db, year, month)
+    user_ids = sorted(set(user_ids))
+    rates = _period_rates(db, year, month)
+    db.commit()  # 청크마다 락을 잡은 뒤의 새 스냅샷에서 계산한다
+    if on_progress:
+        on_progress(0, len(user_ids))
+
+    processed = done = 0
+    for chunk in _chunks(user_ids, chunk_size):
+        lock_checkpoint(db, PAYROLL_CONSUMER)
+        if not _lock_open_month(db, year, month):
+            db.rollback()
+            break
+        ledgers = compute_month_ledgers(db, year, month, chunk)
+        if ledgers:
+            event_ids = _latest_event_ids(db, ledgers)
+            _upsert_payrolls(
+                db, _ledger_rows(year, month, ledgers, rates, event_ids)
+            )
+        db.commit()
+        processed += len(ledgers)
+        done += len(chunk)
+        if on_progress and done < len(user_ids):
+            on_progress(done, len(user_ids))
+    return processed
+
+
+def recalculate_open_months(
+    db: Session,
+    start: date,
+    end: Optional[date] = None,
+    user_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    [start, end]가 걸친 달 중 이번 달까지를 재계산한다 (소급 시급 / 공휴일 변경 등).
+    증분 원장은 출퇴근 이벤트만 반영하므로 기준 데이터가 바뀌면 이렇게 다시 맞춘다.
+    마감된 달은 recalculate_month_set이 건너뛴다. 재계산한 원장 수를 돌려준다.
+    """
+    today = datetime.now().date()
+    end = min(end or today, today)
+    if user_ids is not None:
+        user_ids = list(user_ids)
+    written = 0
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        written += recalculate_month_set(db, year, month, user_ids)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return written
+
+
+def run_open_month_recalculation(
+    start: date, end: Optional[date] = None, user_ids: Optional[list[int]] = None
+) -> None:
+    # BackgroundTasks용 (전 직원 재계산): 요청 세션과 분리된 전용 세션 사용
+    db = SessionLocal()
+    try:
+        recalculate_open_months(db, start, end, user_ids)
+    except Exception:
+        logger.exception("open month payroll recalculation failed from %s", start)
+    finally:
+        db.close()
+
+
+def recalculate_month_bulk(
+    db: Session, year: int, month: int, chunk_size: int = 500
+) -> dict:
+    """
+    전 직원 일괄 재계산 + 진행률 기록. GET_LOCK으로 동시에 1건만 실행한다.
+    락과 진행률 기록은 전용 연결 하나로 처리하므로 재계산 트랜잭션과 무관하게 바로 보인다.
+    """
+    R = payroll_models.PayrollBulkRun.__table__
+    with engine.connect() as conn, advisory_lock(conn, BULK_LOCK) as acquired:
+        if not acquired:
+            raise RuntimeError("이미 급여 일괄 재계산이 진행 중입니다.")
+        run_id = conn.execute(
+            insert(R).values(
+                year=year, month=month, status="running", started_at=datetime.now()
+            )
+        ).inserted_primary_key[0]
+        conn.commit()
+
+        def record(**values) -> None:
+            conn.execute(update(R).where(R.c.id == run_id).values(**values))
+            conn.commit()
+
+        try:
+            processed = recalculate_month_set(
+                db,
+                year,
+                month,
+                chunk_size=chunk_size,
+                on_progress=lambda done, total: record(
+                    processed_users=done, total_users=total
+                ),
+            )
+        except Exception as e:
+            db.rollback()
+            record(status="failed", finished_at=datetime.now(), error=str(e))
+            raise
+        record(
+            status="done",
+            total_users=processed,
+            processed_users=processed,
+            finished_at=datetime.now(),
+        )
+    return get_bulk_progress(db)
+
+
+def run_bulk_recalculation(year: int, month: int) -> None:
+    # BackgroundTasks용: 요청 세션과 분리된 전용 세션 사용
+    db = SessionLocal()
+    try:
+        recalculate_month_bulk(db, year, month)
+    except Exception:
+        logger.exception("bulk payroll recalculation failed %s-%02d", year, month)
+    finally:
+        db.close()
+
+
+def recalculate_all_users(db: Session):
+    today = datetime.now().date()
+    progress = recalculate_month_bulk(db, today.year, today.month)
+    return {
+        "status": "success",
+        "message": f"{progress['processed_users']} users payroll recalculated.",
+    }
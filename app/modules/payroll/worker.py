@@ -0,0 +1,31 @@
+from sqlalchemy.orm import Session
+
+from app.modules.attendance.models import AttendanceEvent
+from app.modules.attendance.outbox import decode_row, register_consumer
+from app.modules.payroll.services import (
+    PAYROLL_CONSUMER,
+    AttendanceSnapshot,
+    apply_attendance_change,
+)
+
+
+def project_payroll(db: Session, events: list[AttendanceEvent]) -> None:
+    """
+    outbox 이벤트 배치를 급여 원장에 반영한다 (출퇴근 요청 경로 밖).
+    이벤트마다 id를 넘겨 원장의 last_event_id로 중복 반영을 막는다
+    (전체 재계산에 이미 포함된 이벤트는 건너뜀). 퇴근 전 이벤트는 바로 끝나므로
+    실제 계산은 근무 1건당 한 번 정도다. 커밋은 projector가 체크포인트와 함께 한다.
+    """
+    for event in events:
+        before = decode_row(event.before)
+        apply_attendance_change(
+            event.user_id,
+            AttendanceSnapshot.from_row(before) if before else None,
+            AttendanceSnapshot.from_row(decode_row(event.after)),
+            db,
+            commit=False,
+            event_id=event.id,
+        )
+
+
+register_consumer(PAYROLL_CONSUMER, project_payroll)
@@ -0,0 +1,31 @@
+from sqlalchemy import (
+    Column,
+    Date,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    Time,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+from app.modules.auth.models import PositionEnum
+
+
+class Schedule(Base):  # 주간 근무표의 근무 1건
+    __tablename__ = "schedule"
+    __table_args__ = (
+        UniqueConstraint("user_id", "work_date", name="uq_schedule_user_date"),
+        Index("idx_schedule_date", "work_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    work_date = Column(Date, nullable=False)
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    position = Column(Enum(PositionEnum), nullable=False)  # 이 근무에서 맡는 직급 자리
+
+    user = relationship("User", back_populates="schedules")
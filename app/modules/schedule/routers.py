@@ -1,8 +1,51 @@
-from fastapi import APIRouter
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_current_admin, get_current_user
+from app.modules.auth.models import User
+from app.modules.schedule import schemas, services
 
 router = APIRouter()
 
 
-@router.get("/")
-def get_schedule():
-    return {"message": "Hello World"}
+@router.get("/", response_model=list[schemas.ScheduleResponse])  # 주간 근무표
+def get_schedule(
+    week_start: date = Query(...),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    return services.list_schedules(db, week_start, week_start + timedelta(days=6))
+
+
+@router.get("/me", response_model=list[schemas.ScheduleResponse])  # 내 근무 일정
+def get_my_schedule(
+    date_from: date = Query(..., alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    date_to = date_to or date_from + timedelta(days=6)
+    return services.list_schedules(db, date_from, date_to, current_user.id)
+
+
+@router.post(
+    "/generate",
+    response_model=schemas.RosterResult,
+    status_code=status.HTTP_201_CREATED,
+)  # 주간 근무표 자동 생성 (불가 요일 / 직급 구성 / 주간 시간 상한 반영)
+def generate_roster(
+    payload: schemas.RosterRequest,
+    db: Session = Depends(get_db),
+    _admin=Depends(get_current_admin),
+):
+    try:
+        result = services.generate_roster(db, payload)
+        db.commit()
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
@@ -0,0 +1,48 @@
+from datetime import date, time
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.modules.auth.models import PositionEnum
+
+
+class ShiftSlot(BaseModel):  # 요일별 필요 인원
+    weekday: int = Field(ge=0, le=6)  # 0=월 ... 6=일
+    start_time: time
+    end_time: time
+    position: PositionEnum
+    headcount: int = Field(ge=1)
+
+
+class RosterRequest(BaseModel):
+    week_start: date  # 월요일
+    slots: List[ShiftSlot]
+    max_weekly_hours: int = Field(40, ge=1, le=68)
+    replace: bool = False  # 이미 있는 그 주 근무표를 지우고 다시 생성
+
+
+class ScheduleResponse(BaseModel):
+    id: Optional[int] = None
+    user_id: int
+    work_date: date
+    start_time: time
+    end_time: time
+    position: PositionEnum
+
+    class Config:
+        from_attributes = True
+
+
+class UnfilledSlot(BaseModel):
+    work_date: date
+    start_time: time
+    end_time: time
+    position: PositionEnum
+    missing: int
+
+
+class RosterResult(BaseModel):
+    week_start: date
+    assigned: int
+    unfilled: List[UnfilledSlot]
+    items: List[ScheduleResponse]
@@ -0,0 +1,204 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.modules.admin import calendar
+from app.modules.auth.models import PositionEnum, User
+from app.modules.dayoff.services import approved_leave_days
+from app.modules.schedule import schemas
+from app.modules.schedule.models import Schedule
+from app.utils.date_utils import shift_interval
+
+_WEEKDAY_NAMES = {
+    **{name: i for i, name in enumerate("월화수목금토일")},
+    **{
+        name: i
+        for i, name in enumerate(("mon", "tue", "wed", "thu", "fri", "sat", "sun"))
+    },
+}
+
+
+def parse_unavailable_days(value) -> set[int]:
+    # users.unavailable_days: [0, 6] / ["토", "일"] / ["sat"] 등 → 요일 번호 집합
+    days: set[int] = set()
+    for item in value or []:
+        if isinstance(item, int) and 0 <= item <= 6:
+            days.add(item)
+        elif isinstance(item, str):
+            key = item.strip().lower()
+            if key.isdigit() and 0 <= int(key) <= 6:
+                days.add(int(key))
+            elif key[:3] in _WEEKDAY_NAMES:  # "sat", "saturday"
+                days.add(_WEEKDAY_NAMES[key[:3]])
+            elif key[:1] in _WEEKDAY_NAMES:  # "토", "토요일"
+                days.add(_WEEKDAY_NAMES[key[:1]])
+    return days
+
+
+class AvailabilityIndex:
+    """
+    (직급, 요일) → 근무 가능한 직원 id 목록. 직원 조회 1회로 만들고
+    배정 중에는 DB를 다시 읽지 않는다. 승인된 휴가일도 제외.
+    """
+
+    def __init__(
+        self,
+        users: Iterable[User],
+        week_start: date,
+        on_leave: set[tuple[int, date]] = frozenset(),
+    ):
+        week_end = week_start + timedelta(days=6)
+        self._by_slot: dict[tuple[PositionEnum, int], list[int]] = defaultdict(list)
+        for user in users:
+            if user.hire_date and user.hire_date > week_end:
+                continue
+            blocked = parse_unavailable_days(user.unavailable_days)
+            for weekday in range(7):
+                day = week_start + timedelta(days=weekday)
+                if weekday in blocked or (user.id, day) in on_leave:
+                    continue
+                if user.hire_date and user.hire_date > day:
+                    continue
+                if user.retire_date and user.retire_date < day:
+                    continue
+                self._by_slot[(user.position, weekday)].append(user.id)
+
+    def candidates(self, position: PositionEnum, weekday: int) -> list[int]:
+        return self._by_slot.get((position, weekday), [])
+
+
+def _load_staff(db: Session) -> list[User]:
+    return (
+        db.execute(
+            select(User).where(
+                User.is_active.is_(True),
+                User.position.in_(
+                    [PositionEnum.leader, PositionEnum.crew, PositionEnum.cleaner]
+                ),
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+
+def _slot_minutes(day: date, slot: schemas.ShiftSlot) -> int:
+    start, end = shift_interval(day, slot.start_time, slot.end_time)
+    return int((end - start).total_seconds() // 60)
+
+
+def build_roster(
+    index: AvailabilityIndex,
+    week_start: date,
+    slots: list[schemas.ShiftSlot],
+    max_weekly_minutes: int,
+    closed_days: set[date] = frozenset(),
+) -> tuple[list[dict], list[dict]]:
+    """
+    (배정 행, 미충원 자리). 후보가 적은 자리부터 채우고, 같은 자리 후보 중에서는
+    그 주 배정 시간이 가장 적은 직원을 고른다 (같으면 id 순).
+    한 사람은 하루 1근무, 주 max_weekly_minutes 이하.
+    """
+    weekly_minutes: dict[int, int] = defaultdict(int)
+    busy_days: set[tuple[int, date]] = set()
+    rows: list[dict] = []
+    unfilled: list[dict] = []
+
+    demand = []
+    for slot in slots:
+        day = week_start + timedelta(days=slot.weekday)
+        if day in closed_days:
+            continue  # 매장 휴무일
+        candidates = index.candidates(slot.position, slot.weekday)
+        demand.append((len(candidates) - slot.headcount, day, slot, candidates))
+    demand.sort(key=lambda d: (d[0], d[1], d[2].start_time))
+
+    for _, day, slot, candidates in demand:
+        minutes = _slot_minutes(day, slot)
+        eligible = [
+            user_id
+            for user_id in candidates
+            if (user_id, day) not in busy_days
+            and weekly_minutes[user_id] + minutes <= max_weekly_minutes
+        ]
+        eligible.sort(key=lambda user_id: (weekly_minutes[user_id], user_id))
+        chosen = eligible[: slot.headcount]
+        for user_id in chosen:
+            weekly_minutes[user_id] += minutes
+            busy_days.add((user_id, day))
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "work_date": day,
+                    "start_time": slot.start_time,
+                    "end_time": slot.end_time,
+                    "position": slot.position,
+                }
+            )
+        if len(chosen) < slot.headcount:
+            unfilled.append(
+                {
+                    "work_date": day,
+                    "start_time": slot.start_time,
+                    "end_time": slot.end_time,
+                    "position": slot.position,
+                    "missing": slot.headcount - len(chosen),
+                }
+            )
+
+    rows.sort(key=lambda r: (r["work_date"], r["start_time"], r["user_id"]))
+    return rows, unfilled
+
+
+def generate_roster(db: Session, data: schemas.RosterRequest) -> dict:
+    if data.week_start.weekday() != 0:
+        raise ValueError("week_start는 월요일이어야 합니다.")
+    week_end = data.week_start + timedelta(days=6)
+    week = (Schedule.work_date >= data.week_start, Schedule.work_date <= week_end)
+
+    existing = db.execute(select(Schedule.id).where(*week).limit(1)).first()
+    if existing and not data.replace:
+        raise ValueError("이미 생성된 근무표가 있습니다. (replace=true로 다시 생성)")
+
+    on_leave = approved_leave_days(db, data.week_start, week_end)
+    index = AvailabilityIndex(_load_staff(db), data.week_start, on_leave)
+    closed_days = calendar.dates_with(
+        db, data.week_start, week_end, calendar.STORE_HOLIDAY
+    )
+    rows, unfilled = build_roster(
+        index, data.week_start, data.slots, data.max_weekly_hours * 60, closed_days
+    )
+
+    if existing:
+        db.execute(delete(Schedule).where(*week))
+    if rows:
+        db.execute(insert(Schedule), rows)  # executemany 1회
+    return {
+        "week_start": data.week_start,
+        "assigned": len(rows),
+        "unfilled": unfilled,
+        "items": rows,
+    }
+
+
+def list_schedules(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    user_id: Optional[int] = None,
+) -> list[Schedule]:
+    stmt = select(Schedule).where(
+        Schedule.work_date >= date_from, Schedule.work_date <= date_to
+    )
+    if user_id is not None:
+        stmt = stmt.where(Schedule.user_id == user_id)
+    return (
+        db.execute(
+            stmt.order_by(Schedule.work_date, Schedule.start_time, Schedule.user_id)
+        )
+        .scalars()
+        .all()
+    )
@@ -0,0 +1,41 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+
+from app.core.database import Base
+
+
+class ShiftSwapStatusEnum(str, enum.Enum):
+    open = "모집중"
+    accepted = "확정"
+    cancelled = "취소"
+
+
+class ShiftSwap(Base):  # 근무 교대 요청 (내 근무를 다른 직원에게 넘김)
+    __tablename__ = "shift_swap"
+    __table_args__ = (Index("idx_shift_swap_status", "status", "id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    # 근무표 재생성/직원 삭제 시 요청도 함께 정리
+    schedule_id = Column(
+        Integer, ForeignKey("schedule.id", ondelete="CASCADE"), nullable=False
+    )
+    requester_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    taker_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+    status = Column(
+        Enum(ShiftSwapStatusEnum), nullable=False, default=ShiftSwapStatusEnum.open
+    )
+    note = Column(String(255), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    accepted_at = Column(DateTime, nullable=True)
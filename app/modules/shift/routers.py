@@ -1,8 +1,105 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.modules.auth.models import User
+from app.modules.shift import schemas, services
 
 router = APIRouter()
 
 
-@router.get("/")
-def get_schedule():
-    return {"message": "Hello World"}
+def _swap_error(db: Session, e: Exception) -> HTTPException:
+    db.rollback()
+    if isinstance(e, services.SwapConflict):
+        return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if isinstance(e, LookupError):
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def _with_candidates(db: Session, swap, schedule) -> dict:
+    candidates = services.find_candidates(db, schedule)
+    return {
+        **services.swap_response(swap, schedule),
+        "candidates": [
+            {"user_id": u.id, "name": u.name, "position": u.position}
+            for u in candidates
+        ],
+    }
+
+
+@router.post(
+    "/swaps",
+    response_model=schemas.ShiftSwapWithCandidates,
+    status_code=status.HTTP_201_CREATED,
+)  # 내 근무 교대 요청 + 맡을 수 있는 동료 목록
+def create_swap(
+    payload: schemas.ShiftSwapCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        swap, schedule = services.create_swap(
+            db, current_user.id, payload.schedule_id, payload.note
+        )
+        db.commit()
+    except (LookupError, ValueError) as e:
+        raise _swap_error(db, e)
+    return _with_candidates(db, swap, schedule)
+
+
+@router.get("/swaps", response_model=list[schemas.ShiftSwapResponse])  # 모집 중 요청
+def list_open_swaps(
+    cursor: Optional[int] = Query(None, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    rows, _ = services.list_open_swaps(db, cursor, limit)
+    return [services.swap_response(swap, schedule) for swap, schedule in rows]
+
+
+@router.get(
+    "/swaps/{swapId}/candidates", response_model=schemas.ShiftSwapWithCandidates
+)
+def get_swap_candidates(
+    swapId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    try:
+        swap, schedule = services.get_swap(db, swapId)
+    except LookupError as e:
+        raise _swap_error(db, e)
+    return _with_candidates(db, swap, schedule)
+
+
+@router.post("/swaps/{swapId}/accept", response_model=schemas.ShiftSwapResponse)
+def accept_swap(
+    swapId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        swap, schedule = services.accept_swap(db, swapId, current_user)
+        db.commit()
+    except (LookupError, ValueError) as e:
+        raise _swap_error(db, e)
+    return services.swap_response(swap, schedule)
+
+
+@router.post("/swaps/{swapId}/cancel", response_model=schemas.ShiftSwapResponse)
+def cancel_swap(
+    swapId: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        swap, schedule = services.cancel_swap(db, swapId, current_user.id)
+        db.commit()
+    except (LookupError, ValueError) as e:
+        raise _swap_error(db, e)
+    return services.swap_response(swap, schedule)
@@ -0,0 +1,37 @@
+from datetime import date, datetime, time
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.modules.auth.models import PositionEnum
+from app.modules.shift.models import ShiftSwapStatusEnum
+
+
+class ShiftSwapCreate(BaseModel):
+    schedule_id: int
+    note: Optional[str] = None
+
+
+class ShiftSwapResponse(BaseModel):
+    id: int
+    schedule_id: int
+    requester_id: int
+    taker_id: Optional[int] = None
+    status: ShiftSwapStatusEnum
+    note: Optional[str] = None
+    work_date: date
+    start_time: time
+    end_time: time
+    position: PositionEnum
+    created_at: datetime
+    accepted_at: Optional[datetime] = None
+
+
+class SwapCandidate(BaseModel):
+    user_id: int
+    name: str
+    position: PositionEnum
+
+
+class ShiftSwapWithCandidates(ShiftSwapResponse):
+    candidates: List[SwapCandidate]
@@ -0,0 +1,253 @@
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.modules.auth.models import User
+from app.modules.schedule.models import Schedule
+from app.modules.schedule.services import parse_unavailable_days
+from app.modules.shift.models import ShiftSwap, ShiftSwapStatusEnum
+from app.utils.date_utils import shift_interval
+
+
+class SwapConflict(ValueError):
+    """동시에 다른 직원이 먼저 수락했거나 근무가 바뀐 경우"""
+
+
+class ShiftIntervalIndex:
+    """
+    직원별 근무 구간(시작 시각 정렬)과 끝 시각 누적 최대값, 근무일 집합.
+    overlaps()는 bisect 1회로 판정한다 (후보마다 쿼리하지 않음).
+    """
+
+    def __init__(self, intervals: Iterable[tuple[int, date, datetime, datetime]]):
+        grouped: dict[int, list[tuple[datetime, datetime]]] = {}
+        self._days: dict[int, set[date]] = {}
+        for user_id, work_date, start, end in intervals:
+            grouped.setdefault(user_id, []).append((start, end))
+            self._days.setdefault(user_id, set()).add(work_date)
+        self._starts: dict[int, list[datetime]] = {}
+        self._max_ends: dict[int, list[datetime]] = {}
+        for user_id, items in grouped.items():
+            items.sort()
+            self._starts[user_id] = [start for start, _ in items]
+            self._max_ends[user_id] = list(accumulate((end for _, end in items), max))
+
+    @classmethod
+    def of(cls, schedules: Iterable[Schedule]) -> "ShiftIntervalIndex":
+        return cls(
+            (
+                s.user_id,
+                s.work_date,
+                *shift_interval(s.work_date, s.start_time, s.end_time),
+            )
+            for s in schedules
+        )
+
+    def works_on(self, user_id: int, day: date) -> bool:
+        # 직원당 하루 한 근무 (uq_schedule_user_date): 시간이 안 겹쳐도 맡을 수 없다
+        return day in self._days.get(user_id, ())
+
+    def overlaps(self, user_id: int, start: datetime, end: datetime) -> bool:
+        starts = self._starts.get(user_id)
+        if not starts:
+            return False
+        i = bisect_left(starts, end)  # start < end 인 구간은 [0, i)
+        return i > 0 and self._max_ends[user_id][i - 1] > start
+
+
+def _load_interval_index(
+    db: Session, work_date: date, user_id: Optional[int] = None, lock: bool = False
+) -> ShiftIntervalIndex:
+    # 자정을 넘는 근무까지 보려면 전날~다음날
+    stmt = select(Schedule).where(
+        Schedule.work_date >= work_date - timedelta(days=1),
+        Schedule.work_date <= work_date + timedelta(days=1),
+    )
+    if user_id is not None:
+        stmt = stmt.where(Schedule.user_id == user_id)
+    if lock:
+        stmt = stmt.with_for_update()
+    return ShiftIntervalIndex.of(db.execute(stmt).scalars().all())
+
+
+def _can_work(user: User, schedule: Schedule) -> bool:
+    day = schedule.work_date
+    return (
+        user.is_active
+        and user.position == schedule.position
+        and day.weekday() not in parse_unavailable_days(user.unavailable_days)
+        and not (user.hire_date and user.hire_date > day)
+        and not (user.retire_date and user.retire_date < day)
+    )
+
+
+def find_candidates(db: Session, schedule: Schedule) -> list[User]:
+    """같은 직급 자리이고, 불가 요일이 아니며, 그 날 근무가 없고 전후 근무와도 겹치지 않는 동료"""
+    start, end = shift_interval(
+        schedule.work_date, schedule.start_time, schedule.end_time
+    )
+    index = _load_interval_index(db, schedule.work_date)
+    users = (
+        db.execute(
+            select(User)
+            .where(
+                User.is_active.is_(True),
+                User.position == schedule.position,
+                User.id != schedule.user_id,
+            )
+            .order_by(User.id)
+        )
+        .scalars()
+        .all()
+    )
+    return [
+        u
+        for u in users
+        if _can_work(u, schedule)
+        and not index.works_on(u.id, schedule.work_date)
+        and not index.overlaps(u.id, start, end)
+    ]
+
+
+def swap_response(swap: ShiftSwap, schedule: Schedule) -> dict:
+    return {
+        "id": swap.id,
+        "schedule_id": swap.schedule_id,
+        "requester_id": swap.requester_id,
+        "taker_id": swap.taker_id,
+        "status": swap.status,
+        "note": swap.note,
+        "work_date": schedule.work_date,
+        "start_time": schedule.start_time,
+        "end_time": schedule.end_time,
+        "position": schedule.position,
+        "created_at": swap.created_at,
+        "accepted_at": swap.accepted_at,
+    }
+
+
+def get_swap(db: Session, swap_id: int) -> tuple[ShiftSwap, Schedule]:
+    row = db.execute(
+        select(ShiftSwap, Schedule)
+        .join(Schedule, Schedule.id == ShiftSwap.schedule_id)
+        .where(ShiftSwap.id == swap_id)
+    ).first()
+    if not row:
+        raise LookupError("해당 교대 요청이 존재하지 않습니다.")
+    return row[0], row[1]
+
+
+def create_swap(
+    db: Session, user_id: int, schedule_id: int, note: Optional[str]
+) -> tuple[ShiftSwap, Schedule]:
+    schedule = db.get(Schedule, schedule_id)
+    if not schedule or schedule.user_id != user_id:
+        raise LookupError("본인 근무만 교대 요청할 수 있습니다.")
+    start, _ = shift_interval(
+        schedule.work_date, schedule.start_time, schedule.end_time
+    )
+    if start <= datetime.now():
+        raise ValueError("이미 시작된 근무는 교대할 수 없습니다.")
+    open_swap = db.execute(
+        select(ShiftSwap.id).where(
+            ShiftSwap.schedule_id == schedule_id,
+            ShiftSwap.status == ShiftSwapStatusEnum.open,
+        )
+    ).first()
+    if open_swap:
+        raise ValueError("이미 교대 요청 중인 근무입니다.")
+
+    swap = ShiftSwap(schedule_id=schedule_id, requester_id=user_id, note=note)
+    db.add(swap)
+    db.flush()
+    return swap, schedule
+
+
+def list_open_swaps(
+    db: Session, cursor: Optional[int], limit: int
+) -> tuple[list[tuple[ShiftSwap, Schedule]], Optional[int]]:
+    stmt = (
+        select(ShiftSwap, Schedule)
+        .join(Schedule, Schedule.id == ShiftSwap.schedule_id)
+        .where(ShiftSwap.status == ShiftSwapStatusEnum.open)
+    )
+    if cursor:
+        stmt = stmt.where(ShiftSwap.id < cursor)
+    rows = db.execute(stmt.order_by(ShiftSwap.id.desc()).limit(limit + 1)).all()
+    if len(rows) > limit:
+        return [tuple(r) for r in rows[:limit]], rows[limit - 1][0].id
+    return [tuple(r) for r in rows], None
+
+
+def accept_swap(
+    db: Session, swap_id: int, taker: User
+) -> tuple[ShiftSwap, Schedule]:
+    """
+    교대 수락. 수락자의 전후 근무를 FOR UPDATE로 잠근 뒤 겹침을 확인하고,
+    status가 아직 모집중일 때만 바꾸는 조건부 UPDATE로 한 명만 성공시킨다.
+    커밋은 라우터에서.
+    """
+    swap, schedule = get_swap(db, swap_id)
+    if swap.status != ShiftSwapStatusEnum.open:
+        raise SwapConflict("이미 마감된 교대 요청입니다.")
+    if swap.requester_id == taker.id:
+        raise ValueError("본인 요청은 수락할 수 없습니다.")
+    if not _can_work(taker, schedule):
+        raise ValueError("이 근무를 맡을 수 없습니다. (직급 / 불가 요일)")
+
+    start, end = shift_interval(
+        schedule.work_date, schedule.start_time, schedule.end_time
+    )
+    index = _load_interval_index(db, schedule.work_date, taker.id, lock=True)
+    if index.works_on(taker.id, schedule.work_date):
+        raise SwapConflict("같은 날 이미 근무가 있습니다.")
+    if index.overlaps(taker.id, start, end):
+        raise ValueError("겹치는 근무가 있습니다.")
+
+    now = datetime.now()
+    claimed = db.execute(
+        update(ShiftSwap)
+        .where(
+            ShiftSwap.id == swap_id, ShiftSwap.status == ShiftSwapStatusEnum.open
+        )
+        .values(
+            status=ShiftSwapStatusEnum.accepted, taker_id=taker.id, accepted_at=now
+        )
+    )
+    if claimed.rowcount != 1:
+        raise SwapConflict("다른 직원이 먼저 수락했습니다.")
+    try:
+        moved = db.execute(
+            update(Schedule)
+            .where(Schedule.id == schedule.id, Schedule.user_id == swap.requester_id)
+            .values(user_id=taker.id)
+        )
+    except IntegrityError:
+        raise SwapConflict("같은 날 이미 근무가 있습니다.")
+    if moved.rowcount != 1:
+        raise SwapConflict("근무가 변경되어 수락할 수 없습니다.")
+
+    db.expire_all()
+    return get_swap(db, swap_id)
+
+
+def cancel_swap(db: Session, swap_id: int, user_id: int) -> tuple[ShiftSwap, Schedule]:
+    swap, schedule = get_swap(db, swap_id)
+    if swap.requester_id != user_id:
+        raise LookupError("본인 요청만 취소할 수 있습니다.")
+    cancelled = db.execute(
+        update(ShiftSwap)
+        .where(
+            ShiftSwap.id == swap_id, ShiftSwap.status == ShiftSwapStatusEnum.open
+        )
+        .values(status=ShiftSwapStatusEnum.cancelled)
+    )
+    if cancelled.rowcount != 1:
+        raise SwapConflict("이미 마감된 교대 요청입니다.")
+    db.expire_all()
+    return get_swap(db, swap_id)
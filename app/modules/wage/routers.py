@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Header
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.modules.wage import models, schemas
+from app.modules.admin.reference import DEFAULT_WAGES, reference_cache
+from app.modules.payroll import services as payroll_services
+from app.modules.wage import models, schemas, services
+from app.utils.response_utils import cached_json_response
 
 router = APIRouter(tags=["Wage"])
 admin_router = APIRouter(tags=["Admin"])
@@ -12,8 +18,13 @@ admin_router = APIRouter(tags=["Admin"])
 def create_user_wage(data: schemas.UserWageCreate, db: Session = Depends(get_db)):
     record = models.UserWage(**data.dict())
     db.add(record)
+    services.bump_user_wages(db)
     db.commit()
     db.refresh(record)
+    # 소급 적용: 시작일이 속한 달부터 미마감 급여를 이 유저만 다시 계산
+    payroll_services.recalculate_open_months(
+        db, record.start_date, record.end_date, [record.user_id]
+    )
     return record
 
 
@@ -28,16 +39,32 @@ def get_user_wage_list(user_id: int, db: Session = Depends(get_db)):
 @admin_router.post(
     "/", response_model=schemas.DefaultWageResponse
 )  # 연도 최저임금 설정
-def create_default_wage(data: schemas.DefaultWageCreate, db: Session = Depends(get_db)):
+def create_default_wage(
+    data: schemas.DefaultWageCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     record = models.DefaultWage(**data.dict())
     db.add(record)
+    services.bump_default_wages(db)
     db.commit()
     db.refresh(record)
+    # 그 해의 미마감 급여를 전 직원 다시 계산 (인원이 많으므로 백그라운드)
+    background_tasks.add_task(
+        payroll_services.run_open_month_recalculation,
+        date(record.year, 1, 1),
+        date(record.year, 12, 31),
+    )
     return record
 
 
 @admin_router.get(
     "/", response_model=list[schemas.DefaultWageResponse]
 )  # 연도별 최저임금 조회
-def list_default_wages(db: Session = Depends(get_db)):
-    return db.query(models.DefaultWage).order_by(models.DefaultWage.year.desc()).all()
+def list_default_wages(
+    if_none_match: Optional[str] = Header(None), db: Session = Depends(get_db)
+):
+    body, etag = reference_cache.get_or_render(
+        db, DEFAULT_WAGES, "all", lambda: services.render_default_wages(db)
+    )
+    return cached_json_response(body, etag, if_none_match)
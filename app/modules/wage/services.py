@@ -1,27 +1,114 @@
+from bisect import bisect_right
 from datetime import date
+from typing import Iterable, Optional
 
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
+from app.modules.admin.reference import DEFAULT_WAGES, USER_WAGES, reference_cache
+from app.modules.wage import schemas
 from app.modules.wage.models import DefaultWage, UserWage
+from app.utils.cache_utils import VersionedCache
 
+# 유저별 시급 구간 / 연도별 최저시급 캐시. 쓰기 트랜잭션에서 공유 버전을 올리면
+# 모든 워커가 다시 읽는다 (projector가 어느 워커에서 돌든 옛 시급을 쓰지 않도록)
+_user_wage_cache = VersionedCache(reference_cache, USER_WAGES, maxsize=4096)
+_default_wage_cache = VersionedCache(reference_cache, DEFAULT_WAGES, maxsize=1)
 
-def get_applicable_wage(user_id: int, work_date: date, db: Session):
-    user_wage = (
-        db.query(UserWage)
-        .filter(
-            UserWage.user_id == user_id,
-            UserWage.start_date <= work_date,
-            (UserWage.end_date.is_(None)) | (UserWage.end_date >= work_date),
-        )
-        .order_by(UserWage.start_date.desc())
-        .first()
+_default_wage_list = TypeAdapter(list[schemas.DefaultWageResponse])
+
+
+class WageTimeline:
+    """유저 1명의 시급 이력(시작일 정렬)과 연도별 최저시급으로 날짜별 시급을 해석"""
+
+    def __init__(
+        self,
+        intervals: list[tuple[date, Optional[date], int]],
+        default_wages: dict[int, int],
+    ):
+        self._intervals = intervals
+        self._starts = [start for start, _, _ in intervals]
+        self._default_wages = default_wages
+
+    def wage_on(self, work_date: date) -> int:
+        # 시작일이 work_date 이하인 구간 중 가장 늦게 시작한 유효 구간을 찾는다
+        i = bisect_right(self._starts, work_date)
+        while i > 0:
+            i -= 1
+            _, end, wage = self._intervals[i]
+            if end is None or end >= work_date:
+                return wage
+        return self._default_wages.get(work_date.year, -1)
+
+    def wages_for(self, dates: Iterable[date]) -> dict[date, int]:
+        return {d: self.wage_on(d) for d in dates}
+
+
+def _load_user_intervals(user_id: int, db: Session):
+    rows = (
+        db.query(UserWage.start_date, UserWage.end_date, UserWage.wage)
+        .filter(UserWage.user_id == user_id)
+        .order_by(UserWage.start_date, UserWage.id)
+        .all()
     )
-    if user_wage:
-        return user_wage.wage
+    return [(r.start_date, r.end_date, r.wage) for r in rows]
 
-    year = work_date.year
-    default_wage = db.query(DefaultWage).filter_by(year=year).first()
-    if default_wage:
-        return default_wage.wage
 
-    return -1
+def _load_default_wages(db: Session) -> dict[int, int]:
+    return {r.year: r.wage for r in db.query(DefaultWage.year, DefaultWage.wage).all()}
+
+
+def get_default_wages(db: Session) -> dict[int, int]:
+    return _default_wage_cache.get_or_load(
+        db, "all", lambda: _load_default_wages(db)
+    )
+
+
+def get_wage_timeline(user_id: int, db: Session) -> WageTimeline:
+    intervals = _user_wage_cache.get_or_load(
+        db, user_id, lambda: _load_user_intervals(user_id, db)
+    )
+    return WageTimeline(intervals, get_default_wages(db))
+
+
+def load_wage_timelines(
+    db: Session, user_ids: Optional[Iterable[int]] = None
+) -> dict[int, WageTimeline]:
+    # 일괄 계산용: 대상 유저 전체의 시급 이력을 한 번의 쿼리로 읽는다
+    query = db.query(
+        UserWage.user_id, UserWage.start_date, UserWage.end_date, UserWage.wage
+    )
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        query = query.filter(UserWage.user_id.in_(user_ids))
+
+    grouped: dict[int, list[tuple[date, Optional[date], int]]] = {}
+    for r in query.order_by(UserWage.user_id, UserWage.start_date, UserWage.id):
+        grouped.setdefault(r.user_id, []).append((r.start_date, r.end_date, r.wage))
+
+    default_wages = get_default_wages(db)
+    return {
+        user_id: WageTimeline(grouped.get(user_id, []), default_wages)
+        for user_id in (user_ids if user_ids is not None else grouped)
+    }
+
+
+def get_applicable_wage(user_id: int, work_date: date, db: Session):
+    return get_wage_timeline(user_id, db).wage_on(work_date)
+
+
+def bump_user_wages(db: Session) -> None:
+    # 유저 시급 쓰기와 같은 트랜잭션에서 호출 (커밋과 함께 모든 워커의 캐시가 바뀐다)
+    reference_cache.bump(db, USER_WAGES)
+
+
+def bump_default_wages(db: Session) -> None:
+    # 최저시급 타임라인과 조회 응답 캐시가 같은 버전을 쓴다
+    reference_cache.bump(db, DEFAULT_WAGES)
+
+
+def render_default_wages(db: Session) -> bytes:
+    records = db.query(DefaultWage).order_by(DefaultWage.year.desc()).all()
+    return _default_wage_list.dump_json(
+        _default_wage_list.validate_python(records, from_attributes=True)
+    )
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+from sqlalchemy import BigInteger, create_engine, literal, literal_column
+from sqlalchemy.dialects.mysql.dml import OnDuplicateClause
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql.elements import ClauseElement, ColumnClause
+from sqlalchemy.sql.visitors import replacement_traverse
+
+# Settings는 필수 환경 변수가 없으면 import 시점에 실패한다 (테스트는 DB에 붙지 않음)
+for key, value in {
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "3306",
+    "DB_NAME": "test",
+    "JWT_SECRET_KEY": "test-secret",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_EXPIRE_MINUTES": "60",
+    "ADMIN_USERNAME": "admin",
+    "ADMIN_PASSWORD": "admin",
+    "ADMIN_NAME": "관리자",
+    "ADMIN_EMAIL": "admin@example.com",
+}.items():
+    os.environ.setdefault(key, value)
+
+# 관계(relationship) 문자열 참조가 풀리도록 모든 모듈의 모델을 등록
+import app.core.routers  # noqa: E402, F401
+from app.core.database import Base  # noqa: E402
+from app.modules.admin.reference import reference_cache  # noqa: E402
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint(type_, compiler, **kw):
+    # sqlite는 INTEGER PRIMARY KEY만 자동 증가한다 (attendance_event 등 BIGINT PK)
+    return "INTEGER"
+
+
+@compiles(OnDuplicateClause, "sqlite")
+def _sqlite_on_duplicate(clause, compiler, **kw):
+    # ON DUPLICATE KEY UPDATE → ON CONFLICT DO UPDATE (inserted.col → excluded.col)
+    def replace(element, **kw):
+        if isinstance(element, ColumnClause) and element.table is clause.inserted_alias:
+            return literal_column(f"excluded.{element.name}")
+        return None
+
+    assignments = []
+    for key, value in clause.update.items():
+        if not isinstance(value, ClauseElement):
+            value = literal(value)
+        value = replacement_traverse(value, {}, replace)
+        name = getattr(key, "name", key)
+        assignments.append(f"{name} = {compiler.process(value.self_group(), **kw)}")
+    return f"ON CONFLICT DO UPDATE SET {', '.join(assignments)}"
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    # MySQL 대신 파일 sqlite에 전체 스키마를 만든다
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    # 새 DB는 버전이 0부터 시작하므로 이전 테스트 DB에서 읽은 공유 버전 메모를 비운다
+    reference_cache.clear()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(sqlite_engine):
+    return sessionmaker(bind=sqlite_engine, autoflush=False, autocommit=False)
+
+
+def p99(samples: list[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, -(-len(ordered) * 99 // 100) - 1)]
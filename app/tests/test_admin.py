@@ -0,0 +1,174 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.modules.admin import calendar, reference, routers, schemas, services
+from app.modules.admin.models import (
+    Holiday,
+    HolidayKindEnum,
+    InsuranceCategoryEnum,
+    InsuranceRate,
+)
+from app.modules.admin.reference import reference_cache
+from app.modules.auth.models import PositionEnum, User
+from app.modules.auth.services import PasswordHashBusy
+from app.utils.cache_utils import ResponseCache
+
+
+def _worker_cache(version_ttl: float) -> ResponseCache:
+    # 워커 프로세스마다 하나씩 있는 응답 캐시 (버전은 DB 행으로 공유)
+    return ResponseCache(
+        reference._load_reference_version,
+        reference._bump_reference_version,
+        version_ttl=version_ttl,
+    )
+
+
+def test_reference_cache_bump_is_shared_across_workers(session_factory):
+    writer, reader = _worker_cache(0), _worker_cache(0)
+    renders = []
+
+    def render():
+        renders.append(1)
+        return f"body{len(renders)}".encode()
+
+    with session_factory() as db:
+        first = reader.get_or_render(db, reference.HOLIDAYS, "2026", render)
+        assert reader.get_or_render(db, reference.HOLIDAYS, "2026", render) == first
+        assert len(renders) == 1
+        db.rollback()
+
+    # 다른 워커의 쓰기: 커밋과 함께 버전이 오른다
+    with session_factory() as db:
+        writer.bump(db, reference.HOLIDAYS)
+        db.commit()
+
+    with session_factory() as db:
+        body, etag = reader.get_or_render(db, reference.HOLIDAYS, "2026", render)
+        assert len(renders) == 2
+        assert (body, etag) != first
+        assert reader.version(db, reference.HOLIDAYS) == 1
+
+
+def test_reference_cache_remembers_version_within_ttl(session_factory):
+    writer, reader = _worker_cache(0), _worker_cache(60)
+    with session_factory() as db:
+        assert reader.version(db, reference.INSURANCE_RATES) == 0
+        writer.bump(db, reference.INSURANCE_RATES)
+        db.commit()
+        # version_ttl 동안은 DB를 다시 읽지 않는다
+        assert reader.version(db, reference.INSURANCE_RATES) == 0
+        assert writer.version(db, reference.INSURANCE_RATES) == 1
+
+
+def test_refresh_days_swaps_calendar_without_touching_readers(session_factory):
+    calendar.invalidate_calendar()
+    day = date(2026, 3, 3)  # 화요일
+    with session_factory() as db:
+        before = calendar.get_year_calendar(db, 2026)
+        assert before.count(date(2026, 3, 1), date(2026, 3, 31), calendar.OFF_DAY) == 9
+
+        db.add(Holiday(name="창립기념일", date=day, kind=HolidayKindEnum.store))
+        db.commit()
+        calendar.refresh_days(db, [day, None])
+
+        after = calendar.get_year_calendar(db, 2026)
+        assert after is not before
+        assert after.flags_on(day) == calendar.STORE_HOLIDAY
+        assert after.count(date(2026, 3, 1), date(2026, 3, 31), calendar.OFF_DAY) == 10
+        # 이미 달력을 들고 있던 요청은 바뀌지 않은 값을 끝까지 본다
+        assert before.flags_on(day) == 0
+        assert before.count(date(2026, 3, 1), date(2026, 3, 31), calendar.OFF_DAY) == 9
+    calendar.invalidate_calendar()
+
+
+def test_insurance_rate_written_on_another_worker_is_seen(
+    session_factory, monkeypatch
+):
+    monkeypatch.setattr(reference_cache._versions, "ttl", 0)
+    services._insurance_rate_cache.clear()
+    pension = InsuranceCategoryEnum.pension
+    with session_factory() as db:
+        assert services.get_insurance_rate_timeline(db).rates_on(date(2026, 9, 1)) == {}
+        db.commit()
+
+        # 다른 워커의 요율 저장: 이 워커의 타임라인 캐시는 건드리지 않는다
+        with session_factory() as other:
+            other.add(
+                InsuranceRate(
+                    category=pension,
+                    rate=Decimal("4.5"),
+                    effective_date=date(2026, 1, 1),
+                )
+            )
+            reference._bump_reference_version(other, reference.INSURANCE_RATES)
+            other.commit()
+
+        rates = services.get_insurance_rate_timeline(db).rates_on(date(2026, 9, 1))
+        assert rates == {pension: Decimal("4.5")}
+    services._insurance_rate_cache.clear()
+
+
+def test_update_user_maps_busy_hash_pool_to_503(session_factory, monkeypatch):
+    def busy(db, user_id, data):
+        raise PasswordHashBusy("잠시 후 다시 시도해 주세요.")
+
+    monkeypatch.setattr(services, "update_user", busy)
+    with session_factory() as db:
+        with pytest.raises(HTTPException) as excinfo:
+            routers.update_user(1, schemas.UserUpdate(name="크루"), db, None)
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.headers == {"Retry-After": "1"}
+
+
+def test_ascii_search_matches_username_and_email_prefix(session_factory):
+    # "kim"/"admin"의 ngram 토큰은 InnoDB 불용어에 걸려 FULLTEXT로는 못 찾는다
+    rows = [
+        ("kim01", "kim@example.com"),
+        ("admin", None),
+        ("park", "kim_p@example.com"),
+        ("jkim", "j@example.com"),
+    ]
+    with session_factory() as db:
+        db.add_all(
+            User(
+                id=i,
+                username=username,
+                password="x",
+                name=f"직원{i}",
+                position=PositionEnum.crew,
+                email=email,
+            )
+            for i, (username, email) in enumerate(rows, start=1)
+        )
+        db.commit()
+
+        def search(q):
+            _, _, items, _ = services.list_users(db, q, 10)
+            return sorted(u.username for u in items)
+
+        assert search("kim") == ["kim01", "park"]
+        assert search("admin") == ["admin"]
+        assert search("kim_") == ["park"]  # _는 와일드카드가 아니다
+
+
+def test_calendar_follows_holiday_written_on_another_worker(
+    session_factory, monkeypatch
+):
+    monkeypatch.setattr(reference_cache._versions, "ttl", 0)
+    calendar.invalidate_calendar()
+    day = date(2026, 3, 3)
+    with session_factory() as db:
+        assert calendar.flags_on(db, day) == 0
+        db.commit()
+
+        # 다른 워커의 휴일 등록: 이 워커의 달력은 건드리지 않는다
+        with session_factory() as other:
+            other.add(Holiday(name="창립기념일", date=day, kind=HolidayKindEnum.store))
+            reference._bump_reference_version(other, reference.HOLIDAYS)
+            other.commit()
+
+        assert calendar.flags_on(db, day) == calendar.STORE_HOLIDAY
+    calendar.invalidate_calendar()
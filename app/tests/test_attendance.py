@@ -0,0 +1,117 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from app.modules.attendance import presence
+
+SUBSCRIBERS = 500
+PUNCHES = 200
+TODAY = date(2026, 3, 2)
+
+
+def _record(minute: int, done: bool = False) -> dict:
+    check_in = datetime(2026, 3, 2, 9) + timedelta(minutes=minute)
+    return {
+        "work_date": TODAY,
+        "check_in": check_in,
+        "check_out": check_in + timedelta(hours=8) if done else None,
+    }
+
+
+def _payload(message: str) -> dict:
+    event, data = message.rstrip("\n").split("\n")
+    return {"event": event.removeprefix("event: "), **json.loads(data[6:])}
+
+
+def test_fan_out_to_hundreds_of_subscribers(monkeypatch):
+    hub = presence.PresenceHub()
+    hub.QUEUE_SIZE = PUNCHES + 1
+    serialized = []
+    sse_event = presence.sse_event
+    monkeypatch.setattr(
+        presence,
+        "sse_event",
+        lambda event, data: serialized.append(event) or sse_event(event, data),
+    )
+
+    async def run() -> float:
+        subs = [hub.subscribe()[0] for _ in range(SUBSCRIBERS)]
+        assert hub.subscriber_count() == SUBSCRIBERS
+
+        # 출퇴근 API 스레드(다른 스레드)에서 publish
+        started = time.perf_counter()
+        publisher = threading.Thread(
+            target=lambda: [
+                hub.publish(user_id, f"직원{user_id}", _record(user_id))
+                for user_id in range(1, PUNCHES + 1)
+            ]
+        )
+        publisher.start()
+        while any(sub.queue.qsize() < PUNCHES for sub in subs):
+            await asyncio.sleep(0.001)
+        elapsed = time.perf_counter() - started
+        publisher.join()
+
+        for sub in subs:
+            received = [_payload(sub.queue.get_nowait()) for _ in range(PUNCHES)]
+            assert [m["user_id"] for m in received] == list(range(1, PUNCHES + 1))
+            assert sub.queue.empty()
+        for sub in subs:
+            hub.unsubscribe(sub)
+        return elapsed
+
+    elapsed = asyncio.run(run())
+    deliveries = SUBSCRIBERS * PUNCHES
+    print(
+        f"\nfan-out {PUNCHES} deltas x {SUBSCRIBERS} subscribers: "
+        f"{elapsed * 1000:.0f}ms ({elapsed / deliveries * 1e6:.2f}us/delivery)"
+    )
+    # 델타는 구독자 수와 관계없이 한 번만 직렬화
+    assert serialized == ["presence"] * PUNCHES
+    assert hub.subscriber_count() == 0
+    assert elapsed < 2.0
+
+
+def test_repeated_state_is_not_sent_again():
+    hub = presence.PresenceHub()
+
+    async def run() -> list[str]:
+        sub, snapshot = hub.subscribe()
+        assert snapshot == []
+        assert hub.publish(1, "직원1", _record(0)) is True
+        assert hub.publish(1, None, _record(0)) is False  # tail로 다시 들어온 같은 상태
+        assert hub.publish(1, None, _record(0, done=True)) is True
+        await asyncio.sleep(0)
+        return [_payload(sub.queue.get_nowait()) for _ in range(sub.queue.qsize())]
+
+    messages = asyncio.run(run())
+    assert [(m["event"], m["status"]) for m in messages] == [
+        ("presence", presence.WORKING),
+        ("presence", presence.DONE),
+    ]
+    assert messages[1]["name"] == "직원1"
+
+
+def test_slow_subscriber_gets_snapshot_instead_of_backlog():
+    hub = presence.PresenceHub()
+    hub.QUEUE_SIZE = 4
+
+    async def run() -> list[str]:
+        slow, _ = hub.subscribe()
+        for user_id in range(1, 11):
+            hub.publish(user_id, f"직원{user_id}", _record(user_id))
+        await asyncio.sleep(0)
+        return [slow.queue.get_nowait() for _ in range(slow.queue.qsize())]
+
+    messages = asyncio.run(run())
+    # 넘칠 때마다 밀린 델타를 버리고 스냅샷으로 맞춘 뒤 이어 받는다
+    assert len(messages) <= 4
+    kinds = [m.split("\n", 1)[0] for m in messages]
+    assert "event: snapshot" in kinds
+    last_snapshot = max(i for i, k in enumerate(kinds) if k == "event: snapshot")
+    snapshot = json.loads(messages[last_snapshot].split("data: ")[1])
+    seen = {entry["user_id"] for entry in snapshot}
+    seen |= {_payload(m)["user_id"] for m in messages[last_snapshot + 1:]}
+    assert seen == set(range(1, 11))
@@ -0,0 +1,162 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from httpx import ASGITransport, AsyncClient
+from passlib.context import CryptContext
+
+from app.core import security
+from app.core.config import settings
+from app.core.database import get_db
+from app.modules.admin import reference
+from app.modules.admin.reference import reference_cache
+from app.modules.auth import routers, schemas, services
+from app.modules.auth.models import PositionEnum, User
+from app.tests.conftest import p99
+
+# 운영 비용(rounds=12, 약 0.4초)이면 테스트가 너무 길어서 rounds만 낮춘다
+FAST_CONTEXT = CryptContext(schemes=["bcrypt_sha256"], bcrypt_sha256__rounds=8)
+PASSWORD = "pw-1234"
+LOGINS = 60  # 요청 스레드풀(기본 40) 보다 많은 동시 로그인
+PINGS = 30
+
+
+@pytest.fixture
+def user(monkeypatch):
+    monkeypatch.setattr(services, "pwd_context", FAST_CONTEXT)
+    user = User(
+        id=1,
+        username="crew",
+        password=FAST_CONTEXT.hash(PASSWORD),
+        name="크루",
+        position=PositionEnum.crew,
+    )
+    monkeypatch.setattr(services, "get_user_by_username", lambda db, name: user)
+    return user
+
+
+def _with_ping(app: FastAPI) -> FastAPI:
+    @app.get("/ping")
+    def ping():  # 로그인과 무관한 동기 엔드포인트 (같은 요청 스레드풀 사용)
+        return {}
+
+    app.dependency_overrides[get_db] = lambda: None
+    return app
+
+
+def pooled_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(routers.router, prefix="/auth")
+    return _with_ping(app)
+
+
+def inline_app(user: User) -> FastAPI:
+    # 변경 전: 동기 라우트 안에서 bcrypt를 바로 실행
+    app = FastAPI()
+
+    @app.post("/auth/login")
+    def login(payload: schemas.LoginRequest):
+        if not services.pwd_context.verify(payload.password, user.password):
+            raise HTTPException(status_code=401)
+        return {"access_token": "x", "token_type": "bearer"}
+
+    return _with_ping(app)
+
+
+async def _burst(app: FastAPI) -> dict:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def timed(request):
+            started = time.perf_counter()
+            response = await request
+            return response.status_code, time.perf_counter() - started
+
+        async def login():
+            body = {"username": "crew", "password": PASSWORD}
+            return await timed(client.post("/auth/login", json=body))
+
+        async def ping(delay: float):
+            await asyncio.sleep(delay)
+            return await timed(client.get("/ping"))
+
+        logins = [asyncio.create_task(login()) for _ in range(LOGINS)]
+        pings = [asyncio.create_task(ping(0.01 * i)) for i in range(PINGS)]
+        login_results = await asyncio.gather(*logins)
+        ping_results = await asyncio.gather(*pings)
+
+    return {
+        "ok": [t for code, t in login_results if code == 200],
+        "busy": sum(1 for code, _ in login_results if code == 503),
+        "ping": [t for _, t in ping_results],
+    }
+
+
+def test_login_burst_p99_before_and_after(user):
+    before = asyncio.run(_burst(inline_app(user)))
+    after = asyncio.run(_burst(pooled_app()))
+
+    capacity = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE
+    print(
+        f"\n[login x{LOGINS}] "
+        f"before: login p99={p99(before['ok']) * 1000:.0f}ms "
+        f"ping p99={p99(before['ping']) * 1000:.0f}ms | "
+        f"after: login p99={p99(after['ok']) * 1000:.0f}ms "
+        f"ping p99={p99(after['ping']) * 1000:.0f}ms "
+        f"503={after['busy']}"
+    )
+
+    # 변경 전에는 모든 로그인이 처리되지만 서로와 다른 요청을 붙잡는다
+    assert len(before["ok"]) == LOGINS
+    # 한도를 넘는 로그인은 대기 없이 503으로 거절된다
+    assert len(after["ok"]) + after["busy"] == LOGINS
+    assert len(after["ok"]) >= capacity
+    # 받아들인 로그인의 p99와 무관한 엔드포인트의 p99가 모두 줄어든다
+    assert p99(after["ok"]) < p99(before["ok"])
+    assert p99(after["ping"]) < p99(before["ping"])
+
+
+def test_busy_pool_rejects_fast(user, monkeypatch):
+    # 슬롯이 모두 찬 상태에서는 해시를 기다리지 않고 곧바로 PasswordHashBusy
+    monkeypatch.setattr(services, "_hash_slots", services.threading.BoundedSemaphore(1))
+    services._hash_slots.acquire()
+    started = time.perf_counter()
+    with pytest.raises(services.PasswordHashBusy):
+        services.verify_password(PASSWORD, user.password)
+    assert time.perf_counter() - started < 0.05
+
+
+def test_deactivation_on_another_worker_rejects_cached_principal(
+    session_factory, monkeypatch
+):
+    # 버전 메모를 바로 만료시켜 "version_ttl이 지난 뒤"를 재현한다
+    monkeypatch.setattr(reference_cache._versions, "ttl", 0)
+    security._principal_cache.clear()
+    token = services.create_access_token(sub="1", username="crew", is_admin=False)
+    cred = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    with session_factory() as db:
+        db.add(
+            User(
+                id=1,
+                username="crew",
+                password="x",
+                name="크루",
+                position=PositionEnum.crew,
+            )
+        )
+        db.commit()
+        assert security.get_current_user(cred, db).username == "crew"
+        db.commit()
+
+        # 다른 워커의 관리자 수정: 이 워커의 캐시는 건드리지 않는다
+        with session_factory() as other:
+            other.get(User, 1).is_active = False
+            reference._bump_reference_version(other, reference.PRINCIPALS)
+            other.commit()
+        # 이 워커에서 무효화하지 않아도 공유 버전을 보고 다시 읽어 거절한다
+        with pytest.raises(HTTPException) as excinfo:
+            security.get_current_user(cred, db)
+        assert excinfo.value.status_code == 401
+    security._principal_cache.clear()
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.modules.admin import calendar
+from app.modules.dayoff import services
+from app.modules.dayoff.models import LeaveBalance, LeaveEntryKindEnum
+
+# 다음 주 월요일부터 (지난 날짜 신청 불가)
+MONDAY = date.today() + timedelta(days=7 - date.today().weekday())
+
+
+def _balance(db, user_id: int) -> tuple[int, int, int]:
+    row = services.get_balance(db, user_id)
+    return row["balance"], row["granted"], row["used"]
+
+
+def test_restore_reduces_used_instead_of_adding_granted(session_factory):
+    with session_factory() as db:
+        services._append_entry(db, 1, 15, LeaveEntryKindEnum.grant)
+        services._append_entry(db, 1, -3, LeaveEntryKindEnum.use, request_id=7)
+        services._append_entry(db, 1, 3, LeaveEntryKindEnum.restore, request_id=7)
+        services._append_entry(db, 1, -2, LeaveEntryKindEnum.use, request_id=8)
+        db.commit()
+
+        assert _balance(db, 1) == (13, 15, 2)
+        assert services.check_balances(db)["drifted"] == []
+
+
+def test_check_balances_fixes_rows_counted_restore_as_granted(session_factory):
+    with session_factory() as db:
+        services._append_entry(db, 1, 15, LeaveEntryKindEnum.grant)
+        services._append_entry(db, 1, -3, LeaveEntryKindEnum.use, request_id=7)
+        services._append_entry(db, 1, 3, LeaveEntryKindEnum.restore, request_id=7)
+        # 이전 집계 방식으로 쌓인 잔여일 행
+        db.execute(
+            update(LeaveBalance)
+            .where(LeaveBalance.user_id == 1)
+            .values(granted=18, used=3)
+        )
+        db.commit()
+
+        result = services.check_balances(db, fix=True)
+        db.commit()
+        assert [d["user_id"] for d in result["drifted"]] == [1]
+        assert result["fixed"] is True
+        assert _balance(db, 1) == (15, 15, 0)
+        assert services.check_balances(db)["drifted"] == []
+
+
+def _request(db, offset: int, days: int = 1):
+    start = MONDAY + timedelta(days=offset)
+    return services.create_request(
+        db, 1, start, start + timedelta(days=days - 1), None
+    )
+
+
+def test_pending_days_follow_request_transitions(session_factory):
+    calendar.invalidate_calendar()
+    with session_factory() as db:
+        services._append_entry(db, 1, 5, LeaveEntryKindEnum.grant)
+        first, second, third = _request(db, 0, 2), _request(db, 2), _request(db, 3)
+        assert services.get_balance(db, 1)["pending"] == 4
+        # 대기 일수까지 합쳐 잔여일(5)을 넘는 신청은 거절
+        with pytest.raises(ValueError):
+            _request(db, 7, 2)
+
+        services.approve_request(db, first.id, admin_id=99)
+        services.reject_request(db, second.id, admin_id=99)
+        assert services.get_balance(db, 1)["pending"] == 1
+        services.cancel_request(db, third.id, 1, is_admin=False)
+        db.commit()
+
+        row = services.get_balance(db, 1)
+        assert (row["balance"], row["used"], row["pending"]) == (3, 2, 0)
+        assert services.check_balances(db)["drifted"] == []
+    calendar.invalidate_calendar()
+
+
+def test_check_balances_fixes_pending_days(session_factory):
+    calendar.invalidate_calendar()
+    with session_factory() as db:
+        services._append_entry(db, 1, 5, LeaveEntryKindEnum.grant)
+        _request(db, 0, 3)
+        db.execute(
+            update(LeaveBalance).where(LeaveBalance.user_id == 1).values(pending=0)
+        )
+        db.commit()
+
+        result = services.check_balances(db, fix=True)
+        db.commit()
+        assert [d["user_id"] for d in result["drifted"]] == [1]
+        assert services.get_balance(db, 1)["pending"] == 3
+        assert services.check_balances(db)["drifted"] == []
+    calendar.invalidate_calendar()
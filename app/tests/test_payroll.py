@@ -0,0 +1,522 @@
+import asyncio
+import csv
+import io
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from datetime import time as dtime
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import delete, insert, select, update
+
+from app.core.config import settings
+from app.modules.admin import calendar
+from app.modules.admin import routers as admin_routers
+from app.modules.admin import schemas as admin_schemas
+from app.modules.admin import services as admin_services
+from app.modules.admin.models import Holiday, HolidayKindEnum
+from app.modules.admin import reference
+from app.modules.admin.reference import reference_cache
+from app.modules.attendance import outbox
+from app.modules.attendance import services as attendance_services
+from app.modules.attendance.models import Attendance, OutboxCheckpoint
+from app.modules.auth.models import PositionEnum, User
+from app.modules.payroll import services
+from app.modules.payroll import worker  # noqa: F401 (급여 outbox 소비자 등록)
+from app.modules.payroll.models import Payroll
+from app.modules.wage import routers as wage_routers
+from app.modules.wage import schemas as wage_schemas
+from app.modules.wage import services as wage_services
+from app.modules.wage.models import DefaultWage
+
+REGISTER_ROWS = 50_000
+SMALL_REGISTER_ROWS = 5_000
+
+
+def _seed_register(engine, count: int, year: int, month: int) -> None:
+    users = [
+        {
+            "id": i,
+            "username": f"crew{i}",
+            "password": "x",
+            "name": f"직원{i}",
+            "position": PositionEnum.crew,
+            "bank_name": "국민은행",
+            "account_number": f"{i:012d}",
+        }
+        for i in range(1, count + 1)
+    ]
+    payrolls = [
+        {
+            "user_id": i,
+            "year": year,
+            "month": month,
+            "hourly_wage": 10030,
+            "total_hours": 160,
+            "total_salary": 1_604_800,
+            "total_deduction": 150_000,
+            "net_salary": 1_454_800,
+        }
+        for i in range(1, count + 1)
+    ]
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User).prefix_with("OR IGNORE"), users  # 이미 있는 직원은 그대로
+        )
+        conn.execute(insert(Payroll), payrolls)
+
+
+def _materialized_register(session_factory, year: int, month: int) -> str:
+    # 변경 전 방식: 전체 행을 메모리에 올린 뒤 한 번에 CSV로
+    P = Payroll
+    db = session_factory()
+    try:
+        rows = db.execute(
+            select(*[col for _, col in services._REGISTER_COLUMNS])
+            .join(User, User.id == P.user_id)
+            .where(P.year == year, P.month == month)
+            .order_by(P.user_id)
+        ).all()
+    finally:
+        db.close()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in services._REGISTER_COLUMNS])
+    writer.writerows(rows)
+    return "\ufeff" + buffer.getvalue()
+
+
+def _measure(produce) -> tuple[int, int, float]:
+    # (CSV 줄 수, 최대 Python 메모리 bytes, 초). 스트림은 받는 즉시 버린다
+    tracemalloc.start()
+    started = time.perf_counter()
+    lines = 0
+    try:
+        for chunk in produce():
+            lines += chunk.count("\n")
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return lines, peak, elapsed
+
+
+def test_register_csv_streams_50k_rows_in_flat_memory(
+    sqlite_engine, session_factory, monkeypatch
+):
+    monkeypatch.setattr(services, "SessionLocal", session_factory)
+    _seed_register(sqlite_engine, REGISTER_ROWS, 2026, 9)
+    _seed_register(sqlite_engine, SMALL_REGISTER_ROWS, 2026, 8)
+
+    before_lines, before_peak, before_time = _measure(
+        lambda: [_materialized_register(session_factory, 2026, 9)]
+    )
+    lines, peak, elapsed = _measure(
+        lambda: services.iter_payroll_register_csv(2026, 9)
+    )
+    small_lines, small_peak, _ = _measure(
+        lambda: services.iter_payroll_register_csv(2026, 8)
+    )
+    print(
+        f"\n[register csv x{REGISTER_ROWS}] "
+        f"before: {before_time:.2f}s peak={before_peak / 2**20:.1f}MiB | "
+        f"after: {elapsed:.2f}s peak={peak / 2**20:.1f}MiB "
+        f"(x{SMALL_REGISTER_ROWS}: {small_peak / 2**20:.1f}MiB)"
+    )
+
+    assert lines == before_lines == REGISTER_ROWS + 1  # 헤더 포함
+    assert small_lines == SMALL_REGISTER_ROWS + 1
+    # 전체를 올리는 방식보다 훨씬 적고, 인원이 10배여도 거의 그대로다
+    assert peak * 10 < before_peak
+    assert peak < small_peak * 2
+
+
+# ---- 급여 원장 증분 반영 (outbox projector) ----
+MONDAY = date(2026, 9, 7)
+
+
+@pytest.fixture
+def payroll_db(session_factory, monkeypatch):
+    # 모듈 전역 캐시(달력/시급/요율/마감/오늘 기록)를 비우고 sqlite 세션으로 실행
+    monkeypatch.setattr(services, "SessionLocal", session_factory)
+    monkeypatch.setattr(settings, "OUTBOX_SETTLE_SECONDS", 0)
+    calendar.invalidate_calendar()
+    wage_services._user_wage_cache.clear()
+    wage_services._default_wage_cache.clear()
+    admin_services._insurance_rate_cache.clear()
+    reference_cache.clear()
+    services._closed_months.clear()
+    services._open_month_cache.clear()
+    attendance_services._today_rows.clear()
+
+    db = session_factory()
+    db.add(DefaultWage(year=2026, wage=10320))
+    db.add(User(id=1, username="crew", password="x", name="크루", position="크루"))
+    db.add(OutboxCheckpoint(consumer=services.PAYROLL_CONSUMER, last_event_id=0))
+    db.commit()
+    yield db
+    db.close()
+
+
+def _work(db, day: date, start: int = 9, end: int = 18) -> None:
+    # 실제 출퇴근 API와 같은 경로 (기록 + outbox 이벤트)
+    attendance_services.check_in(db, 1, datetime.combine(day, dtime(start)))
+    attendance_services.check_out(db, 1, datetime.combine(day, dtime(end)))
+
+
+def _project(db) -> int:
+    return outbox.project_batch(db, services.PAYROLL_CONSUMER, 1000)
+
+
+def _ledger(db, year: int = 2026, month: int = 9):
+    db.expire_all()
+    return services.PayrollLedger.of(services._get_payroll(1, year, month, db))
+
+
+def _full(db, year: int = 2026, month: int = 9):
+    return services.compute_month_ledgers(db, year, month, [1]).get(1)
+
+
+def test_full_recompute_is_not_added_again_by_pending_events(payroll_db):
+    db = payroll_db
+    _work(db, MONDAY)
+    _project(db)
+    assert _ledger(db).work_minutes == 540
+
+    # 아직 projector가 읽지 않은 이벤트가 있는 상태에서 전체 재계산
+    _work(db, MONDAY + timedelta(days=1))
+    services.recalculate_month_set(db, 2026, 9)
+    assert _ledger(db).work_minutes == 1080
+
+    _project(db)  # 재계산에 이미 포함된 이벤트는 건너뛴다
+    assert _ledger(db) == _full(db)
+    assert _ledger(db).work_minutes == 1080
+
+
+def test_lagging_projection_matches_full_recompute(payroll_db):
+    # 한 주 5일치가 밀린 채 한 번에 반영돼도 주휴가 이벤트 시점 기준으로 맞는다
+    db = payroll_db
+    for offset in range(5):
+        _work(db, MONDAY + timedelta(days=offset))
+    _project(db)
+
+    ledger = _ledger(db)
+    assert ledger == _full(db)
+    assert ledger.work_minutes == 5 * 540
+    assert ledger.weekly_minutes > 0
+
+
+# ---- apply_attendance_change: 증분 / 검증 모드 ----
+def _record(db, day: date, start: dtime, end: dtime, brk=None, user_id: int = 1):
+    # 출퇴근 기록을 저장(커밋)하고 그 시점 스냅샷을 돌려준다
+    break_start, break_end = brk or (None, None)
+    work, break_minutes = attendance_services.calc_work_minutes(
+        day, start, end, break_start, break_end
+    )
+    values = {
+        "user_id": user_id,
+        "work_date": day,
+        "check_in": start,
+        "break_start": break_start,
+        "break_end": break_end,
+        "check_out": end,
+        "total_work_minutes": work,
+        "total_break_minutes": break_minutes,
+    }
+    A = Attendance
+    exists = db.execute(
+        select(A.id).where(A.user_id == user_id, A.work_date == day)
+    ).first()
+    if exists:
+        db.execute(update(A).where(A.id == exists.id).values(**values))
+    else:
+        db.execute(insert(A).values(**values))
+    db.commit()
+    return services.AttendanceSnapshot.from_row(values)
+
+
+def _no_full_recompute(*args, **kwargs):
+    raise AssertionError("증분 경로에서 전체 재계산이 호출됨")
+
+
+def _add_public_holidays(db, days) -> None:
+    db.add_all(
+        Holiday(name="추석", date=day, kind=HolidayKindEnum.public) for day in days
+    )
+    db.commit()
+    calendar.invalidate_calendar()
+
+
+def test_delta_path_matches_full_recompute(payroll_db, monkeypatch):
+    db = payroll_db
+    _add_public_holidays(db, [MONDAY + timedelta(days=2)])
+    first = _record(db, MONDAY, dtime(9), dtime(18), (dtime(12), dtime(13)))
+    services.apply_attendance_change(1, None, first, db)  # 원장 시드
+    assert _ledger(db) == _full(db)
+
+    with monkeypatch.context() as m:
+        m.setattr(services, "compute_month_ledgers", _no_full_recompute)
+        # 휴일 야간 근무 (자정 넘김, 자정 이후 휴식)
+        night = _record(
+            db,
+            MONDAY + timedelta(days=2),
+            dtime(20),
+            dtime(4),
+            (dtime(0, 30), dtime(1)),
+        )
+        services.apply_attendance_change(1, None, night, db, verify=False)
+        # 기존 기록 수정: 퇴근이 1시간 늦춰짐
+        later = _record(db, MONDAY, dtime(9), dtime(19), (dtime(12), dtime(13)))
+        services.apply_attendance_change(1, first, later, db, verify=False)
+
+    ledger = _ledger(db)
+    assert ledger == _full(db)
+    assert ledger.night_minutes == 330  # 22:00~04:00 중 휴식 30분 제외
+    assert ledger.holiday_minutes == 240  # 휴일 당일 20:00~24:00 (휴식은 다음 날)
+
+
+def test_weekly_allowance_spills_into_next_month(payroll_db):
+    # 9/28(월)~10/4(일) 주의 주휴는 일요일이 속한 10월 원장에 들어간다
+    db = payroll_db
+    shift = (dtime(9), dtime(18))
+    october = _record(db, date(2026, 10, 1), *shift)
+    services.apply_attendance_change(1, None, october, db)
+    for day in (28, 29, 30):
+        snapshot = _record(db, date(2026, 9, day), *shift)
+        services.apply_attendance_change(1, None, snapshot, db, verify=False)
+
+    assert _ledger(db, 2026, 9) == _full(db, 2026, 9)
+    assert _ledger(db, 2026, 10) == _full(db, 2026, 10)
+    assert _ledger(db, 2026, 10).weekly_minutes > 0
+
+
+def test_verify_mode_corrects_drift(payroll_db, caplog):
+    db = payroll_db
+    first = _record(db, MONDAY, dtime(9), dtime(18))
+    services.apply_attendance_change(1, None, first, db)
+    second = _record(db, MONDAY + timedelta(days=1), dtime(9), dtime(18))
+    with caplog.at_level("WARNING"):
+        services.apply_attendance_change(1, None, second, db, verify=True)
+    assert "drift" not in caplog.text
+
+    # 원장이 어긋난 상태(누락된 반영 등)에서 검증 모드는 경고 후 전체 값으로 바로잡는다
+    db.execute(update(Payroll).values(work_minutes=Payroll.work_minutes + 60))
+    db.commit()
+    third = _record(db, MONDAY + timedelta(days=2), dtime(9), dtime(18))
+    with caplog.at_level("WARNING"):
+        services.apply_attendance_change(1, None, third, db, verify=True)
+    assert "payroll ledger drift" in caplog.text
+    assert _ledger(db) == _full(db)
+
+
+def test_closed_month_is_left_untouched(payroll_db):
+    db = payroll_db
+    first = _record(db, MONDAY, dtime(9), dtime(18))
+    services.apply_attendance_change(1, None, first, db)
+    services.close_month(db, 2026, 9, None)
+    closed = _ledger(db)
+
+    second = _record(db, MONDAY + timedelta(days=1), dtime(9), dtime(18))
+    assert services.apply_attendance_change(1, None, second, db) is None
+    assert _ledger(db) == closed
+
+
+# ---- 매장 전체 월 마감 ----
+STORE_STAFF = 300
+CHUSEOK = [date(2026, 9, 24), date(2026, 9, 25), date(2026, 9, 26)]
+
+
+def _minute_walk(snapshot, holidays: set[date]) -> tuple[int, int]:
+    # 변경 전 방식: 근무 구간을 1분씩 걸으며 분류 (정답 비교용)
+    start = datetime.combine(snapshot.work_date, snapshot.check_in)
+    end = datetime.combine(snapshot.work_date, snapshot.check_out)
+    if end <= start:
+        end += timedelta(days=1)
+    brk = None
+    if snapshot.break_start and snapshot.break_end:
+        b_start = datetime.combine(snapshot.work_date, snapshot.break_start)
+        if b_start < start:
+            b_start += timedelta(days=1)
+        b_end = datetime.combine(b_start.date(), snapshot.break_end)
+        if b_end < b_start:
+            b_end += timedelta(days=1)
+        brk = (b_start, b_end)
+
+    night = holiday = 0
+    minute = timedelta(minutes=1)
+    t = start
+    while t < end:
+        if not (brk and brk[0] <= t < brk[1]):
+            night += t.hour >= 22 or t.hour < 6
+            holiday += t.date() in holidays
+        t += minute
+    return night, holiday
+
+
+def _seed_store_month(db) -> list:
+    # 직원 STORE_STAFF명 x 9월 평일 전부. 1/3은 자정 넘는 야간 근무
+    db.execute(
+        insert(User),
+        [
+            {
+                "id": i,
+                "username": f"crew{i}",
+                "password": "x",
+                "name": f"직원{i}",
+                "position": PositionEnum.crew,
+            }
+            for i in range(2, STORE_STAFF + 1)
+        ],
+    )
+    day_shift = (dtime(9), dtime(18), dtime(12), dtime(13))
+    night_shift = (dtime(20), dtime(4), dtime(0), dtime(0, 30))
+    days = [
+        date(2026, 9, 1) + timedelta(days=i)
+        for i in range(30)
+        if (date(2026, 9, 1) + timedelta(days=i)).weekday() < 5
+    ]
+    rows = []
+    for user_id in range(1, STORE_STAFF + 1):
+        check_in, check_out, break_start, break_end = (
+            night_shift if user_id % 3 == 0 else day_shift
+        )
+        for day in days:
+            work, break_minutes = attendance_services.calc_work_minutes(
+                day, check_in, check_out, break_start, break_end
+            )
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "work_date": day,
+                    "check_in": check_in,
+                    "break_start": break_start,
+                    "break_end": break_end,
+                    "check_out": check_out,
+                    "total_work_minutes": work,
+                    "total_break_minutes": break_minutes,
+                }
+            )
+    db.execute(insert(Attendance), rows)
+    db.commit()
+    return rows
+
+
+def test_whole_store_month_close_runs_in_seconds(payroll_db):
+    db = payroll_db
+    _add_public_holidays(db, CHUSEOK)
+    rows = _seed_store_month(db)
+
+    started = time.perf_counter()
+    walked = {}
+    for row in rows:
+        night, holiday = _minute_walk(
+            services.AttendanceSnapshot.from_row(row), set(CHUSEOK)
+        )
+        total = walked.get(row["user_id"], (0, 0))
+        walked[row["user_id"]] = (total[0] + night, total[1] + holiday)
+    walk_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = services.close_month(db, 2026, 9, None)
+    close_time = time.perf_counter() - started
+    print(
+        f"\n[month close x{STORE_STAFF} staff, {len(rows)} shifts] "
+        f"minute walk (classify only): {walk_time:.2f}s | "
+        f"close_month (recompute + snapshot): {close_time:.2f}s"
+    )
+
+    assert result["headcount"] == STORE_STAFF
+    assert close_time < 5
+    ledgers = {
+        p.user_id: services.PayrollLedger.of(p)
+        for p in db.execute(select(Payroll)).scalars()
+    }
+    for user_id, (night, holiday) in walked.items():
+        assert (ledgers[user_id].night_minutes, ledgers[user_id].holiday_minutes) == (
+            night,
+            holiday,
+        )
+    assert ledgers[3].night_minutes > 0 and ledgers[3].holiday_minutes > 0
+
+
+# ---- 기준 데이터(시급) 소급 변경 → 미마감 월 재계산 ----
+def test_retroactive_user_wage_reaches_open_month(payroll_db):
+    db = payroll_db
+    _work(db, MONDAY)
+    _project(db)
+    assert _ledger(db).wage_minutes == 10320 * 540
+
+    wage_routers.create_user_wage(
+        wage_schemas.UserWageCreate(
+            user_id=1, wage=12000, start_date=date(2026, 9, 1)
+        ),
+        db,
+    )
+    assert _ledger(db) == _full(db)
+    assert _ledger(db).wage_minutes == 12000 * 540
+
+    # 이후 증분 반영도 새 시급으로
+    _work(db, MONDAY + timedelta(days=1))
+    _project(db)
+    assert _ledger(db) == _full(db)
+    assert _ledger(db).wage_minutes == 12000 * 1080
+
+
+def test_default_wage_change_recomputes_open_months(payroll_db):
+    db = payroll_db
+    db.execute(delete(DefaultWage))
+    reference._bump_reference_version(db, reference.DEFAULT_WAGES)
+    db.commit()
+    _work(db, MONDAY)
+    _project(db)
+    assert _ledger(db).wage_minutes == -540  # 최저시급 미등록
+
+    tasks = BackgroundTasks()
+    wage_routers.create_default_wage(
+        wage_schemas.DefaultWageCreate(year=2026, wage=10320), tasks, db
+    )
+    asyncio.run(tasks())
+    assert _ledger(db) == _full(db)
+    assert _ledger(db).wage_minutes == 10320 * 540
+
+
+# ---- 기준 데이터(공휴일) 변경 → 미마감 월 재계산 ----
+def test_holiday_change_recomputes_holiday_minutes(payroll_db):
+    db = payroll_db
+    _work(db, MONDAY)
+    _project(db)
+    assert _ledger(db).holiday_minutes == 0
+
+    holiday = admin_routers.create_holiday(
+        admin_schemas.HolidayCreate(name="임시공휴일", date=MONDAY), db
+    )
+    assert _ledger(db) == _full(db)
+    assert _ledger(db).holiday_minutes > 0
+
+    # 다른 달로 옮기면 원래 달과 옮긴 달이 모두 다시 맞춰진다
+    admin_routers.update_holiday(
+        holiday.id, admin_schemas.HolidayUpdate(date=date(2026, 10, 1)), db
+    )
+    assert _ledger(db) == _full(db)
+    assert _ledger(db).holiday_minutes == 0
+
+
+def test_holiday_import_recomputes_in_background(payroll_db):
+    db = payroll_db
+    _work(db, MONDAY)
+    _project(db)
+    calendar.get_year_calendar(db, 2026)  # 이 워커에 달력이 캐시된 상태
+
+    tasks = BackgroundTasks()
+    admin_routers.import_public_holidays(
+        admin_schemas.HolidayImport(
+            year=2026, items=[admin_schemas.HolidayImportItem(name="추석", date=MONDAY)]
+        ),
+        tasks,
+        db,
+    )
+    assert calendar.is_off_day(db, MONDAY, calendar.PUBLIC_HOLIDAY)
+    asyncio.run(tasks())
+    assert _ledger(db) == _full(db)
+    assert _ledger(db).holiday_minutes > 0
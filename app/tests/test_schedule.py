@@ -0,0 +1,171 @@
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from datetime import time as dtime
+
+from sqlalchemy import insert, select
+
+from app.modules.admin import calendar
+from app.modules.admin.models import Holiday, HolidayKindEnum
+from app.modules.auth.models import PositionEnum, User
+from app.modules.dayoff.models import LeaveRequest, LeaveStatusEnum
+from app.modules.schedule import schemas, services
+from app.modules.schedule.models import Schedule
+
+MONDAY = date(2026, 3, 2)
+STAFF = 400
+DAY_SHIFTS = ((dtime(7), dtime(15)), (dtime(15), dtime(23)), (dtime(22), dtime(6)))
+
+
+def _user(user_id, position=PositionEnum.crew, **fields) -> User:
+    return User(id=user_id, position=position, **fields)
+
+
+def _slot(weekday, start, end, headcount, position=PositionEnum.crew):
+    return schemas.ShiftSlot(
+        weekday=weekday,
+        start_time=start,
+        end_time=end,
+        position=position,
+        headcount=headcount,
+    )
+
+
+def test_availability_index_excludes_blocked_days():
+    users = [
+        _user(1, unavailable_days=["토", "sun"]),
+        _user(2, hire_date=MONDAY + timedelta(days=3)),  # 목요일 입사
+        _user(3, retire_date=MONDAY + timedelta(days=1)),  # 화요일 퇴사
+        _user(4, hire_date=MONDAY + timedelta(days=7)),  # 다음 주 입사
+        _user(5, position=PositionEnum.leader),
+        _user(6, unavailable_days=[2]),
+    ]
+    on_leave = {(6, MONDAY + timedelta(days=4))}
+    index = services.AvailabilityIndex(users, MONDAY, on_leave)
+
+    assert index.candidates(PositionEnum.crew, 0) == [1, 3, 6]
+    assert index.candidates(PositionEnum.crew, 2) == [1]
+    assert index.candidates(PositionEnum.crew, 3) == [1, 2, 6]
+    assert index.candidates(PositionEnum.crew, 4) == [1, 2]
+    assert index.candidates(PositionEnum.crew, 5) == [2, 6]
+    assert index.candidates(PositionEnum.leader, 6) == [5]
+    assert index.candidates(PositionEnum.cleaner, 0) == []
+
+
+def test_build_roster_respects_day_and_weekly_limits():
+    index = services.AvailabilityIndex([_user(i) for i in (1, 2, 3)], MONDAY)
+    slots = [
+        _slot(weekday, start, end, 1)
+        for weekday in range(5)
+        for start, end in ((dtime(9), dtime(17)), (dtime(22), dtime(6)))
+    ]
+    rows, unfilled = services.build_roster(index, MONDAY, slots, 16 * 60)
+
+    # 3명 × 주 16시간 = 8시간 근무 6개, 나머지 4자리는 미충원
+    assert len(rows) == 6
+    assert sum(u["missing"] for u in unfilled) == 4
+    assert Counter(r["user_id"] for r in rows) == {1: 2, 2: 2, 3: 2}
+    assert len({(r["user_id"], r["work_date"]) for r in rows}) == len(rows)
+
+
+def test_build_roster_fills_scarce_slots_first_and_skips_closed_days():
+    users = [_user(1, unavailable_days=[]), _user(2, unavailable_days=[1])]
+    index = services.AvailabilityIndex(users, MONDAY)
+    tuesday = MONDAY + timedelta(days=1)
+    slots = [
+        _slot(0, dtime(9), dtime(17), 1),  # 후보 2명
+        _slot(1, dtime(9), dtime(17), 1),  # 후보 1명 (먼저 채움)
+        _slot(2, dtime(9), dtime(17), 1),
+    ]
+    rows, unfilled = services.build_roster(
+        index, MONDAY, slots, 8 * 60, closed_days={MONDAY + timedelta(days=2)}
+    )
+
+    assert [(r["work_date"], r["user_id"]) for r in rows] == [
+        (MONDAY, 2),
+        (tuesday, 1),
+    ]
+    assert unfilled == []
+
+
+def _seed_staff(db) -> None:
+    positions = (
+        [PositionEnum.leader] * 40 + [PositionEnum.cleaner] * 40 + [PositionEnum.crew]
+    )
+    users = [
+        {
+            "id": i,
+            "username": f"staff{i}",
+            "password": "x",
+            "name": f"직원{i}",
+            "position": positions[min(i - 1, len(positions) - 1)],
+            "is_active": True,
+            "unavailable_days": [i % 7] if i % 3 == 0 else [],
+        }
+        for i in range(1, STAFF + 1)
+    ]
+    db.execute(insert(User), users)
+    db.add_all(
+        LeaveRequest(
+            user_id=i,
+            start_date=MONDAY + timedelta(days=i % 5),
+            end_date=MONDAY + timedelta(days=i % 5 + 1),
+            days=2,
+            status=LeaveStatusEnum.approved,
+        )
+        for i in range(5, STAFF + 1, 10)
+    )
+    sunday = MONDAY + timedelta(days=6)
+    db.add(Holiday(name="매장 휴무", date=sunday, kind=HolidayKindEnum.store))
+    db.commit()
+
+
+def _week_slots() -> list[schemas.ShiftSlot]:
+    needs = {PositionEnum.leader: 4, PositionEnum.cleaner: 3, PositionEnum.crew: 40}
+    return [
+        _slot(weekday, start, end, headcount, position)
+        for weekday in range(7)
+        for start, end in DAY_SHIFTS
+        for position, headcount in needs.items()
+    ]
+
+
+def test_generate_roster_for_hundreds_of_staff_under_a_second(session_factory):
+    calendar.invalidate_calendar()
+    db = session_factory()
+    try:
+        _seed_staff(db)
+        request = schemas.RosterRequest(
+            week_start=MONDAY, slots=_week_slots(), max_weekly_hours=40
+        )
+
+        started = time.perf_counter()
+        result = services.generate_roster(db, request)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        print(
+            f"\nroster {STAFF} staff / {len(request.slots)} slots: "
+            f"{result['assigned']} assigned in {elapsed * 1000:.0f}ms"
+        )
+
+        stored = db.execute(select(Schedule)).scalars().all()
+        assert len(stored) == result["assigned"] > 0
+        users = {u.id: u for u in db.execute(select(User)).scalars()}
+        on_leave = {
+            (r.user_id, MONDAY + timedelta(days=d))
+            for r in db.execute(select(LeaveRequest)).scalars()
+            for d in range((r.start_date - MONDAY).days, (r.end_date - MONDAY).days + 1)
+        }
+        minutes = defaultdict(int)
+        for row in stored:
+            user = users[row.user_id]
+            assert row.position == user.position
+            assert row.work_date.weekday() not in user.unavailable_days
+            assert (row.user_id, row.work_date) not in on_leave
+            assert row.work_date != MONDAY + timedelta(days=6)  # 매장 휴무일
+            minutes[row.user_id] += 8 * 60
+        assert max(minutes.values()) <= 40 * 60
+        assert elapsed < 1.0
+    finally:
+        db.close()
+        calendar.invalidate_calendar()
@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+from datetime import time as dtime
+
+import pytest
+
+from app.modules.auth.models import PositionEnum, User
+from app.modules.schedule.models import Schedule
+from app.modules.shift import services
+from app.modules.shift.models import ShiftSwap
+
+DAY = date.today() + timedelta(days=7)
+
+
+def _seed(db) -> Schedule:
+    db.add_all(
+        User(id=i, username=f"crew{i}", password="x", name=f"크루{i}", position="크루")
+        for i in (1, 2, 3, 4)
+    )
+    wanted = Schedule(
+        user_id=1,
+        work_date=DAY,
+        start_time=dtime(18),
+        end_time=dtime(22),
+        position=PositionEnum.crew,
+    )
+    db.add_all(
+        [
+            wanted,
+            # 2: 같은 날 오전 근무 (시간은 안 겹치지만 하루 한 근무)
+            Schedule(
+                user_id=2,
+                work_date=DAY,
+                start_time=dtime(7),
+                end_time=dtime(11),
+                position=PositionEnum.crew,
+            ),
+            # 3: 전날 밤샘 근무가 당일 20시까지 (겹침)
+            Schedule(
+                user_id=3,
+                work_date=DAY - timedelta(days=1),
+                start_time=dtime(22),
+                end_time=dtime(20),
+                position=PositionEnum.crew,
+            ),
+        ]
+    )
+    db.commit()
+    return wanted
+
+
+def test_candidates_exclude_anyone_already_working_that_day(session_factory):
+    with session_factory() as db:
+        schedule = _seed(db)
+        assert [u.id for u in services.find_candidates(db, schedule)] == [4]
+
+
+def test_accept_rejects_second_shift_on_the_same_day(session_factory):
+    with session_factory() as db:
+        schedule = _seed(db)
+        swap, _ = services.create_swap(db, 1, schedule.id, None)
+        db.commit()
+
+        with pytest.raises(services.SwapConflict, match="같은 날"):
+            services.accept_swap(db, swap.id, db.get(User, 2))
+        db.rollback()
+        assert db.get(ShiftSwap, swap.id).taker_id is None
+
+        accepted, moved = services.accept_swap(db, swap.id, db.get(User, 4))
+        assert (accepted.taker_id, moved.user_id) == (4, 4)
@@ -0,0 +1,261 @@
+import contextlib
+import os
+import re
+import subprocess
+import sys
+import time
+from datetime import date
+
+import pytest
+from sqlalchemy import (
+    DECIMAL,
+    JSON,
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    create_engine,
+    insert,
+    inspect,
+    text,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.core import startup
+from app.core.config import settings
+from app.tests.conftest import p99
+
+FAST_PATH_RUNS = 200
+IMPORT_BUDGET_SECONDS = 5.0
+
+
+@pytest.fixture
+def empty_engine(tmp_path, monkeypatch):
+    # 스키마 없는 sqlite. GET_LOCK은 MySQL 전용이라 기동 락은 항상 얻은 것으로 둔다
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+    monkeypatch.setattr(startup, "engine", engine)
+    monkeypatch.setattr(startup, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(
+        startup,
+        "advisory_lock",
+        lambda conn, name, timeout=0: contextlib.nullcontext(True),
+    )
+    yield engine
+    engine.dispose()
+
+
+def _recorded_version(engine):
+    with engine.connect() as conn:
+        return startup._applied_version(conn)
+
+
+def _old_schema(engine) -> None:
+    # 이전 배포의 테이블 모양 (create_all은 이미 있는 테이블을 건드리지 않는다)
+    old = MetaData()
+    Table(
+        "payroll",
+        old,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, nullable=False),
+        Column("year", Integer, nullable=False),
+        Column("month", Integer, nullable=False),
+        Column("hourly_wage", Integer, nullable=False),
+        Column("total_hours", DECIMAL(5, 2)),
+        Column("total_salary", Integer),
+        Column("net_salary", Integer),
+    )
+    Table(
+        "attendance_event",
+        old,
+        Column("id", BigInteger, primary_key=True),
+        Column("user_id", Integer, nullable=False),
+        Column("work_date", Date, nullable=False),
+        Column("action", String(20), nullable=False),
+        Column("before", JSON),
+        Column("after", JSON, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+    )
+    Table(
+        "holidays",
+        old,
+        Column("id", Integer, primary_key=True),
+        Column("employee_id", Integer, nullable=False),
+        Column("holiday_date", Date, nullable=False),
+        Column("reason", String(255)),
+    )
+    Table(
+        "insurance_rates",
+        old,
+        Column("id", Integer, primary_key=True),
+        Column("national_pension", Numeric(5, 2), nullable=False),
+        Column("effective_date", Date, nullable=False),
+    )
+    old.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(old.tables["payroll"]),
+            [
+                {"id": 1, "user_id": 1, "year": 2026, "month": 1, "hourly_wage": 1},
+                {"id": 2, "user_id": 1, "year": 2026, "month": 1, "hourly_wage": 2},
+                {"id": 3, "user_id": 2, "year": 2026, "month": 1, "hourly_wage": 3},
+            ],
+        )
+        conn.execute(
+            insert(old.tables["holidays"]),
+            {"employee_id": 7, "holiday_date": date(2025, 5, 5), "reason": "연차"},
+        )
+
+
+def test_prepare_database_fast_path_benchmark(empty_engine):
+    started = time.perf_counter()
+    startup.prepare_database()
+    migrate_time = time.perf_counter() - started
+
+    version = startup.schema_hash()
+    assert _recorded_version(empty_engine) == version
+    with empty_engine.connect() as conn:
+        assert startup.schema_drift(conn) == []
+        assert startup._admin_exists(conn)
+
+    samples = []
+    for _ in range(FAST_PATH_RUNS):
+        started = time.perf_counter()
+        startup.prepare_database()
+        samples.append(time.perf_counter() - started)
+    print(
+        f"\nstartup: first run {migrate_time * 1000:.0f}ms, fast path "
+        f"p99 {p99(samples) * 1000:.1f}ms over {FAST_PATH_RUNS} runs"
+    )
+    assert p99(samples) < 0.1
+
+
+def test_migrate_brings_old_tables_up_to_the_models(empty_engine):
+    _old_schema(empty_engine)
+    startup.prepare_database()
+
+    assert _recorded_version(empty_engine) == startup.schema_hash()
+    with empty_engine.connect() as conn:
+        assert startup.schema_drift(conn) == []
+        inspector = inspect(conn)
+        payroll_columns = {c["name"] for c in inspector.get_columns("payroll")}
+        assert {"work_minutes", "wage_minutes", "last_event_id"} <= payroll_columns
+        event_columns = {c["name"] for c in inspector.get_columns("attendance_event")}
+        assert "idempotency_key" in event_columns
+
+        # 중복 급여 행은 최근 것만 남고 유니크 제약이 걸린다
+        rows = conn.execute(text("SELECT id FROM payroll ORDER BY id")).scalars()
+        assert list(rows) == [2, 3]
+        with pytest.raises(IntegrityError):
+            conn.execute(
+                text(
+                    "INSERT INTO payroll (user_id, year, month, hourly_wage) "
+                    "VALUES (2, 2026, 1, 3)"
+                )
+            )
+        conn.rollback()
+
+        # 모양이 다른 옛 테이블은 보존하고 새로 만든다
+        legacy = conn.execute(text("SELECT employee_id FROM holidays_legacy"))
+        assert list(legacy.scalars()) == [7]
+        holiday_columns = {c["name"] for c in inspector.get_columns("holidays")}
+        assert {"name", "kind"} <= holiday_columns
+        assert "employee_id" not in holiday_columns
+        assert "insurance_rates_legacy" in inspector.get_table_names()
+
+
+def test_drift_that_cannot_be_fixed_does_not_record_version(empty_engine):
+    with empty_engine.begin() as conn:
+        # NOT NULL 컬럼 누락 / 모델이 모르는 NOT NULL 컬럼
+        conn.execute(
+            text(
+                "CREATE TABLE outbox_checkpoint "
+                "(consumer VARCHAR(50) PRIMARY KEY, updated_at DATETIME)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE reference_version (namespace VARCHAR(50) PRIMARY KEY, "
+                "version INTEGER NOT NULL, updated_at DATETIME NOT NULL, "
+                "owner VARCHAR(50) NOT NULL)"
+            )
+        )
+
+    with pytest.raises(RuntimeError) as excinfo:
+        startup.prepare_database()
+    assert "missing column outbox_checkpoint.last_event_id" in str(excinfo.value)
+    assert "unknown NOT NULL column reference_version.owner" in str(excinfo.value)
+    assert _recorded_version(empty_engine) is None
+
+    # 다음 기동도 빠른 경로로 건너뛰지 않고 다시 확인한다
+    with pytest.raises(RuntimeError):
+        startup.prepare_database()
+
+
+def test_import_time_profile():
+    # 워커 기동 때마다 드는 import 비용 (python -X importtime, 마이크로초)
+    env = {**os.environ, "PYTHONWARNINGS": "ignore"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", line)
+        if match:
+            rows.append((int(match[1]), int(match[2]), match[4].strip()))
+    total = next(cumulative for _, cumulative, name in rows if name == "app.main")
+    slowest = sorted(rows, reverse=True)[:10]
+    print(f"\nimport app.main: {total / 1000:.0f}ms (self time, top 10)")
+    for self_us, _, name in slowest:
+        print(f"  {self_us / 1000:7.1f}ms  {name}")
+    assert settings.DB_NAME  # 설정 import가 환경 변수만으로 끝난다
+    assert total / 1e6 < IMPORT_BUDGET_SECONDS
+
+
+def test_added_pending_column_is_backfilled_from_requests(empty_engine):
+    with empty_engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE leave_balance (user_id INTEGER PRIMARY KEY, "
+                "balance INTEGER NOT NULL, granted INTEGER NOT NULL, "
+                "used INTEGER NOT NULL, last_entry_id BIGINT NOT NULL, "
+                "updated_at DATETIME)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO leave_balance VALUES (1, 10, 10, 0, 1, NULL)")
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE leave_request (id INTEGER PRIMARY KEY, "
+                "user_id INTEGER NOT NULL, start_date DATE NOT NULL, "
+                "end_date DATE NOT NULL, days INTEGER NOT NULL, "
+                "reason VARCHAR(255), status VARCHAR(9) NOT NULL, "
+                "created_at DATETIME NOT NULL, decided_by INTEGER, "
+                "decided_at DATETIME)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO leave_request (user_id, start_date, end_date, days, "
+                "status, created_at) VALUES "
+                "(1, '2026-11-02', '2026-11-03', 2, 'pending', '2026-10-01'), "
+                "(1, '2026-11-09', '2026-11-09', 1, 'pending', '2026-10-01'), "
+                "(1, '2026-11-16', '2026-11-16', 1, 'approved', '2026-10-01')"
+            )
+        )
+
+    startup.prepare_database()
+    with empty_engine.connect() as conn:
+        pending = conn.execute(text("SELECT pending FROM leave_balance")).scalar()
+    assert pending == 3
@@ -0,0 +1,69 @@
+from datetime import date
+
+import pytest
+
+from app.modules.admin import reference
+from app.modules.admin.reference import reference_cache
+from app.modules.wage import services
+from app.modules.wage.models import DefaultWage, UserWage
+
+DAY = date(2026, 9, 7)
+
+
+@pytest.fixture
+def wage_db(session_factory, monkeypatch):
+    # 버전 메모를 바로 만료시켜 "version_ttl이 지난 뒤"를 기다리지 않고 재현한다
+    monkeypatch.setattr(reference_cache._versions, "ttl", 0)
+    services._user_wage_cache.clear()
+    services._default_wage_cache.clear()
+    db = session_factory()
+    db.add(DefaultWage(year=2026, wage=10320))
+    db.commit()
+    yield db
+    db.close()
+    services._user_wage_cache.clear()
+    services._default_wage_cache.clear()
+
+
+def _other_worker_write(session_factory, row, namespace: str) -> None:
+    # 다른 워커의 쓰기: 이 프로세스의 캐시는 건드리지 않고 공유 버전만 올린다
+    with session_factory() as db:
+        db.add(row)
+        reference._bump_reference_version(db, namespace)
+        db.commit()
+
+
+def test_user_wage_written_on_another_worker_is_seen(wage_db, session_factory):
+    assert services.get_applicable_wage(1, DAY, wage_db) == 10320
+    wage_db.commit()
+
+    _other_worker_write(
+        session_factory,
+        UserWage(user_id=1, wage=12000, start_date=date(2026, 9, 1)),
+        reference.USER_WAGES,
+    )
+    assert services.get_applicable_wage(1, DAY, wage_db) == 12000
+
+
+def test_default_wage_timeline_follows_shared_version(wage_db, session_factory):
+    assert services.get_default_wages(wage_db) == {2026: 10320}
+    wage_db.commit()
+
+    _other_worker_write(
+        session_factory, DefaultWage(year=2027, wage=10800), reference.DEFAULT_WAGES
+    )
+    assert services.get_default_wages(wage_db) == {2026: 10320, 2027: 10800}
+    assert services.get_applicable_wage(1, date(2027, 1, 4), wage_db) == 10800
+
+
+def test_unchanged_version_serves_cached_intervals(wage_db, monkeypatch):
+    loads = []
+    load = services._load_user_intervals
+    monkeypatch.setattr(
+        services,
+        "_load_user_intervals",
+        lambda user_id, db: loads.append(user_id) or load(user_id, db),
+    )
+    for _ in range(3):
+        assert services.get_applicable_wage(1, DAY, wage_db) == 10320
+    assert loads == [1]
@@ -0,0 +1,173 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    프로세스 내 LRU + TTL 캐시 (thread-safe).
+    gunicorn 워커마다 따로 존재하므로, 다른 워커에서의 변경은 ttl 이내에 반영된다.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING or item[0] < now:
+                if item is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.pop(key, None)
+        return item[1] if item else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+class ResponseCache:
+    """
+    조회 API 응답 바이트 캐시. 네임스페이스 버전은 모든 워커가 공유하는 저장소(DB 행)에서
+    읽고, 쓰기 트랜잭션 안에서 bump()로 올린다. 버전이 바뀌면 이전 버전으로 만든 응답은
+    더 이상 쓰지 않는다.
+    읽은 버전은 워커마다 version_ttl초만 기억한다: 다른 워커의 쓰기도 그 안에 반영되고,
+    그 사이 반복 조회는 버전 조회도 하지 않는다.
+    ETag는 본문 해시라 워커가 달라도 내용이 같으면 같은 값이다.
+    """
+
+    def __init__(
+        self,
+        load_version: Callable[[Any, str], int],
+        bump_version: Callable[[Any, str], None],
+        maxsize: int = 256,
+        ttl: float = 300.0,
+        version_ttl: float = 1.0,
+    ):
+        self._load_version = load_version
+        self._bump_version = bump_version
+        self._versions = TTLCache(maxsize=64, ttl=version_ttl)
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def version(self, db, namespace: str) -> int:
+        return self._versions.get_or_load(
+            namespace, lambda: self._load_version(db, namespace)
+        )
+
+    def load_version(self, db, namespace: str) -> int:
+        # 워커 메모를 거치지 않고 db의 현재 트랜잭션(스냅샷)에서 읽는다
+        return self._load_version(db, namespace)
+
+    def bump(self, db, namespace: str) -> None:
+        # 쓰기와 같은 트랜잭션에서 호출 (커밋과 함께 모든 워커에 반영)
+        self._bump_version(db, namespace)
+        self._versions.pop(namespace)
+
+    def get_or_render(
+        self, db, namespace: str, key: Hashable, render: Callable[[], bytes]
+    ) -> tuple[bytes, str]:
+        version = self.version(db, namespace)
+        entry = self._entries.get((namespace, key))
+        if entry is not None and entry[0] == version:
+            return entry[1], entry[2]
+        body = render()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self._entries.set((namespace, key), (version, body, etag))
+        return body, etag
+
+    def clear(self) -> None:
+        self._versions.clear()
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self._entries.stats(), "version_ttl": self._versions.ttl}
+
+
+class VersionedCache:
+    """
+    ResponseCache의 공유 네임스페이스 버전을 붙여 두는 값 캐시 (시급 이력, 요율 등).
+    값은 함께 읽은 버전과 같이 저장하고, 워커가 아는 버전과 다르면 다시 읽는다.
+    다른 워커의 쓰기도 version_ttl 안에 반영된다 (ttl은 오래 안 쓰인 값 정리용).
+    """
+
+    def __init__(
+        self,
+        versions: ResponseCache,
+        namespace: str,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+    ):
+        self._versions = versions
+        self.namespace = namespace
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get_or_load(self, db, key: Hashable, loader: Callable[[], Any]) -> Any:
+        current = self._versions.version(db, self.namespace)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == current:
+            return entry[1]
+        # 버전과 값을 같은 스냅샷에서 읽어야 옛 값에 새 버전이 붙지 않는다
+        version = self._versions.load_version(db, self.namespace)
+        value = loader()
+        self._entries.set(key, (version, value))
+        return value
+
+    def reload(self, db, key: Hashable, loader: Callable[[], Any]) -> None:
+        # 이미 캐시된 키만 지금 스냅샷으로 다시 읽어 교체 (쓰기 커밋 직후 미리 채우기)
+        if self._entries.get(key) is None:
+            return
+        version = self._versions.load_version(db, self.namespace)
+        self._entries.set(key, (version, loader()))
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self._entries.stats(), "namespace": self.namespace}
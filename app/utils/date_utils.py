@@ -0,0 +1,59 @@
+from datetime import date, datetime, time, timedelta
+
+NIGHT_START = time(22, 0)  # 야간근로 22:00 ~ 익일 06:00
+NIGHT_HOURS = 8
+WEEKLY_MIN_MINUTES = 15 * 60  # 주 15시간 이상 근무 시 주휴 발생
+WEEKLY_FULL_MINUTES = 40 * 60
+
+
+def shift_interval(
+    work_date: date, start: time, end: time
+) -> tuple[datetime, datetime]:
+    # 종료가 시작보다 이르면 자정을 넘긴 것으로 본다
+    s = datetime.combine(work_date, start)
+    e = datetime.combine(work_date, end)
+    if e < s:
+        e += timedelta(days=1)
+    return s, e
+
+
+def overlap_seconds(
+    a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime
+) -> int:
+    return max(0, int((min(a_end, b_end) - max(a_start, b_start)).total_seconds()))
+
+
+def night_seconds(start: datetime, end: datetime) -> int:
+    # [start, end) 중 22:00~06:00에 속하는 초 (분 단위 순회 없이 야간 창과의 교집합)
+    total = 0
+    day = start.date() - timedelta(days=1)  # 전날 22:00에 시작한 창부터
+    while datetime.combine(day, NIGHT_START) < end:
+        window_start = datetime.combine(day, NIGHT_START)
+        window_end = window_start + timedelta(hours=NIGHT_HOURS)
+        total += overlap_seconds(start, end, window_start, window_end)
+        day += timedelta(days=1)
+    return total
+
+
+def seconds_by_date(start: datetime, end: datetime) -> dict[date, int]:
+    # 자정 기준으로 잘라 날짜별 초
+    result: dict[date, int] = {}
+    cursor = start
+    while cursor < end:
+        next_midnight = datetime.combine(cursor.date() + timedelta(days=1), time(0))
+        part_end = min(end, next_midnight)
+        result[cursor.date()] = int((part_end - cursor).total_seconds())
+        cursor = part_end
+    return result
+
+
+def week_end(d: date) -> date:
+    # 월~일 주 단위, 해당 주의 일요일
+    return d + timedelta(days=6 - d.weekday())
+
+
+def weekly_allowance_minutes(week_work_minutes: int) -> int:
+    # 주휴시간 = min(주 근무시간, 40시간) / 40 × 8시간 (주 15시간 미만이면 0)
+    if week_work_minutes < WEEKLY_MIN_MINUTES:
+        return 0
+    return min(week_work_minutes, WEEKLY_FULL_MINUTES) * 8 // 40
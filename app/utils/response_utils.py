@@ -0,0 +1,23 @@
+from typing import Optional
+
+from fastapi import Response, status
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def cached_json_response(
+    body: bytes,
+    etag: str,
+    if_none_match: Optional[str],
+    cache_control: str = "private, no-cache",
+) -> Response:
+    # 직렬화된 JSON을 그대로 내보내고, If-None-Match가 맞으면 본문 없이 304
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)